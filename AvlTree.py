@@ -1,38 +1,50 @@
+from operator import attrgetter
+
+from SortedTreeMixin import SortedTreeMixin, irange_nodes
+
+# Marks a missing default argument, since None is a valid default.
+_MISSING = object()
+# Reads the stored sort order of an AVLMap node.
+_node_order = attrgetter("order")
+
+
 class Node:
     """Node class for AVL Tree."""
+    __slots__ = ('value', 'left', 'right', 'height', 'size')
+
     def __init__(self, value):
-        """Initialize Node with value, left, right, and height."""
+        """Initialize Node with value, left, right, height, and subtree size."""
         self.value = value
         self.left = None
         self.right = None
-        self.height = 1  
-
-class AVLTree:
-    """Class for AVL Tree."""
-    def __init__(self):
-        """Initialize AVL Tree with root as None."""
-        self.root = None
-
-    def insert(self, value):
-        """Public method to insert value into AVL Tree."""
-        if not self.root:
-            self.root = Node(value)
-        else:
-            self.root = self._insert(self.root, value)
-
-    def _insert(self, node, value):
-        """Insert a value into the AVL Tree, and balance the tree."""
-        if not node:
-            return Node(value)
-
-        if value < node.value:
-            node.left = self._insert(node.left, value)
-        else:
-            node.right = self._insert(node.right, value)
-
-        node.height = 1 + max(self._get_height(node.left), self._get_height(node.right))
-
-        return self._balance(node)
+        self.height = 1
+        self.size = 1
+
+class _AVLBase:
+    """Shape-only AVL machinery shared by AVLTree and AVLMap.
+
+    Nothing here compares node contents: these methods only look at
+    left, right, height and size, so any node type with those slots works.
+    """
+
+    def _rebalance_path(self, path):
+        """Refresh heights and sizes bottom-up along a root-to-node path, rotating where needed."""
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            left, right = node.left, node.right
+            left_height = left.height if left else 0
+            right_height = right.height if right else 0
+            node.height = 1 + (left_height if left_height > right_height else right_height)
+            node.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+            if -1 <= left_height - right_height <= 1:
+                continue
+            balanced = self._balance(node)
+            if i == 0:
+                self.root = balanced
+            elif path[i - 1].left is node:
+                path[i - 1].left = balanced
+            else:
+                path[i - 1].right = balanced
 
     def _balance(self, node):
         """Balance the tree rooted at node."""
@@ -62,6 +74,8 @@ class AVLTree:
 
         z.height = 1 + max(self._get_height(z.left), self._get_height(z.right))
         y.height = 1 + max(self._get_height(y.left), self._get_height(y.right))
+        z.size = 1 + self._get_size(z.left) + self._get_size(z.right)
+        y.size = 1 + self._get_size(y.left) + self._get_size(y.right)
 
         return y
 
@@ -73,6 +87,8 @@ class AVLTree:
 
         z.height = 1 + max(self._get_height(z.left), self._get_height(z.right))
         y.height = 1 + max(self._get_height(y.left), self._get_height(y.right))
+        z.size = 1 + self._get_size(z.left) + self._get_size(z.right)
+        y.size = 1 + self._get_size(y.left) + self._get_size(y.right)
 
         return y
 
@@ -82,98 +98,779 @@ class AVLTree:
             return 0
         return node.height
 
+    def _get_size(self, node):
+        """Get the number of nodes in the subtree rooted at node."""
+        if not node:
+            return 0
+        return node.size
+
     def _get_balance(self, node):
         """Get the balance factor of a node."""
         if not node:
             return 0
         return self._get_height(node.left) - self._get_height(node.right)
-    
+
+    def __len__(self):
+        """Return the number of values in the tree in O(1)."""
+        return self._get_size(self.root)
+
+    # Join-based operations. They relink existing nodes instead of copying them,
+    # so the trees they are given are emptied and the result owns every node.
+
+    def _refresh(self, node):
+        """Recompute the height and size of node, then rebalance it."""
+        left, right = node.left, node.right
+        left_height = left.height if left else 0
+        right_height = right.height if right else 0
+        node.height = 1 + (left_height if left_height > right_height else right_height)
+        node.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+        if -1 <= left_height - right_height <= 1:
+            return node
+        return self._balance(node)
+
+    def _join(self, left, node, right):
+        """Join subtrees left and right, with node between them, in O(|height difference|)."""
+        left_height, right_height = self._get_height(left), self._get_height(right)
+        if left_height > right_height + 1:
+            left.right = self._join(left.right, node, right)
+            return self._refresh(left)
+        if right_height > left_height + 1:
+            right.left = self._join(left, node, right.left)
+            return self._refresh(right)
+        node.left, node.right = left, right
+        return self._refresh(node)
+
+    def _join2(self, left, right):
+        """Join subtrees left and right without a middle node."""
+        if left is None:
+            return right
+        rest, last = self._split_last(left)
+        return self._join(rest, last, right)
+
+    def _split_last(self, node):
+        """Detach the largest node of a subtree; return (remaining subtree, that node)."""
+        if node.right is None:
+            return node.left, node
+        rest, last = self._split_last(node.right)
+        return self._join(node.left, node, rest), last
+
+    def _take_root(self):
+        """Empty this tree and return its former root."""
+        root, self.root = self.root, None
+        return root
+
+
+class AVLTree(_AVLBase, SortedTreeMixin):
+    """Class for AVL Tree."""
+    def __init__(self):
+        """Initialize AVL Tree with root as None."""
+        self.root = None
+
+    @classmethod
+    def from_sorted(cls, iterable):
+        """Build a perfectly balanced tree from values in ascending order in O(n)."""
+        values = list(iterable)
+        if any(later < earlier for earlier, later in zip(values, values[1:])):
+            raise ValueError("from_sorted requires values in ascending order")
+        tree = cls()
+        tree.root = tree._build(values, 0, len(values))
+        return tree
+
+    def _build(self, values, lo, hi):
+        """Build a balanced subtree from values[lo:hi]."""
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = Node(values[mid])
+        node.left = self._build(values, lo, mid)
+        node.right = self._build(values, mid + 1, hi)
+        node.size = hi - lo
+        node.height = node.size.bit_length()  # Height of a complete subtree of this size
+        return node
+
+    def insert(self, value):
+        """Public method to insert value into AVL Tree."""
+        new_node = Node(value)
+        if not self.root:
+            self.root = new_node
+            return
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            node = node.left if value < node.value else node.right
+        parent = path[-1]
+        if value < parent.value:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self._rebalance_path(path)
+
+    def delete(self, value):
+        """Public method to delete one occurrence of value from AVL Tree."""
+        path = []
+        node = self.root
+        while node:
+            if value < node.value:
+                path.append(node)
+                node = node.left
+            elif node.value < value:
+                path.append(node)
+                node = node.right
+            else:
+                break
+        if node is None:
+            return
+        if node.left and node.right:
+            # Replace the value with its in-order successor, then unlink the successor
+            path.append(node)
+            successor = node.right
+            while successor.left:
+                path.append(successor)
+                successor = successor.left
+            node.value = successor.value
+            node = successor
+        child = node.left or node.right
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self._rebalance_path(path)
+
     def search(self, value):
         """Public method to search a value."""
-        return self._search(self.root, value) is not None
+        return self._search(value) is not None
+
+    def _search(self, value):
+        """Return a node holding value, or None if there is none."""
+        node = self.root
+        while node:
+            if value < node.value:
+                node = node.left
+            elif node.value < value:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def rank(self, value):
+        """Return the number of values less than value in O(log n)."""
+        return self._count_below(value, inclusive=False)
+
+    def _count_below(self, value, inclusive):
+        """Count the values less than (or, if inclusive, equal to) value."""
+        count = 0
+        node = self.root
+        while node:
+            if node.value < value or (inclusive and not value < node.value):
+                count += self._get_size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def select(self, k):
+        """Return the k-th smallest value (0-based; negative k counts from the end) in O(log n)."""
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("select index out of range")
+        node = self.root
+        while True:
+            left_size = self._get_size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node.value
+            else:
+                k -= left_size + 1
+                node = node.right
 
-    def _search(self, node, value):
-        """Search for a value in the tree rooted at node."""
-        if node is None:
-            return None
+    def count_range(self, lo, hi):
+        """Return the number of values v with lo <= v <= hi in O(log n)."""
+        return max(0, self._count_below(hi, inclusive=True) - self._count_below(lo, inclusive=False))
 
+    def _split(self, node, value):
+        """Split a subtree into (values < value, values >= value)."""
+        if node is None:
+            return None, None
+        if node.value < value:
+            left, right = self._split(node.right, value)
+            return self._join(node.left, node, left), right
+        left, right = self._split(node.left, value)
+        return left, self._join(right, node, node.right)
+
+    def _split3(self, node, value):
+        """Split a subtree into (values < value, whether value occurred, values > value)."""
+        if node is None:
+            return None, False, None
         if value < node.value:
-            return self._search(node.left, value)
-        elif value > node.value:
-            return self._search(node.right, value)
-        else:
-            return node
+            left, found, right = self._split3(node.left, value)
+            return left, found, self._join(right, node, node.right)
+        if node.value < value:
+            left, found, right = self._split3(node.right, value)
+            return self._join(node.left, node, left), found, right
+        # Copies of value may sit on both sides of an equal node
+        left, _, _ = self._split3(node.left, value)
+        _, _, right = self._split3(node.right, value)
+        return left, True, right
+
+    def _union(self, a, b):
+        """Union of two subtrees; copies in b of values in a are dropped."""
+        if a is None:
+            return b
+        if b is None:
+            return a
+        left, _, right = self._split3(b, a.value)
+        a_left, a_right = a.left, a.right
+        return self._join(self._union(a_left, left), a, self._union(a_right, right))
+
+    def _intersection(self, a, b):
+        """Values of subtree a that also occur in subtree b."""
+        if a is None or b is None:
+            return None
+        left, found, right = self._split3(b, a.value)
+        a_left, a_right = a.left, a.right
+        left = self._intersection(a_left, left)
+        right = self._intersection(a_right, right)
+        if found:
+            return self._join(left, a, right)
+        return self._join2(left, right)
+
+    def _difference(self, a, b):
+        """Values of subtree a that do not occur in subtree b."""
+        if a is None:
+            return None
+        if b is None:
+            return a
+        left, found, right = self._split3(b, a.value)
+        a_left, a_right = a.left, a.right
+        left = self._difference(a_left, left)
+        right = self._difference(a_right, right)
+        if found:
+            return self._join2(left, right)
+        return self._join(left, a, right)
+
+    def split(self, value):
+        """Split into (tree of values < value, tree of values >= value) in O(log n).
+
+        This tree is emptied.
+        """
+        left, right = self._split(self._take_root(), value)
+        less, rest = type(self)(), type(self)()
+        less.root, rest.root = left, right
+        return less, rest
+
+    @classmethod
+    def join(cls, left, right):
+        """Concatenate two trees where no value of left exceeds any value of right.
+
+        Runs in O(log n); both trees are emptied and a new tree is returned.
+        """
+        if left.root and right.root and right.select(0) < left.select(-1):
+            raise ValueError("join requires every value of left to be <= every value of right")
+        tree = cls()
+        tree.root = tree._join2(left._take_root(), right._take_root())
+        return tree
+
+    def _combine(self, other, operation):
+        """Apply a join-based set operation to both trees and return the result as a new tree."""
+        tree = type(self)()
+        tree.root = operation(self._take_root(), other._take_root())
+        return tree
+
+    def union(self, other):
+        """Return a tree of the values in either tree in O(m log(n/m + 1)).
+
+        Both trees are treated as sets and are emptied.
+        """
+        return self._combine(other, self._union)
+
+    def intersection(self, other):
+        """Return a tree of the values in both trees in O(m log(n/m + 1)).
+
+        Both trees are treated as sets and are emptied.
+        """
+        return self._combine(other, self._intersection)
+
+    def difference(self, other):
+        """Return a tree of the values of this tree not in other in O(m log(n/m + 1)).
+
+        Both trees are treated as sets and are emptied.
+        """
+        return self._combine(other, self._difference)
 
     def inorder_traversal(self):
         """Public method for in-order traversal."""
-        return self._inorder_traversal(self.root, [])
-
-    def _inorder_traversal(self, node, values):
-        """Perform an in-order traversal rooted at node."""
-        if node:
-            self._inorder_traversal(node.left, values)
+        values = []
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
             values.append(node.value)
-            self._inorder_traversal(node.right, values)
+            node = node.right
         return values
 
     def preorder_traversal(self):
         """Public method for pre-order traversal."""
-        return self._preorder_traversal(self.root, [])
-
-    def _preorder_traversal(self, node, values):
-        """Perform a pre-order traversal rooted at node."""
-        if node:
+        values = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
             values.append(node.value)
-            self._preorder_traversal(node.left, values)
-            self._preorder_traversal(node.right, values)
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
         return values
 
     def postorder_traversal(self):
         """Public method for post-order traversal."""
-        return self._postorder_traversal(self.root, [])
-
-    def _postorder_traversal(self, node, values):
-        """Perform a post-order traversal rooted at node."""
-        if node:
-            self._postorder_traversal(node.left, values)
-            self._postorder_traversal(node.right, values)
+        # Root-right-left pre-order, reversed, is left-right-root post-order
+        values = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
             values.append(node.value)
+            if node.left:
+                stack.append(node.left)
+            if node.right:
+                stack.append(node.right)
+        values.reverse()
         return values
-    
-    
-# Initialize AVL Tree
-avl = AVLTree()
 
-# Test search on empty tree
-assert avl.search(5) == False
+class MapNode:
+    """Node class for AVLMap; the key and value live in separate slots."""
+    __slots__ = ('key', 'value', 'order', 'left', 'right', 'height', 'size')
 
-# Test insert and root property
-avl.insert(5)
-assert avl.root.value == 5
+    def __init__(self, key, value, order):
+        """Initialize MapNode with key, value, sort order, children, height, and subtree size."""
+        self.key = key
+        self.value = value
+        self.order = order  # The key itself, or key(key) when the map has a key function
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+
+
+class AVLMap(_AVLBase):
+    """Sorted dictionary backed by an AVL tree.
+
+    Keys are kept in ascending order of ``key(k)`` (or of the keys themselves
+    when no key function is given). The key function runs once per insert and
+    its result is stored on the node, so lookups compare stored orders
+    directly. Keys whose ``key(k)`` are equal count as the same key.
+    """
+    def __init__(self, items=None, key=None):
+        """Initialize the map, optionally from a mapping or an iterable of pairs."""
+        self.root = None
+        self.key = key
+        if items is not None:
+            if hasattr(items, 'items'):
+                items = items.items()
+            for k, v in items:
+                self[k] = v
+
+    def _order(self, k):
+        """Return the sort order of key k."""
+        return k if self.key is None else self.key(k)
+
+    def _find(self, k):
+        """Return the node holding key k, or None if it is absent."""
+        order = self._order(k)
+        node = self.root
+        while node:
+            if order < node.order:
+                node = node.left
+            elif node.order < order:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def __getitem__(self, k):
+        """Get the value for key k; raise KeyError if it is absent."""
+        node = self._find(k)
+        if node is None:
+            raise KeyError(k)
+        return node.value
+
+    def get(self, k, default=None):
+        """Get the value for key k, or default if it is absent."""
+        node = self._find(k)
+        return default if node is None else node.value
+
+    def __setitem__(self, k, v):
+        """Set the value for key k."""
+        self._insert(k, v, replace=True)
+
+    def setdefault(self, k, default=None):
+        """Return the value for key k, inserting default first if it is absent."""
+        return self._insert(k, default, replace=False)
+
+    def _insert(self, k, v, replace):
+        """Insert k -> v unless k exists; update it if replace. Return the stored value."""
+        order = self._order(k)
+        path = []
+        node = self.root
+        while node:
+            if order < node.order:
+                path.append(node)
+                node = node.left
+            elif node.order < order:
+                path.append(node)
+                node = node.right
+            else:
+                if replace:
+                    node.value = v
+                return node.value
+        new_node = MapNode(k, v, order)
+        if not path:
+            self.root = new_node
+            return v
+        parent = path[-1]
+        if order < parent.order:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self._rebalance_path(path)
+        return v
+
+    def __delitem__(self, k):
+        """Delete key k; raise KeyError if it is absent."""
+        if self._remove(k) is None:
+            raise KeyError(k)
+
+    def pop(self, k, default=_MISSING):
+        """Remove key k and return its value, or default if it is absent."""
+        node = self._remove(k)
+        if node is None:
+            if default is _MISSING:
+                raise KeyError(k)
+            return default
+        return node.value
+
+    def _remove(self, k):
+        """Unlink the entry for key k; return a detached node holding its key and value."""
+        order = self._order(k)
+        path = []
+        node = self.root
+        while node:
+            if order < node.order:
+                path.append(node)
+                node = node.left
+            elif node.order < order:
+                path.append(node)
+                node = node.right
+            else:
+                break
+        if node is None:
+            return None
+        removed = MapNode(node.key, node.value, node.order)
+        if node.left and node.right:
+            # Move the in-order successor's entry here, then unlink the successor
+            path.append(node)
+            successor = node.right
+            while successor.left:
+                path.append(successor)
+                successor = successor.left
+            node.key, node.value, node.order = successor.key, successor.value, successor.order
+            node = successor
+        child = node.left or node.right
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self._rebalance_path(path)
+        return removed
 
-# Test search after one insert
-assert avl.search(5) == True
+    def __contains__(self, k):
+        """Enable 'in' operator."""
+        return self._find(k) is not None
 
-# Test multiple inserts and balancing
-avl.insert(2)
-avl.insert(8)
-avl.insert(1)
-avl.insert(3)
-assert avl.root.value == 5  # Root should still be 5
+    def clear(self):
+        """Remove every entry."""
+        self.root = None
 
-# Test search functionality
-assert avl.search(5) == True
-assert avl.search(3) == True
-assert avl.search(8) == True
-assert avl.search(10) == False  # Should be False, 10 is not inserted
+    def __iter__(self):
+        """Iterate over the keys in sorted order."""
+        return self.irange()
 
-# Test in-order traversal
-assert avl.inorder_traversal() == [1, 2, 3, 5, 8]
+    def keys(self):
+        """Iterate over the keys in sorted order."""
+        return self.irange()
+
+    def values(self):
+        """Iterate over the values in key order."""
+        return (node.value for node in self._irange_nodes(None, None, (True, True), False))
+
+    def items(self):
+        """Iterate over the key-value pairs in key order."""
+        return self.irange_items()
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        """Iterate over the keys between lo and hi; see SortedTreeMixin.irange."""
+        return (node.key for node in self._irange_nodes(lo, hi, inclusive, reverse))
+
+    def irange_items(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        """Iterate over the key-value pairs whose keys lie between lo and hi."""
+        return ((node.key, node.value) for node in self._irange_nodes(lo, hi, inclusive, reverse))
+
+    def _irange_nodes(self, lo, hi, inclusive, reverse):
+        """Yield the nodes whose keys lie between lo and hi, in order."""
+        lo = None if lo is None else self._order(lo)
+        hi = None if hi is None else self._order(hi)
+        return irange_nodes(self.root, lo, hi, inclusive, reverse, _node_order)
+
+    def __str__(self):
+        """String representation."""
+        return '{' + ', '.join(f"{k!r}: {v!r}" for k, v in self.items()) + '}'
+
+
+# Test cases
+
+def test_avl_tree():
+    # Initialize AVL Tree
+    avl = AVLTree()
+
+    # Test search on empty tree
+    assert avl.search(5) == False
+
+    # Test insert and root property
+    avl.insert(5)
+    assert avl.root.value == 5
+
+    # Test search after one insert
+    assert avl.search(5) == True
+
+    # Test multiple inserts and balancing
+    avl.insert(2)
+    avl.insert(8)
+    avl.insert(1)
+    avl.insert(3)
+    assert avl.root.value == 5  # Root should still be 5
+
+    # Test search functionality
+    assert avl.search(5) == True
+    assert avl.search(3) == True
+    assert avl.search(8) == True
+    assert avl.search(10) == False  # Should be False, 10 is not inserted
+
+    # Test in-order traversal
+    assert avl.inorder_traversal() == [1, 2, 3, 5, 8]
+
+    # Test pre-order traversal
+    assert avl.preorder_traversal() == [5, 2, 1, 3, 8]
+
+    # Test post-order traversal
+    assert avl.postorder_traversal() == [1, 3, 2, 8, 5]
+
+    print("All test cases passed!!!")
+
+
+def test_order_statistics():
+    import random
+
+    avl = AVLTree()
+    assert len(avl) == 0 and avl.rank(5) == 0 and avl.count_range(0, 10) == 0
+    values = [random.randint(0, 50) for _ in range(500)]
+    for value in values:
+        avl.insert(value)
+    ordered = sorted(values)
+    # Test subtree sizes stay correct through rotations
+    assert len(avl) == 500 and avl.root.size == 500
+    for x in range(-1, 53):
+        assert avl.rank(x) == sum(1 for v in values if v < x)
+    for k in (0, 1, 250, 499, -1):
+        assert avl.select(k) == ordered[k]
+    for lo, hi in [(10, 20), (0, 50), (20, 10), (-5, -1), (7, 7)]:
+        assert avl.count_range(lo, hi) == sum(1 for v in values if lo <= v <= hi)
+    try:
+        avl.select(500)
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("select past the end did not raise")
+
+    print("All test cases passed!!!")
+
+
+def _check_shape(node):
+    """Assert heights, sizes and balance are correct below node; return (height, size)."""
+    if node is None:
+        return 0, 0
+    left_height, left_size = _check_shape(node.left)
+    right_height, right_size = _check_shape(node.right)
+    assert node.height == 1 + max(left_height, right_height)
+    assert node.size == 1 + left_size + right_size
+    assert abs(left_height - right_height) <= 1
+    return node.height, node.size
+
+
+def _check_invariants(tree):
+    """Assert the tree is a correctly balanced and ordered AVL tree."""
+    _check_shape(tree.root)
+    values = tree.inorder_traversal()
+    assert values == sorted(values)
+
+
+def test_delete():
+    import random
+
+    avl = AVLTree()
+    # Test deleting from an empty tree and a missing value
+    avl.delete(1)
+    avl.insert(1)
+    avl.delete(2)
+    assert avl.inorder_traversal() == [1]
+    avl.delete(1)
+    assert avl.root is None and len(avl) == 0
+
+    # Test random inserts and deletes, including duplicates, keep the tree balanced
+    rng = random.Random(0)
+    reference = []
+    for _ in range(3000):
+        value = rng.randint(0, 200)
+        if reference and rng.random() < 0.45:
+            value = rng.choice(reference)
+            avl.delete(value)
+            reference.remove(value)
+        else:
+            avl.insert(value)
+            reference.append(value)
+        assert len(avl) == len(reference)
+    _check_invariants(avl)
+    assert avl.inorder_traversal() == sorted(reference)
+    assert avl.search(reference[0]) and not avl.search(-1)
+
+    # Test sorted inserts stay shallow without recursion
+    deep = AVLTree()
+    for value in range(100000):
+        deep.insert(value)
+    assert deep.root.height <= 18
+    for value in range(0, 100000, 2):
+        deep.delete(value)
+    _check_invariants(deep)
+    assert len(deep) == 50000 and deep.select(0) == 1
+
+    print("All test cases passed!!!")
+
+
+def test_bulk_and_set_operations():
+    import random
+
+    # Test from_sorted builds a perfectly balanced tree
+    avl = AVLTree.from_sorted(range(1000))
+    _check_invariants(avl)
+    assert len(avl) == 1000 and avl.root.height == 10
+    assert AVLTree.from_sorted([]).root is None
+    try:
+        AVLTree.from_sorted([2, 1])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unsorted input was accepted")
+
+    # Test split and join
+    less, rest = avl.split(300)
+    assert avl.root is None
+    _check_invariants(less)
+    _check_invariants(rest)
+    assert less.inorder_traversal() == list(range(300))
+    assert rest.inorder_traversal() == list(range(300, 1000))
+    joined = AVLTree.join(less, rest)
+    _check_invariants(joined)
+    assert joined.inorder_traversal() == list(range(1000))
+    try:
+        AVLTree.join(AVLTree.from_sorted([5]), AVLTree.from_sorted([1]))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Overlapping trees were joined")
+
+    # Test union, intersection and difference against Python sets
+    rng = random.Random(3)
+    for size_a, size_b in [(0, 10), (10, 0), (50, 50), (1000, 20), (20, 1000)]:
+        a = set(rng.sample(range(3000), size_a))
+        b = set(rng.sample(range(3000), size_b))
+        for method, expected in (("union", a | b), ("intersection", a & b), ("difference", a - b)):
+            tree_a, tree_b = AVLTree.from_sorted(sorted(a)), AVLTree.from_sorted(sorted(b))
+            result = getattr(tree_a, method)(tree_b)
+            _check_invariants(result)
+            assert result.inorder_traversal() == sorted(expected)
+            assert len(result) == len(expected)
+            assert tree_a.root is None and tree_b.root is None
+
+    print("All test cases passed!!!")
+
+
+def test_avl_map():
+    import random
+
+    m = AVLMap()
+    assert len(m) == 0 and list(m) == [] and str(m) == "{}"
+    # Test __setitem__, __getitem__ and update in place
+    for k in [5, 1, 9, 3, 7]:
+        m[k] = str(k)
+    m[3] = "three"
+    assert len(m) == 5 and m[3] == "three" and m.get(4) is None and 9 in m
+    assert list(m) == [1, 3, 5, 7, 9]
+    assert list(m.items()) == [(1, "1"), (3, "three"), (5, "5"), (7, "7"), (9, "9")]
+    try:
+        m[4]
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("Missing key did not raise KeyError")
+    # Test setdefault, pop and __delitem__
+    assert m.setdefault(5, "x") == "5" and m.setdefault(6, "six") == "six" and m[6] == "six"
+    assert m.pop(5) == "5" and m.pop(5, None) is None and 5 not in m
+    del m[1]
+    assert list(m.keys()) == [3, 6, 7, 9]
+    # Test range views
+    assert list(m.irange(4, 8)) == [6, 7]
+    assert list(m.irange_items(6, None, (False, True), reverse=True)) == [(9, "9"), (7, "7")]
+    assert list(m.values()) == ["three", "six", "7", "9"]
+
+    # Test the key function orders keys and runs once per insert
+    calls = []
+
+    def length(word):
+        calls.append(word)
+        return len(word)
+
+    words = AVLMap({"ccc": 3, "a": 1, "bb": 2}, key=length)
+    assert len(calls) == 3 and list(words) == ["a", "bb", "ccc"]
+    assert words["bb"] == 2 and list(words.irange("zz", "zzz")) == ["bb", "ccc"]
+
+    # Test random operations against a dict
+    rng = random.Random(6)
+    m, reference = AVLMap(), {}
+    for _ in range(3000):
+        k = rng.randint(0, 300)
+        if rng.random() < 0.4:
+            assert m.pop(k, None) == reference.pop(k, None)
+        else:
+            m[k] = reference[k] = rng.random()
+    _check_shape(m.root)
+    assert list(m.items()) == sorted(reference.items()) and len(m) == len(reference)
 
-# Test pre-order traversal
-assert avl.preorder_traversal() == [5, 2, 1, 3, 8]
+    print("All test cases passed!!!")
 
-# Test post-order traversal
-assert avl.postorder_traversal() == [1, 3, 2, 8, 5]
+if __name__ == "__main__":
+    from SortedTreeMixin import test_range_queries
 
-print("All test cases passed!!!")
+    test_avl_tree()
+    test_order_statistics()
+    test_delete()
+    test_bulk_and_set_operations()
+    test_range_queries(AVLTree)
+    test_avl_map()
@@ -0,0 +1,840 @@
+"""Benchmarks for the data structures in this repository.
+
+Run ``python Benchmarks.py`` for every benchmark, or pass benchmark names
+(e.g. ``python Benchmarks.py hash_table``) to run a subset.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from heapq import heappop, heappush
+
+from AvlTree import AVLTree, Node as AVLNode
+from BlockingPriorityQueue import BlockingPriorityQueue
+from BinaryTree import BinarySearchTree, SplayTree
+from ConcurrentHashTable import ConcurrentHashTable
+from FenwickTree import (FenwickTree, FenwickTree2D, RangeFenwickTree, SparseFenwickTree2D,
+                         WeightedSampler)
+from HashTable import ChainedHashTable, HashTable
+from MappedHashTable import MappedHashTable
+from PriorityQueue import PriorityQueue
+from SortedList import SortedList
+from TimingWheel import TimingWheel
+
+
+def _timed(func, *args):
+    """Run func(*args) and return (seconds, result)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def _allocated_bytes(build):
+    """Return the bytes still allocated by the object that build() returns."""
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current
+
+
+def _report(label, seconds, n, extra=""):
+    """Print one benchmark line as ops/sec."""
+    rate = n / seconds if seconds else float("inf")
+    print(f"  {label:<28} {seconds * 1000:10.1f} ms {rate:14,.0f} ops/s {extra}")
+
+
+def benchmark_hash_table(n=5000):
+    """Compare the open-addressing HashTable against the chained layout."""
+    print(f"HashTable vs ChainedHashTable, n={n:,}")
+    keys = [f"key{i}" for i in range(n)]
+
+    def fill(table_class):
+        table = table_class()
+        for i, key in enumerate(keys):
+            table.set(key, i)
+        return table
+
+    def lookup(table):
+        for key in keys:
+            table.get(key)
+
+    def length(table):
+        for _ in range(1000):
+            len(table)
+
+    for table_class in (ChainedHashTable, HashTable):
+        name = table_class.__name__
+        seconds, table = _timed(fill, table_class)
+        _report(f"{name}.set", seconds, n)
+        _report(f"{name}.get", _timed(lookup, table)[0], n)
+        _report(f"{name}.__len__", _timed(length, table)[0], 1000)
+        memory = _allocated_bytes(lambda: fill(table_class))
+        print(f"  {name} memory: {memory / n:.1f} bytes/entry")
+
+
+def benchmark_hash_table_resize(n=200000):
+    """Compare per-set latency of stop-the-world and incremental resizing."""
+    print(f"HashTable resize latency, n={n:,}")
+    for incremental in (False, True):
+        table = HashTable(incremental=incremental)
+        latencies = []
+        for i in range(n):
+            start = time.perf_counter()
+            table.set(i, i)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99)]
+        mode = "incremental" if incremental else "stop-the-world"
+        print(f"  {mode:<16} p99 {p99 * 1e6:8.2f} us  max {latencies[-1] * 1e6:10.1f} us"
+              f"  max rehash pause {table.max_pause * 1e6:10.1f} us")
+
+
+def benchmark_hash_table_bulk(n=200000):
+    """Compare bulk loading and lookups against per-key calls."""
+    print(f"HashTable bulk operations, n={n:,}")
+    pairs = [(f"key{i}", i) for i in range(n)]
+    keys = [key for key, _ in pairs]
+
+    def set_each():
+        table = HashTable()
+        for key, value in pairs:
+            table.set(key, value)
+        return table
+
+    seconds, table = _timed(set_each)
+    _report("set per key", seconds, n)
+    _report("from_items", _timed(HashTable.from_items, pairs)[0], n)
+    _report("get per key", _timed(lambda: [table.get(key) for key in keys])[0], n)
+    _report("get_many", _timed(table.get_many, keys)[0], n)
+
+
+def _run_threads(count, target):
+    """Run target(thread_index) on count threads and return the wall time."""
+    threads = [threading.Thread(target=target, args=(t,)) for t in range(count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def benchmark_concurrent_hash_table(ops_per_thread=50000, thread_counts=(1, 2, 4, 8)):
+    """Compare lock striping with one global lock as the number of threads grows."""
+    print(f"ConcurrentHashTable throughput, {ops_per_thread:,} ops/thread (80% get, 20% set)")
+
+    class GlobalLockTable:
+        def __init__(self):
+            self.table = HashTable()
+            self.lock = threading.Lock()
+
+        def get(self, key):
+            with self.lock:
+                return self.table.get(key)
+
+        def set(self, key, value):
+            with self.lock:
+                self.table.set(key, value)
+
+    for factory in (GlobalLockTable, ConcurrentHashTable):
+        for threads in thread_counts:
+            table = factory()
+
+            def work(offset):
+                for i in range(ops_per_thread):
+                    key = (offset * 7919 + i) % 10000
+                    if i % 5 == 0:
+                        table.set(key, i)
+                    else:
+                        table.get(key)
+
+            seconds = _run_threads(threads, work)
+            _report(f"{factory.__name__} x{threads}", seconds, threads * ops_per_thread)
+
+
+_COLD_START_WORKER = """
+import resource, sys, time
+start = time.perf_counter()
+kind, path, lookups = sys.argv[1], sys.argv[2], int(sys.argv[3])
+if kind == "memory":
+    import pickle
+    from HashTable import HashTable
+    with open(path, "rb") as file:
+        table = HashTable.from_items(pickle.load(file))
+else:
+    from MappedHashTable import MappedHashTable
+    table = MappedHashTable(path)
+for i in range(lookups):
+    table.get(f"key{i * 7919 % lookups}")
+elapsed = time.perf_counter() - start
+try:
+    # ru_maxrss survives exec on Linux, so prefer this process's own high-water mark
+    with open("/proc/self/status") as status:
+        peak_kib = next(int(line.split()[1]) for line in status if line.startswith("VmHWM"))
+except OSError:
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, peak_kib)
+"""
+
+
+def benchmark_mapped_hash_table(n=500000, lookups=1000):
+    """Compare worker cold start and peak RSS of HashTable and MappedHashTable."""
+    import pickle
+
+    print(f"MappedHashTable cold start, n={n:,}, {lookups:,} lookups per worker")
+    pairs = [(f"key{i}", f"value{i}") for i in range(n)]
+    with tempfile.TemporaryDirectory() as directory:
+        pickle_path = os.path.join(directory, "pairs.pickle")
+        with open(pickle_path, "wb") as file:
+            pickle.dump(pairs, file)
+        mapped_path = os.path.join(directory, "table.mht")
+        seconds, _ = _timed(MappedHashTable.build, mapped_path, pairs)
+        _report("MappedHashTable.build", seconds, n)
+        here = os.path.dirname(os.path.abspath(__file__))
+        for kind, path in (("memory", pickle_path), ("mapped", mapped_path)):
+            output = subprocess.run(
+                [sys.executable, "-c", _COLD_START_WORKER, kind, path, str(lookups)],
+                capture_output=True, text=True, check=True, cwd=here,
+            ).stdout.split()
+            print(f"  {kind:<8} worker start+lookups {float(output[0]) * 1000:10.1f} ms"
+                  f"   peak RSS {int(output[1]) / 1024:8.1f} MiB")
+
+
+def benchmark_avl_percentiles(n=20000, every=100):
+    """Compare percentile queries on live latency data: select() vs inorder_traversal()."""
+    import random
+
+    print(f"AVLTree live percentiles, n={n:,}, p50/p90/p99 every {every} inserts")
+    rng = random.Random(1)
+    samples = [rng.expovariate(1 / 20.0) for _ in range(n)]
+    quantiles = (0.5, 0.9, 0.99)
+
+    def with_select():
+        tree = AVLTree()
+        for i, sample in enumerate(samples, 1):
+            tree.insert(sample)
+            if i % every == 0:
+                for q in quantiles:
+                    tree.select(int(q * (i - 1)))
+
+    def with_traversal():
+        tree = AVLTree()
+        for i, sample in enumerate(samples, 1):
+            tree.insert(sample)
+            if i % every == 0:
+                ordered = tree.inorder_traversal()
+                for q in quantiles:
+                    ordered[int(q * (i - 1))]
+
+    queries = n // every * len(quantiles)
+    _report("inorder_traversal", _timed(with_traversal)[0], queries, "(incl. inserts)")
+    _report("select", _timed(with_select)[0], queries, "(incl. inserts)")
+
+
+class RecursiveAVLTree(AVLTree):
+    """The original recursive AVL insert/search, plus a recursive delete, as a baseline."""
+
+    def insert(self, value):
+        self.root = self._insert_rec(self.root, value)
+
+    def _insert_rec(self, node, value):
+        if not node:
+            return AVLNode(value)
+        if value < node.value:
+            node.left = self._insert_rec(node.left, value)
+        else:
+            node.right = self._insert_rec(node.right, value)
+        return self._refresh(node)
+
+    def _refresh(self, node):
+        node.height = 1 + max(self._get_height(node.left), self._get_height(node.right))
+        node.size = 1 + self._get_size(node.left) + self._get_size(node.right)
+        return self._balance(node)
+
+    def search(self, value):
+        return self._search_rec(self.root, value) is not None
+
+    def _search_rec(self, node, value):
+        if node is None:
+            return None
+        if value < node.value:
+            return self._search_rec(node.left, value)
+        elif value > node.value:
+            return self._search_rec(node.right, value)
+        return node
+
+    def delete(self, value):
+        self.root = self._delete_rec(self.root, value)
+
+    def _delete_rec(self, node, value):
+        if node is None:
+            return None
+        if value < node.value:
+            node.left = self._delete_rec(node.left, value)
+        elif value > node.value:
+            node.right = self._delete_rec(node.right, value)
+        else:
+            if node.left is None or node.right is None:
+                return node.left or node.right
+            successor = node.right
+            while successor.left:
+                successor = successor.left
+            node.value = successor.value
+            node.right = self._delete_rec(node.right, successor.value)
+        return self._refresh(node)
+
+
+def benchmark_avl_operations(n=100000):
+    """Compare the iterative AVLTree engine with the recursive one on a mixed workload."""
+    import random
+
+    print(f"AVLTree mixed workload, n={n:,} (50% insert, 25% delete, 25% search)")
+    rng = random.Random(2)
+    ops = []
+    live = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.5 or not live:
+            value = rng.random()
+            live.append(value)
+            ops.append((0, value))
+        elif roll < 0.75:
+            value = live.pop(rng.randrange(len(live)))
+            ops.append((1, value))
+        else:
+            ops.append((2, rng.choice(live)))
+
+    def run(tree_class):
+        tree = tree_class()
+        methods = (tree.insert, tree.delete, tree.search)
+        for op, value in ops:
+            methods[op](value)
+
+    for tree_class in (RecursiveAVLTree, AVLTree):
+        _report(tree_class.__name__, _timed(run, tree_class)[0], n)
+
+
+def benchmark_avl_bulk(n=200000, batch=50000, shards=8):
+    """Compare from_sorted/union ingest with one insert per value."""
+    import random
+
+    print(f"AVLTree ingest, base n={n:,}, {shards} shard batches of {batch:,}")
+    rng = random.Random(4)
+    base = sorted(rng.sample(range(n * 10), n))
+    batches = [sorted(rng.sample(range(n * 10), batch)) for _ in range(shards)]
+    total = n + batch * shards
+
+    def insert_each():
+        tree = AVLTree()
+        for value in base:
+            tree.insert(value)
+        for values in batches:
+            for value in values:
+                tree.insert(value)
+
+    def bulk():
+        tree = AVLTree.from_sorted(base)
+        for values in batches:
+            tree = tree.union(AVLTree.from_sorted(values))
+
+    _report("insert per value", _timed(insert_each)[0], total)
+    _report("from_sorted + union", _timed(bulk)[0], total)
+
+
+def benchmark_tree_pagination(n=200000, pages=200, page_size=20):
+    """Compare fetching pages of values with irange() and with inorder_traversal()."""
+    from itertools import islice
+
+    print(f"AVLTree pagination, n={n:,}, {pages} pages of {page_size}")
+    tree = AVLTree.from_sorted(range(n))
+    starts = [i * (n // pages) for i in range(pages)]
+
+    def with_traversal():
+        for start in starts:
+            values = tree.inorder_traversal()
+            values[start:start + page_size]
+
+    def with_irange():
+        for start in starts:
+            list(islice(tree.irange(start), page_size))
+
+    _report("inorder_traversal", _timed(with_traversal)[0], pages, "pages")
+    _report("irange", _timed(with_irange)[0], pages, "pages")
+
+
+def benchmark_sorted_containers(sizes=(10**4, 10**5)):
+    """Compare memory per element and ops/sec of SortedList and AVLTree.
+
+    Pass larger sizes, e.g. up to 10**7, to reproduce the big-tree numbers.
+    """
+    import random
+
+    for n in sizes:
+        print(f"SortedList vs AVLTree, n={n:,}")
+        rng = random.Random(8)
+        values = [rng.random() for _ in range(n)]
+        probes = rng.sample(values, min(n, 100000))
+
+        for container_class in (AVLTree, SortedList):
+            name = container_class.__name__
+
+            def fill():
+                container = container_class()
+                for value in values:
+                    container.insert(value)
+                return container
+
+            seconds, container = _timed(fill)
+            _report(f"{name}.insert", seconds, n)
+            _report(f"{name}.search", _timed(lambda: [container.search(v) for v in probes])[0],
+                    len(probes))
+            _report(f"{name}.delete", _timed(lambda: [container.delete(v) for v in probes])[0],
+                    len(probes))
+            del container
+            # The values already exist, so this counts only the container's own overhead
+            print(f"  {name} memory: {_allocated_bytes(fill) / n:.1f} bytes/element")
+
+
+def benchmark_skewed_lookups(n=50000, lookups=200000, skew=1.2):
+    """Compare Zipf-distributed searches on BinarySearchTree, AVLTree and SplayTree."""
+    import random
+
+    print(f"Skewed lookups, n={n:,}, {lookups:,} Zipf(s={skew}) searches")
+    rng = random.Random(10)
+    keys = list(range(n))
+    rng.shuffle(keys)  # Random insert order keeps the plain BST from degenerating
+    hot = keys[:]
+    rng.shuffle(hot)
+    weights = [1 / (rank + 1) ** skew for rank in range(n)]
+    probes = rng.choices(hot, weights, k=lookups)
+
+    for tree_class in (BinarySearchTree, AVLTree, SplayTree):
+        tree = tree_class()
+        for key in keys:
+            tree.insert(key)
+
+        def run():
+            for key in probes:
+                tree.search(key)
+
+        _report(tree_class.__name__, _timed(run)[0], lookups)
+
+
+def _random_graph(nodes, degree, seed):
+    """Return adjacency lists of (neighbour, integer weight) for a random directed graph."""
+    import random
+
+    rng = random.Random(seed)
+    return [[(rng.randrange(nodes), rng.randint(1, 100)) for _ in range(degree)]
+            for _ in range(nodes)]
+
+
+def _dijkstra(graph, pq):
+    """Run Dijkstra from node 0 with decrease-key on pq; return (distances, decrease-keys)."""
+    dist = [None] * len(graph)
+    best = {0: 0}
+    pq.push(0, 0)
+    decreases = 0
+    while not pq.is_empty():
+        node = pq.pop()
+        dist[node] = best[node]
+        for neighbour, weight in graph[node]:
+            if dist[neighbour] is not None:
+                continue
+            candidate = dist[node] + weight
+            if neighbour not in best:
+                best[neighbour] = candidate
+                pq.push(neighbour, candidate)
+            elif candidate < best[neighbour]:
+                best[neighbour] = candidate
+                pq.update_priority(neighbour, candidate)
+                decreases += 1
+    return dist, decreases
+
+
+def benchmark_dijkstra(nodes=50000, degree=8, seed=5):
+    """Run Dijkstra on a random graph with decrease-key and with heapq lazy deletion."""
+    graph = _random_graph(nodes, degree, seed)
+    print(f"Dijkstra, {nodes:,} nodes, {nodes * degree:,} edges")
+
+    def lazy():
+        dist = [None] * nodes
+        best = {0: 0}
+        heap = [(0, 0)]
+        while heap:
+            distance, node = heappop(heap)
+            if dist[node] is not None:
+                continue
+            dist[node] = distance
+            for neighbour, weight in graph[node]:
+                candidate = distance + weight
+                if dist[neighbour] is None and candidate < best.get(neighbour, candidate + 1):
+                    best[neighbour] = candidate
+                    heappush(heap, (candidate, neighbour))
+        return dist
+
+    seconds, (expected, decreases) = _timed(_dijkstra, graph, PriorityQueue())
+    _report("PriorityQueue decrease-key", seconds, nodes * degree, f"({decreases:,} decrease-keys)")
+    seconds, dist = _timed(lazy)
+    assert dist == expected
+    _report("heapq lazy deletion", seconds, nodes * degree)
+
+
+def benchmark_priority_queue_engines(n=200000, nodes=50000, degree=8, workers=8):
+    """Compare the PriorityQueue heap engines on push/pop, Dijkstra and melding."""
+    import random
+
+    rng = random.Random(3)
+    pairs = [(i, rng.randrange(10**6)) for i in range(n)]
+    graph = _random_graph(nodes, degree, 5)
+    engines = [("binary", None), ("dary", 4), ("dary", 8), ("pairing", None), ("radix", None)]
+    print(f"PriorityQueue engines, n={n:,}, Dijkstra on {nodes:,} nodes, meld of {workers} queues")
+
+    def push_pop(pq):
+        for val, priority in pairs:
+            pq.push(val, priority)
+        while not pq.is_empty():
+            pq.pop()
+
+    def meld(queues):
+        merged = queues[0]
+        for queue in queues[1:]:
+            merged.meld(queue)
+        return merged
+
+    expected = None
+    for engine, arity in engines:
+        name = engine if arity is None else f"{engine}({arity})"
+        _report(f"{name} push+pop", _timed(push_pop, PriorityQueue(engine=engine, arity=arity))[0], 2 * n)
+        seconds, (dist, _) = _timed(_dijkstra, graph, PriorityQueue(engine=engine, arity=arity))
+        assert expected is None or dist == expected
+        expected = dist
+        _report(f"{name} Dijkstra", seconds, nodes * degree)
+        queues = [PriorityQueue.from_items(pairs[w::workers], engine=engine, arity=arity)
+                  for w in range(workers)]
+        seconds, merged = _timed(meld, queues)
+        assert merged.size() == n
+        _report(f"{name} meld", seconds, n)
+
+
+def benchmark_priority_queue_bulk(n=300000, k=1000):
+    """Compare bulk loading a PriorityQueue against pushing one job at a time."""
+    import random
+
+    rng = random.Random(9)
+    pairs = [(f"job{i}", rng.random()) for i in range(n)]
+    print(f"PriorityQueue bulk load, n={n:,}")
+
+    def push_each():
+        pq = PriorityQueue()
+        for val, priority in pairs:
+            pq.push(val, priority)
+        return pq
+
+    _report("push x n", _timed(push_each)[0], n)
+    seconds, pq = _timed(PriorityQueue.from_items, pairs)
+    _report("from_items", seconds, n)
+    _report(f"nsmallest({k})", _timed(pq.nsmallest, k)[0], k)
+    _report(f"pop_many({k})", _timed(pq.pop_many, k)[0], k)
+
+
+def benchmark_timers(n=10**6, idle=0.5):
+    """Compare timer scheduling on a TimingWheel and a heap, and idle consumer CPU."""
+    import random
+
+    rng = random.Random(11)
+    deadlines = [rng.uniform(0, 3600) for _ in range(n)]
+    print(f"Timers, n={n:,}")
+
+    def wheel_schedule():
+        wheel = TimingWheel()
+        for key, deadline in enumerate(deadlines):
+            wheel.add(key, deadline)
+        return wheel
+
+    def heap_schedule():
+        heap = []
+        for key, deadline in enumerate(deadlines):
+            heappush(heap, (deadline, key))
+        return heap
+
+    def wheel_cancel(wheel):
+        for key in range(0, n, 2):
+            wheel.remove(key)
+
+    def wheel_expire(wheel):
+        fired = 0
+        for minute in range(1, 61):
+            fired += len(wheel.advance(minute * 60.0))
+        return fired
+
+    seconds, wheel = _timed(wheel_schedule)
+    _report("TimingWheel.add", seconds, n)
+    _report("heappush", _timed(heap_schedule)[0], n)
+    _report("TimingWheel.remove", _timed(wheel_cancel, wheel)[0], n // 2)
+    seconds, fired = _timed(wheel_expire, wheel)
+    assert fired == n - n // 2
+    _report("TimingWheel.advance (1 h)", seconds, fired)
+
+    # CPU used by a consumer waiting on an empty queue for `idle` seconds
+    def blocked():
+        start = time.thread_time()
+        BlockingPriorityQueue().get(timeout=idle)
+        cpu.append(time.thread_time() - start)
+
+    def polling():
+        start = time.thread_time()
+        queue = PriorityQueue()
+        stop = time.monotonic() + idle
+        while time.monotonic() < stop and queue.pop() is None:
+            time.sleep(0.001)
+        cpu.append(time.thread_time() - start)
+
+    for label, target in [("blocking get", blocked), ("1 ms polling", polling)]:
+        cpu = []
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+        print(f"  {label:<28} idle CPU {cpu[0] * 1000:8.2f} ms over {idle * 1000:.0f} ms")
+
+
+def benchmark_top_k(n=10**6, k=100, chunk=10**5):
+    """Stream n synthetic scores through a bounded PriorityQueue and keep the top k.
+
+    The stream is generated in chunks, so memory stays flat for any n;
+    pass n=10**8 for the full-scale run.
+    """
+    import random
+    from heapq import nlargest
+
+    print(f"Top-{k} of a {n:,}-element stream")
+
+    def stream():
+        rng = random.Random(4)
+        for start in range(0, n, chunk):
+            yield [(i, rng.random()) for i in range(start, min(start + chunk, n))]
+
+    def bounded():
+        pq = PriorityQueue(capacity=k, keep="largest")
+        for pairs in stream():
+            pq.push_many(pairs)
+        return pq.drain_sorted()
+
+    def unbounded_heapq():
+        best = []
+        for pairs in stream():
+            best = nlargest(k, best + pairs, key=lambda pair: pair[1])
+        return best
+
+    _report("stream generation only", _timed(lambda: sum(1 for _ in stream()))[0], n)
+    seconds, ranking = _timed(bounded)
+    _report("BoundedPriorityQueue", seconds, n)
+    seconds, expected = _timed(unbounded_heapq)
+    assert ranking == expected
+    _report("heapq.nlargest per chunk", seconds, n)
+
+
+def benchmark_fenwick_range_add(n=100000, windows=2000, width=500):
+    """Credit whole windows of time buckets with range_add versus one update per bucket."""
+    import random
+
+    rng = random.Random(2)
+    starts = [rng.randrange(n - width) for _ in range(windows)]
+    print(f"Fenwick window credits, n={n:,}, {windows:,} windows of {width}")
+
+    def per_bucket(tree):
+        for start in starts:
+            for index in range(start, start + width):
+                tree.update_tree(index, 1)
+        return tree
+
+    def ranged(tree):
+        for start in starts:
+            tree.range_add(start, start + width - 1, 1)
+        return tree
+
+    seconds, plain = _timed(per_bucket, FenwickTree([0] * n))
+    _report("FenwickTree.update_tree loop", seconds, windows)
+    seconds, tree = _timed(ranged, RangeFenwickTree([0] * n))
+    _report("RangeFenwickTree.range_add", seconds, windows)
+    assert tree.range_sum(n // 4, n // 2) == plain.range_sum(n // 4, n // 2)
+
+
+def benchmark_fenwick_bulk(n=10**6, batch=10**5):
+    """Compare FenwickTree construction and batch updates/queries across backings."""
+    import random
+
+    from FenwickTree import np
+
+    rng = random.Random(1)
+    values = [rng.randint(0, 1000) for _ in range(n)]
+    indices = [rng.randrange(n) for _ in range(batch)]
+    deltas = [rng.randint(1, 9) for _ in range(batch)]
+    print(f"FenwickTree bulk, n={n:,}, batch={batch:,}")
+
+    def point_by_point():
+        tree = FenwickTree([])
+        tree.array_size, tree.array, tree.tree = n, list(values), [0] * (n + 1)
+        for index, value in enumerate(values):
+            tree._add(index, value)
+        return tree
+
+    def one_at_a_time(tree):
+        for index, delta in zip(indices, deltas):
+            tree.update_tree(index, delta)
+        return [tree.query_sum(index) for index in indices]
+
+    def batched(tree):
+        tree.update_many(indices, deltas)
+        return tree.query_many(indices)
+
+    _report("construct, O(n log n) loop", _timed(point_by_point)[0], n)
+    backings = [None] + (["int64"] if np is not None else [])
+    expected = None
+    for dtype in backings:
+        name = "list" if dtype is None else dtype
+        seconds, tree = _timed(FenwickTree, values, dtype)
+        _report(f"construct, {name}", seconds, n)
+        if dtype is None:
+            seconds, expected = _timed(one_at_a_time, FenwickTree(values))
+            _report("update+query one at a time", seconds, 2 * batch)
+        seconds, totals = _timed(batched, tree)
+        assert list(totals) == expected
+        _report(f"update_many+query_many, {name}", seconds, 2 * batch)
+    if np is None:
+        print("  (NumPy not installed; skipping the int64 backing)")
+
+
+def benchmark_weighted_sampling(n=100000, rounds=2000):
+    """Compare prefix search and dynamic weighted sampling with the O(n)/O(log^2 n) alternatives."""
+    import random
+    from itertools import accumulate
+
+    rng = random.Random(7)
+    weights = [rng.randint(0, 100) for _ in range(n)]
+    updates = [(rng.randrange(n), rng.randint(0, 100)) for _ in range(rounds)]
+    tree = FenwickTree(weights)
+    targets = [rng.randint(1, tree.query_sum(n - 1)) for _ in range(rounds)]
+    print(f"Weighted sampling, n={n:,}, {rounds:,} update+sample rounds")
+
+    def bisect_query_sum():
+        results = []
+        for target in targets:
+            lo, hi = 0, n - 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if tree.query_sum(mid) < target:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            results.append(lo)
+        return results
+
+    def lifting():
+        return [tree.find_prefix(target) for target in targets]
+
+    def rescan():
+        current = list(weights)
+        picks = []
+        for index, weight in updates:
+            current[index] = weight
+            picks.append(rng.choices(range(n), cum_weights=list(accumulate(current)))[0])
+        return picks
+
+    def sampler():
+        weighted = WeightedSampler(weights, rng=rng)
+        for index, weight in updates:
+            weighted.update(index, weight)
+            weighted.sample()
+
+    seconds, expected = _timed(bisect_query_sum)
+    _report("bisect over query_sum", seconds, rounds)
+    seconds, found = _timed(lifting)
+    assert found == expected
+    _report("find_prefix", seconds, rounds)
+    _report("cumulative rescan per sample", _timed(rescan)[0], rounds)
+    _report("WeightedSampler", _timed(sampler)[0], rounds)
+
+
+def benchmark_fenwick_2d(rows=1000, cols=1000, queries=2000):
+    """Compare 2-D Fenwick rectangle sums and construction against scanning the grid."""
+    import random
+
+    rng = random.Random(8)
+    grid = [[rng.randint(0, 9) for _ in range(cols)] for _ in range(rows)]
+    rects = []
+    for _ in range(queries):
+        r1, r2 = sorted(rng.randrange(rows) for _ in range(2))
+        c1, c2 = sorted(rng.randrange(cols) for _ in range(2))
+        rects.append((r1, c1, r2, c2))
+    print(f"FenwickTree2D, {rows:,} x {cols:,} grid, {queries:,} rectangles")
+
+    def scan():
+        return [sum(sum(row[c1:c2 + 1]) for row in grid[r1:r2 + 1]) for r1, c1, r2, c2 in rects[:200]]
+
+    def point_by_point():
+        tree = FenwickTree2D([[0] * cols for _ in range(rows)])
+        for r, row in enumerate(grid):
+            for c, value in enumerate(row):
+                if value:
+                    tree.update_tree(r, c, value)
+        return tree
+
+    def rect_sums(tree):
+        return [tree.rect_sum(*rect) for rect in rects]
+
+    seconds, expected = _timed(scan)
+    _report("scan the grid", seconds, 200)
+    _report("construct, update per cell", _timed(point_by_point)[0], rows * cols)
+    for typecode in [None, "q"]:
+        name = "list" if typecode is None else f"array({typecode!r})"
+        seconds, tree = _timed(FenwickTree2D, grid, typecode)
+        _report(f"construct, {name}", seconds, rows * cols)
+        seconds, sums = _timed(rect_sums, tree)
+        assert sums[:200] == expected
+        _report(f"rect_sum, {name}", seconds, queries)
+        memory = _allocated_bytes(lambda: FenwickTree2D(grid, typecode))
+        print(f"  {name} memory: {memory / (rows * cols):.1f} bytes/cell")
+    list_of_lists = _allocated_bytes(lambda: [list(row) for row in grid])
+    print(f"  list of row lists memory: {list_of_lists / (rows * cols):.1f} bytes/cell")
+
+    sparse = SparseFenwickTree2D(10**9, 10**9)
+    cells = [(rng.randrange(10**9), rng.randrange(10**9), 1) for _ in range(1000)]
+    seconds, _ = _timed(lambda: [sparse.update_tree(*cell) for cell in cells])
+    _report("sparse 10^9 x 10^9 update", seconds, len(cells), f"({len(sparse.tree):,} nodes)")
+    seconds, _ = _timed(lambda: [sparse.rect_sum(r, c, r + 10**8, c + 10**8) for r, c, _ in cells])
+    _report("sparse 10^9 x 10^9 rect_sum", seconds, len(cells))
+
+
+BENCHMARKS = {
+    "hash_table": benchmark_hash_table,
+    "hash_table_resize": benchmark_hash_table_resize,
+    "hash_table_bulk": benchmark_hash_table_bulk,
+    "concurrent_hash_table": benchmark_concurrent_hash_table,
+    "mapped_hash_table": benchmark_mapped_hash_table,
+    "avl_percentiles": benchmark_avl_percentiles,
+    "avl_operations": benchmark_avl_operations,
+    "avl_bulk": benchmark_avl_bulk,
+    "tree_pagination": benchmark_tree_pagination,
+    "sorted_containers": benchmark_sorted_containers,
+    "skewed_lookups": benchmark_skewed_lookups,
+    "dijkstra": benchmark_dijkstra,
+    "priority_queue_bulk": benchmark_priority_queue_bulk,
+    "priority_queue_engines": benchmark_priority_queue_engines,
+    "timers": benchmark_timers,
+    "top_k": benchmark_top_k,
+    "fenwick_range_add": benchmark_fenwick_range_add,
+    "fenwick_bulk": benchmark_fenwick_bulk,
+    "weighted_sampling": benchmark_weighted_sampling,
+    "fenwick_2d": benchmark_fenwick_2d,
+}
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
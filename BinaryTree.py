@@ -1,15 +1,26 @@
+from SortedTreeMixin import SortedTreeMixin
+
+
 class Node:
     """Represents an individual node in the BST."""
     def __init__(self, value):
         self.value = value
         self.left = None
         self.right = None
+        self.count = 1  # Copies of value stored here (only above 1 in multiset mode)
+        self.size = 1  # Total count of the subtree rooted here
+
+class BinarySearchTree(SortedTreeMixin):
+    """Binary Search Tree implementation.
 
-class BinarySearchTree:
-    """Binary Search Tree implementation."""
-    def __init__(self):
+    Every node keeps the total count of its subtree, so size() is O(1) and
+    rank/select/count_less_than take O(height). With multiset=True, inserting
+    an existing value bumps a per-node count instead of being ignored.
+    """
+    def __init__(self, multiset=False):
         """Initialize an empty BST."""
         self.root = None
+        self.multiset = multiset
 
     def insert(self, value):
         """Public method to insert a value into the BST."""
@@ -23,6 +34,9 @@ class BinarySearchTree:
             node.left = self._insert(node.left, value)
         elif value > node.value:
             node.right = self._insert(node.right, value)
+        elif self.multiset:
+            node.count += 1
+        self._update_size(node)
         return node
 
     def delete(self, value):
@@ -37,6 +51,8 @@ class BinarySearchTree:
             node.left = self._delete(node.left, value)
         elif value > node.value:
             node.right = self._delete(node.right, value)
+        elif node.count > 1:
+            node.count -= 1
         else:
             if node.left is None:
                 return node.right
@@ -44,7 +60,10 @@ class BinarySearchTree:
                 return node.left
             min_larger_node = self._get_min(node.right)
             node.value = min_larger_node.value
+            node.count = min_larger_node.count
+            min_larger_node.count = 1  # So that the node itself is removed below
             node.right = self._delete(node.right, min_larger_node.value)
+        self._update_size(node)
         return node
 
     def _get_min(self, node):
@@ -74,64 +93,574 @@ class BinarySearchTree:
         return self._inorder_traversal(self.root, [])
 
     def _inorder_traversal(self, node, values):
-        """Helper method for in-order traversal."""
-        if node:
-            self._inorder_traversal(node.left, values)
+        """Helper method for in-order traversal, using an explicit stack."""
+        stack = []
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
             values.append(node.value)
-            self._inorder_traversal(node.right, values)
+            if node.count > 1:
+                values.extend([node.value] * (node.count - 1))
+            node = node.right
         return values
 
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        """Iterate over values between lo and hi; multiset copies are repeated."""
+        for node in self._irange_nodes(lo, hi, inclusive, reverse):
+            for _ in range(node.count):
+                yield node.value
+
     def is_empty(self):
         """Check if the BST is empty."""
         return self.root is None
 
     def size(self):
-        """Return the number of nodes in the BST."""
+        """Return the number of values in the BST in O(1)."""
+        return self._size(self.root)
+
+    def __len__(self):
+        """Return the number of values in the BST in O(1)."""
         return self._size(self.root)
 
     def _size(self, node):
-        """Helper method to calculate the size of a subtree."""
+        """Helper method returning the size of a subtree."""
         if node is None:
             return 0
+        return node.size
+
+    def _update_size(self, node):
+        """Recompute the subtree size of node from its count and children."""
+        node.size = node.count + self._size(node.left) + self._size(node.right)
+
+    def count(self, value):
+        """Return how many copies of value the BST holds."""
+        node = self.root
+        while node:
+            if value < node.value:
+                node = node.left
+            elif node.value < value:
+                node = node.right
+            else:
+                return node.count
+        return 0
+
+    def count_less_than(self, value, inclusive=False):
+        """Count the values less than (or, if inclusive, equal to) value in O(height)."""
+        total = 0
+        node = self.root
+        while node:
+            if value < node.value:
+                node = node.left
+            elif node.value < value:
+                total += self._size(node.left) + node.count
+                node = node.right
+            else:
+                total += self._size(node.left)
+                if inclusive:
+                    total += node.count
+                break
+        return total
+
+    def rank(self, value):
+        """Return the number of values less than value in O(height)."""
+        return self.count_less_than(value)
+
+    def select(self, k):
+        """Return the k-th smallest value (0-based; negative k counts from the end) in O(height)."""
+        if k < 0:
+            k += self.size()
+        if not 0 <= k < self.size():
+            raise IndexError("select index out of range")
+        node = self.root
+        while True:
+            left_size = self._size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k < left_size + node.count:
+                return node.value
+            else:
+                k -= left_size + node.count
+                node = node.right
+
+
+class SplayTree(BinarySearchTree):
+    """Self-adjusting BST: every access splays the accessed value to the root.
+
+    Operations take amortized O(log n) time and frequently accessed values
+    stay near the root, so skewed lookups approach O(1). Splaying is done
+    top-down with loops, so even a degenerate tree never recurses.
+
+    Subtree sizes are only maintained once rank, select or count_less_than
+    is first called, which recomputes them in O(n); until then splaying
+    skips that bookkeeping and len() comes from a running total.
+    """
+    def __init__(self, multiset=False):
+        """Initialize an empty splay tree."""
+        super().__init__(multiset)
+        self._sized = False  # Whether node sizes are kept up to date
+        self._total = 0
+
+    def size(self):
+        """Return the number of values in the tree in O(1)."""
+        return self._total
+
+    def __len__(self):
+        """Return the number of values in the tree in O(1)."""
+        return self._total
+
+    def _track_sizes(self):
+        """Recompute every subtree size and keep them up to date from now on."""
+        if self._sized:
+            return
+        stack, order = [self.root] if self.root else [], []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            if node.left:
+                stack.append(node.left)
+            if node.right:
+                stack.append(node.right)
+        # Parents come before their children in order, so reversing it sizes children first
+        for node in reversed(order):
+            node.size = node.count + (node.left.size if node.left else 0) + (node.right.size if node.right else 0)
+        self._sized = True
+
+    def count_less_than(self, value, inclusive=False):
+        """Count the values less than (or, if inclusive, equal to) value in O(height)."""
+        self._track_sizes()
+        return super().count_less_than(value, inclusive)
+
+    def select(self, k):
+        """Return the k-th smallest value (0-based; negative k counts from the end) in O(height)."""
+        self._track_sizes()
+        return super().select(k)
+
+    def _splay(self, value):
+        """Move the node holding value, or the last node on its search path, to the root.
+
+        Splaying only rearranges nodes, so sizes, when tracked, are patched
+        cheaply: a node linked into the left or right tree first stores the
+        size it keeps (itself plus its untouched side), and one pass down
+        each spine then turns those parts into subtree sizes.
+        """
+        node = self.root
+        if node is None or node.value == value:
+            return
+        sized = self._sized
+        header = Node(None)
+        left_max = right_min = header
+        left_size = right_size = 0  # Total size linked into the left and right trees
+        while True:
+            if value < node.value:
+                child = node.left
+                if child is None:
+                    break
+                if value < child.value:
+                    below = node.left = child.right  # Zig-zig: rotate right first
+                    child.right = node
+                    if sized:
+                        size = node.size
+                        node.size = size - child.size + (below.size if below else 0)
+                        child.size = size
+                    node = child
+                    if node.left is None:
+                        break
+                right_min.left = node  # Link node into the right tree
+                right_min = node
+                if sized:
+                    node.size -= node.left.size
+                    right_size += node.size
+                node = node.left
+            elif node.value < value:
+                child = node.right
+                if child is None:
+                    break
+                if child.value < value:
+                    below = node.right = child.left  # Zig-zig: rotate left first
+                    child.left = node
+                    if sized:
+                        size = node.size
+                        node.size = size - child.size + (below.size if below else 0)
+                        child.size = size
+                    node = child
+                    if node.right is None:
+                        break
+                left_max.right = node  # Link node into the left tree
+                left_max = node
+                if sized:
+                    node.size -= node.right.size
+                    left_size += node.size
+                node = node.right
+            else:
+                break
+        left, right = node.left, node.right
+        left_max.right = left
+        right_min.left = right
+        if sized:
+            # Walk each spine top-down, giving every node the total of the parts from it downwards
+            linked, total = header.right, left_size + (left.size if left else 0)
+            while linked is not left:
+                part = linked.size
+                linked.size = total
+                total -= part
+                linked = linked.right
+            linked, total = header.left, right_size + (right.size if right else 0)
+            while linked is not right:
+                part = linked.size
+                linked.size = total
+                total -= part
+                linked = linked.left
+            node.size += left_size + right_size
+        node.left = header.right
+        node.right = header.left
+        self.root = node
+
+    def insert(self, value):
+        """Insert a value and splay it to the root."""
+        if self.root is None:
+            self.root = Node(value)
+            self._total = 1
+            return
+        self._splay(value)
+        root = self.root
+        if root.value == value:
+            if self.multiset:
+                root.count += 1
+                root.size += 1
+                self._total += 1
+            return
+        self._total += 1
+        new_node = Node(value)
+        if value < root.value:
+            new_node.left, new_node.right = root.left, root
+            root.left = None
+        else:
+            new_node.left, new_node.right = root, root.right
+            root.right = None
+        self._update_size(root)
+        self._update_size(new_node)
+        self.root = new_node
+
+    def delete(self, value):
+        """Delete a value, splaying its neighbourhood to the root."""
+        self._splay(value)
+        root = self.root
+        if root is None or root.value != value:
+            return
+        self._total -= 1
+        if root.count > 1:
+            root.count -= 1
+            root.size -= 1
+        elif root.left is None:
+            self.root = root.right
+        else:
+            right = root.right
+            self.root = root.left
+            self._splay(value)  # The largest value of the left subtree has no right child
+            self.root.right = right
+            self._update_size(self.root)
+
+    def search(self, value):
+        """Search a value, splaying it to the root; return its node or None."""
+        self._splay(value)
+        if self.root is not None and self.root.value == value:
+            return self.root
+        return None
+
+
+class PersistentBinarySearchTree(BinarySearchTree):
+    """BST whose updates never modify existing nodes.
+
+    insert and delete copy only the O(height) nodes on the search path and
+    share the rest with the previous version, then publish the new root with
+    a single assignment. A version captured with snapshot() therefore stays
+    valid and consistent without locks, and nodes no longer reachable from
+    any version are freed by the garbage collector.
+    """
+
+    def snapshot(self):
+        """Return an independent tree sharing the current version, in O(1)."""
+        tree = type(self)(multiset=self.multiset)
+        tree.root = self.root
+        return tree
+
+    def _copy_path(self, path, child):
+        """Rebuild a root-to-child path bottom-up with child as the new bottom subtree."""
+        for node, went_left in reversed(path):
+            copy = Node(node.value)
+            copy.count = node.count
+            if went_left:
+                copy.left, copy.right = child, node.right
+            else:
+                copy.left, copy.right = node.left, child
+            self._update_size(copy)
+            child = copy
+        return child
+
+    def _recount(self, node, delta):
+        """Return a copy of node with its count changed by delta."""
+        copy = Node(node.value)
+        copy.left, copy.right = node.left, node.right
+        copy.count = node.count + delta
+        self._update_size(copy)
+        return copy
+
+    def _insert(self, node, value):
+        """Return a new root with value inserted, copying only the search path."""
+        root = node
+        path = []
+        while node is not None:
+            if value < node.value:
+                path.append((node, True))
+                node = node.left
+            elif value > node.value:
+                path.append((node, False))
+                node = node.right
+            elif self.multiset:
+                return self._copy_path(path, self._recount(node, 1))
+            else:
+                return root
+        return self._copy_path(path, Node(value))
+
+    def _delete(self, node, value):
+        """Return a new root with value removed, copying only the search path."""
+        root = node
+        path = []
+        while node is not None:
+            if value < node.value:
+                path.append((node, True))
+                node = node.left
+            elif value > node.value:
+                path.append((node, False))
+                node = node.right
+            else:
+                break
+        if node is None:
+            return root
+        if node.count > 1:
+            replacement = self._recount(node, -1)
+        elif node.left is None:
+            replacement = node.right
+        elif node.right is None:
+            replacement = node.left
         else:
-            return 1 + self._size(node.left) + self._size(node.right)
+            # Copy the path down to the in-order successor and drop it from the right subtree
+            successor_path = []
+            successor = node.right
+            while successor.left is not None:
+                successor_path.append((successor, True))
+                successor = successor.left
+            replacement = Node(successor.value)
+            replacement.count = successor.count
+            replacement.left = node.left
+            replacement.right = self._copy_path(successor_path, successor.right)
+            self._update_size(replacement)
+        return self._copy_path(path, replacement)
+
+
+# Test cases
+
+def test_binary_search_tree():
+    bst = BinarySearchTree()
+
+    # Test is_empty method on an empty tree
+    assert bst.is_empty() == True
+
+    # Test size method on an empty tree
+    assert bst.size() == 0
+
+    # Test insert method
+    bst.insert(10)
+    bst.insert(5)
+    bst.insert(15)
+    bst.insert(2)
+    bst.insert(7)
+
+    # Test is_empty method after insertion
+    assert bst.is_empty() == False
+
+    # Test size method after insertion
+    assert bst.size() == 5
+
+    # Test inorder_traversal method
+    assert bst.inorder_traversal() == [2, 5, 7, 10, 15]
+
+    # Test search method
+    assert bst.search(10).value == 10
+    assert bst.search(100) == None
+
+    # Test delete method
+    bst.delete(2)
+    bst.delete(15)
+    assert bst.inorder_traversal() == [5, 7, 10]
 
+    # Test size method after deletion
+    assert bst.size() == 3
+
+    print("All test cases passed!")
+
+
+def test_splay_tree():
+    import random
+
+    tree = SplayTree()
+    assert tree.search(1) is None and tree.size() == 0
+    tree.delete(1)
+    for value in [10, 5, 15, 2, 7, 5]:
+        tree.insert(value)
+    # Test the last inserted or accessed value is at the root
+    assert tree.root.value == 5 and tree.size() == 5
+    assert tree.search(15).value == 15 and tree.root.value == 15
+    assert tree.search(100) is None
+    assert tree.inorder_traversal() == [2, 5, 7, 10, 15]
+    tree.delete(10)
+    tree.delete(99)
+    assert tree.inorder_traversal() == [2, 5, 7, 15] and tree.size() == 4
+
+    # Test sorted inserts do not hit the recursion limit
+    deep = SplayTree()
+    for value in range(50000):
+        deep.insert(value)
+    assert deep.count(0) == 1 and deep.count(-1) == 0
+    assert deep.search(0).value == 0 and deep.size() == 50000
+    assert deep.inorder_traversal() == list(range(50000))
+
+    # Test random operations against a set
+    rng = random.Random(9)
+    tree, reference = SplayTree(), set()
+    for _ in range(5000):
+        value = rng.randint(0, 500)
+        roll = rng.random()
+        if roll < 0.4:
+            tree.insert(value)
+            reference.add(value)
+        elif roll < 0.7:
+            tree.delete(value)
+            reference.discard(value)
+        else:
+            assert (tree.search(value) is not None) == (value in reference)
+    assert tree.inorder_traversal() == sorted(reference) and tree.size() == len(reference)
+
+    print("All test cases passed!")
+
+
+
+def test_persistent_binary_search_tree():
+    import random
+
+    tree = PersistentBinarySearchTree()
+    for value in [10, 5, 15, 2, 7, 12, 20]:
+        tree.insert(value)
+    before = tree.snapshot()
+    old_root = tree.root
+
+    # Test updates leave earlier versions untouched
+    tree.insert(6)
+    tree.delete(10)
+    tree.delete(100)
+    assert before.inorder_traversal() == [2, 5, 7, 10, 12, 15, 20]
+    assert tree.inorder_traversal() == [2, 5, 6, 7, 12, 15, 20]
+    assert before.root is old_root and old_root.value == 10
+
+    # Test unchanged subtrees are shared rather than copied
+    shared = tree.snapshot()
+    tree.insert(1)
+    assert tree.root is not shared.root
+    assert tree.root.right is shared.root.right
+
+    # Test a duplicate insert or missing delete keeps the same version
+    root = tree.root
+    tree.insert(1)
+    tree.delete(99)
+    assert tree.root is root
+
+    # Test many versions against sorted lists
+    rng = random.Random(11)
+    versions = []
+    reference = set()
+    tree = PersistentBinarySearchTree()
+    for _ in range(2000):
+        value = rng.randint(0, 300)
+        if rng.random() < 0.4:
+            tree.delete(value)
+            reference.discard(value)
+        else:
+            tree.insert(value)
+            reference.add(value)
+        if rng.random() < 0.05:
+            versions.append((tree.snapshot(), sorted(reference)))
+    for snapshot, expected in versions:
+        assert snapshot.inorder_traversal() == expected
 
-# Test the BinarySearchTree class
-bst = BinarySearchTree()
+    print("All test cases passed!")
 
-# Test is_empty method on an empty tree
-assert bst.is_empty() == True
 
-# Test size method on an empty tree
-assert bst.size() == 0
 
-# Test insert method
-bst.insert(10)
-bst.insert(5)
-bst.insert(15)
-bst.insert(2)
-bst.insert(7)
+def _check_sizes(node):
+    """Assert every stored subtree size is correct; return the size below node."""
+    if node is None:
+        return 0
+    size = node.count + _check_sizes(node.left) + _check_sizes(node.right)
+    assert node.size == size
+    return size
 
-# Test is_empty method after insertion
-assert bst.is_empty() == False
 
-# Test size method after insertion
-assert bst.size() == 5
+def test_order_statistics(tree_class):
+    import random
 
-# Test inorder_traversal method
-assert bst.inorder_traversal() == [2, 5, 7, 10, 15]
+    for multiset in (False, True):
+        rng = random.Random(12)
+        tree = tree_class(multiset=multiset)
+        reference = []
+        for _ in range(3000):
+            value = rng.randint(0, 200)
+            if reference and rng.random() < 0.4:
+                value = rng.choice(reference)
+                tree.delete(value)
+                reference.remove(value)
+            elif multiset or value not in reference:
+                tree.insert(value)
+                reference.append(value)
+            else:
+                tree.insert(value)  # Ignored outside multiset mode
+            if rng.random() < 0.2:
+                tree.search(rng.randint(0, 200))
+        reference.sort()
+        assert tree.size() == len(tree) == len(reference)
+        assert tree.inorder_traversal() == reference and list(tree.irange()) == reference
+        for x in range(-1, 203, 7):
+            assert tree.rank(x) == tree.count_less_than(x) == sum(1 for v in reference if v < x)
+            assert tree.count_less_than(x, inclusive=True) == sum(1 for v in reference if v <= x)
+            assert tree.count(x) == reference.count(x)
+        for k in (0, len(reference) // 3, len(reference) - 1, -1):
+            assert tree.select(k) == reference[k]
+        _check_sizes(tree.root)
+        # Test sizes stay correct through further updates once they are in use
+        for _ in range(500):
+            value = rng.randint(0, 200)
+            if value in reference:
+                tree.delete(value)
+                reference.remove(value)
+            else:
+                tree.insert(value)
+                reference.append(value)
+            tree.search(rng.randint(0, 200))
+        reference.sort()
+        _check_sizes(tree.root)
+        assert len(tree) == len(reference) and tree.select(len(reference) // 2) == reference[len(reference) // 2]
 
-# Test search method
-assert bst.search(10).value == 10
-assert bst.search(100) == None
+    print("All test cases passed!")
 
-# Test delete method
-bst.delete(2)
-bst.delete(15)
-assert bst.inorder_traversal() == [5, 7, 10]
 
-# Test size method after deletion
-assert bst.size() == 3
+if __name__ == "__main__":
+    from SortedTreeMixin import test_range_queries
 
-print("All test cases passed!")
\ No newline at end of file
+    test_binary_search_tree()
+    test_range_queries(BinarySearchTree)
+    test_range_queries(SplayTree)
+    test_splay_tree()
+    test_persistent_binary_search_tree()
+    for tree_class in (BinarySearchTree, SplayTree, PersistentBinarySearchTree):
+        test_order_statistics(tree_class)
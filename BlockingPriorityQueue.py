@@ -0,0 +1,406 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+from PriorityQueue import PriorityQueue
+from TimingWheel import TimingWheel
+
+
+class BlockingPriorityQueue:
+    """Thread-safe PriorityQueue whose consumers sleep until an element arrives.
+
+    Every operation holds one lock; ``get`` waits on a condition variable
+    instead of polling, so an idle consumer uses no CPU. Returning None when
+    ``get`` times out matches ``PriorityQueue.pop`` on an empty queue.
+    """
+
+    def __init__(self, engine="binary", arity=None):
+        """Initialize an empty queue on the given PriorityQueue engine."""
+        self._queue = PriorityQueue(engine=engine, arity=arity)
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+
+    def put(self, val, priority):
+        """Add an element, or update its priority if already queued, and wake one consumer."""
+        with self._lock:
+            self._queue.push(val, priority)
+            self._not_empty.notify()
+
+    def put_many(self, pairs):
+        """Add (val, priority) pairs and wake all consumers."""
+        with self._lock:
+            self._queue.push_many(pairs)
+            self._not_empty.notify_all()
+
+    def get(self, timeout=None):
+        """Remove and return the highest-priority element, waiting for one if the queue is empty.
+
+        :param timeout: Longest wait in seconds, or None to wait forever.
+        :return: The element, or None if the timeout passed first.
+        """
+        with self._lock:
+            if not self._not_empty.wait_for(lambda: not self._queue.is_empty(), timeout):
+                return None
+            return self._queue.pop()
+
+    def get_many(self, k, timeout=None):
+        """Wait like get, then remove and return up to k elements in priority order.
+
+        :return: A list, empty if the timeout passed first.
+        """
+        with self._lock:
+            if not self._not_empty.wait_for(lambda: not self._queue.is_empty(), timeout):
+                return []
+            return self._queue.pop_many(k)
+
+    def peek(self):
+        """Return the highest-priority element without removing it, or None if empty."""
+        with self._lock:
+            return self._queue.peek()
+
+    def remove(self, val):
+        """Remove an element; return True if it was queued."""
+        with self._lock:
+            return self._queue.remove(val)
+
+    def update_priority(self, val, new_priority):
+        """Update the priority of a queued element; return True if it was queued."""
+        with self._lock:
+            return self._queue.update_priority(val, new_priority)
+
+    def contain(self, val):
+        """Check if a value is queued."""
+        with self._lock:
+            return self._queue.contain(val)
+
+    def size(self):
+        """Return the number of queued elements."""
+        with self._lock:
+            return self._queue.size()
+
+    def __len__(self):
+        """Return the number of queued elements."""
+        return self.size()
+
+
+class AsyncPriorityQueue:
+    """asyncio counterpart of BlockingPriorityQueue.
+
+    ``get`` and ``get_many`` are coroutines that suspend until an element
+    arrives. ``put`` never blocks, so it is a plain method. The queue is
+    meant for a single event loop and is not thread-safe.
+    """
+
+    def __init__(self, engine="binary", arity=None):
+        """Initialize an empty queue on the given PriorityQueue engine."""
+        self._queue = PriorityQueue(engine=engine, arity=arity)
+        self._waiters = deque()
+
+    def _wake_next(self):
+        """Wake the longest-waiting consumer that is still waiting."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def put(self, val, priority):
+        """Add an element, or update its priority if already queued, and wake one consumer."""
+        self._queue.push(val, priority)
+        self._wake_next()
+
+    def put_many(self, pairs):
+        """Add (val, priority) pairs, waking one consumer per element."""
+        self._queue.push_many(pairs)
+        for _ in range(min(self._queue.size(), len(self._waiters))):
+            self._wake_next()
+
+    async def _wait_not_empty(self):
+        """Suspend until the queue has an element."""
+        while self._queue.is_empty():
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+                # Pass on a wake-up this consumer received but can no longer use
+                if not self._queue.is_empty() and not waiter.cancelled():
+                    self._wake_next()
+                raise
+
+    async def _wait(self, timeout):
+        """Wait for an element; return False if the timeout passed first."""
+        if timeout is None:
+            await self._wait_not_empty()
+            return True
+        try:
+            await asyncio.wait_for(self._wait_not_empty(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def get(self, timeout=None):
+        """Remove and return the highest-priority element, waiting for one if the queue is empty.
+
+        :return: The element, or None if the timeout passed first.
+        """
+        if not await self._wait(timeout):
+            return None
+        val = self._queue.pop()
+        if not self._queue.is_empty():
+            self._wake_next()
+        return val
+
+    async def get_many(self, k, timeout=None):
+        """Wait like get, then remove and return up to k elements in priority order."""
+        if not await self._wait(timeout):
+            return []
+        vals = self._queue.pop_many(k)
+        if not self._queue.is_empty():
+            self._wake_next()
+        return vals
+
+    def get_nowait(self):
+        """Remove and return the highest-priority element, or None if the queue is empty."""
+        return self._queue.pop()
+
+    def remove(self, val):
+        """Remove an element; return True if it was queued."""
+        return self._queue.remove(val)
+
+    def update_priority(self, val, new_priority):
+        """Update the priority of a queued element; return True if it was queued."""
+        return self._queue.update_priority(val, new_priority)
+
+    def contain(self, val):
+        """Check if a value is queued."""
+        return self._queue.contain(val)
+
+    def size(self):
+        """Return the number of queued elements."""
+        return self._queue.size()
+
+    def __len__(self):
+        """Return the number of queued elements."""
+        return self._queue.size()
+
+
+class DelayQueue:
+    """Thread-safe queue whose elements become visible only after their scheduled time.
+
+    Pending elements sit in a TimingWheel, so scheduling and cancelling are
+    O(1) even with millions of timers. Once due, they move to a
+    PriorityQueue ordered by scheduled time. ``get`` sleeps until the wheel's
+    next expiry instead of polling.
+    """
+
+    def __init__(self, resolution=0.001, clock=time.monotonic):
+        """Initialize an empty queue.
+
+        :param resolution: Timer granularity in seconds; elements may appear up to one tick late.
+        :param clock: Monotonic time source, in seconds.
+        """
+        self.clock = clock
+        self._wheel = TimingWheel(resolution=resolution, now=clock())
+        self._ready = PriorityQueue()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def put(self, val, delay=0.0):
+        """Schedule val to become visible after delay seconds, rescheduling it if already queued."""
+        with self._lock:
+            self._ready.remove(val)
+            self._wheel.add(val, self.clock() + delay)
+            self._changed.notify()
+
+    def put_at(self, val, when):
+        """Schedule val to become visible at clock time when, rescheduling it if already queued."""
+        with self._lock:
+            self._ready.remove(val)
+            self._wheel.add(val, when)
+            self._changed.notify()
+
+    def cancel(self, val):
+        """Remove val whether or not it is due yet; return True if it was queued."""
+        with self._lock:
+            return self._wheel.remove(val) or self._ready.remove(val)
+
+    def _collect(self):
+        """Move every element whose time has come from the wheel to the ready queue."""
+        self._ready.push_many(self._wheel.advance(self.clock()))
+
+    def poll(self):
+        """Remove and return the earliest due element, or None if none is due yet."""
+        with self._lock:
+            self._collect()
+            return self._ready.pop()
+
+    def _wait_ready(self, timeout):
+        """With the lock held, wait until an element is due; return False on timeout."""
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            self._collect()
+            if not self._ready.is_empty():
+                return True
+            now = self.clock()
+            expiry = self._wheel.next_expiry()
+            wait = None if expiry is None else max(expiry - now, 0.0)
+            if deadline is not None:
+                if now >= deadline:
+                    return False
+                wait = deadline - now if wait is None else min(wait, deadline - now)
+            self._changed.wait(wait)
+
+    def get(self, timeout=None):
+        """Remove and return the earliest due element, waiting until one is due.
+
+        :return: The element, or None if the timeout passed first.
+        """
+        with self._lock:
+            if not self._wait_ready(timeout):
+                return None
+            return self._ready.pop()
+
+    def get_many(self, k, timeout=None):
+        """Wait like get, then remove and return up to k due elements in scheduled order."""
+        with self._lock:
+            if not self._wait_ready(timeout):
+                return []
+            return self._ready.pop_many(k)
+
+    def size(self):
+        """Return the number of queued elements, due or not."""
+        with self._lock:
+            return len(self._wheel) + self._ready.size()
+
+    def __len__(self):
+        """Return the number of queued elements, due or not."""
+        return self.size()
+
+
+# Test cases
+
+def test_blocking_priority_queue():
+    q = BlockingPriorityQueue()
+    # Test the non-blocking API and timeouts
+    assert q.get(timeout=0.01) is None and q.get_many(3, timeout=0) == []
+    q.put("b", 2)
+    q.put_many([("a", 1), ("c", 3)])
+    assert len(q) == 3 and q.peek() == "a" and q.contain("c")
+    assert q.update_priority("c", 0) and q.remove("b") and not q.remove("b")
+    assert q.get() == "c" and q.get_many(5) == ["a"]
+
+    # Test a blocked consumer is woken by put
+    results = []
+    consumer = threading.Thread(target=lambda: results.append(q.get(timeout=5)))
+    consumer.start()
+    time.sleep(0.02)
+    q.put("late", 1)
+    consumer.join(timeout=5)
+    assert results == ["late"]
+
+    # Test every element is taken exactly once by competing consumers
+    q = BlockingPriorityQueue(engine="pairing")
+    taken = []
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def consume():
+        while True:
+            batch = q.get_many(10, timeout=0.05)
+            if not batch and done.is_set():
+                return
+            with lock:
+                taken.extend(batch)
+
+    consumers = [threading.Thread(target=consume) for _ in range(4)]
+    for thread in consumers:
+        thread.start()
+    for i in range(2000):
+        q.put(i, i % 17)
+    done.set()
+    for thread in consumers:
+        thread.join(timeout=5)
+    assert sorted(taken) == list(range(2000)) and len(q) == 0
+
+    print("All test cases passed!")
+
+
+def test_async_priority_queue():
+    async def scenario():
+        q = AsyncPriorityQueue()
+        assert await q.get(timeout=0.01) is None and q.get_nowait() is None
+        # Test a waiting consumer is woken by put
+        waiter = asyncio.ensure_future(q.get())
+        await asyncio.sleep(0)
+        q.put("x", 5)
+        assert await waiter == "x"
+        # Test several consumers share a batch and each gets the next element in order
+        consumers = [asyncio.ensure_future(q.get()) for _ in range(3)]
+        await asyncio.sleep(0)
+        q.put_many([("p", 3), ("q", 1), ("r", 2)])
+        assert sorted(await asyncio.gather(*consumers)) == ["p", "q", "r"]
+        # Test a timed-out consumer does not swallow a wake-up
+        timed = asyncio.ensure_future(q.get(timeout=0.01))
+        patient = asyncio.ensure_future(q.get())
+        assert await timed is None
+        q.put("y", 1)
+        assert await patient == "y"
+        q.put_many([("m", 2), ("n", 1)])
+        assert await q.get_many(5) == ["n", "m"] and len(q) == 0
+
+    asyncio.run(scenario())
+    print("All test cases passed!")
+
+
+def test_delay_queue():
+    now = [100.0]
+    q = DelayQueue(resolution=0.5, clock=lambda: now[0])
+    # Test elements stay hidden until their time and come out in scheduled order
+    q.put("later", 10)
+    q.put("sooner", 3)
+    q.put_at("now", 100.0)
+    q.put("cancelled", 1)
+    assert q.cancel("cancelled") and not q.cancel("cancelled") and len(q) == 3
+    assert q.poll() is None
+    now[0] = 100.6
+    assert q.poll() == "now" and q.poll() is None
+    now[0] = 111.0
+    assert q.get_many(5) == ["sooner", "later"] and len(q) == 0
+    # Test rescheduling a due element hides it again
+    q.put("again", 0)
+    now[0] = 112.0
+    q.put("again", 5)
+    assert q.poll() is None and len(q) == 1
+
+    # Test get sleeps until the element is due, on the real clock
+    q = DelayQueue()
+    assert q.get(timeout=0.01) is None
+    start = time.monotonic()
+    q.put("tick", 0.05)
+    assert q.get(timeout=5) == "tick"
+    assert 0.05 <= time.monotonic() - start < 1
+
+    # Test a sleeping consumer is woken for an element scheduled earlier
+    results = []
+    consumer = threading.Thread(target=lambda: results.append(q.get(timeout=5)))
+    q.put("far", 60)
+    consumer.start()
+    time.sleep(0.02)
+    q.put("near", 0.02)
+    consumer.join(timeout=5)
+    assert results == ["near"] and q.cancel("far")
+
+    print("All test cases passed!")
+
+
+if __name__ == "__main__":
+    test_blocking_priority_queue()
+    test_async_priority_queue()
+    test_delay_queue()
@@ -0,0 +1,205 @@
+import threading
+
+from HashTable import HashTable
+
+# Smallest number of slots a stripe starts with, so small tables do not resize at once.
+_MIN_STRIPE_SIZE = 8
+# Odd 64-bit constant (2**64 / golden ratio) that spreads hash bits into the high half.
+_STRIPE_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+class ConcurrentHashTable:
+    """Thread-safe hash table built from lock-striped HashTable segments.
+
+    Keys are spread over ``stripes`` independent HashTables, each guarded by
+    its own lock, so threads working on different stripes never wait for each
+    other. A stripe only resizes while its lock is held, so readers never see
+    a half-built table.
+    """
+
+    def __init__(self, size=10, stripes=16):
+        """Initialize the table with the given total size and number of stripes."""
+        self._tables = [HashTable(size=max(_MIN_STRIPE_SIZE, size // stripes)) for _ in range(stripes)]
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def _stripe(self, key):
+        """Return (lock, table) for the stripe that owns key.
+
+        The inner tables place keys by ``hash % size``, so the stripe is taken
+        from the high bits of a multiplied hash instead; otherwise every key
+        in a stripe would share its low residues and crowd the same slots.
+        """
+        mixed = (hash(key) * _STRIPE_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF
+        index = (mixed >> 32) % len(self._tables)
+        return self._locks[index], self._tables[index]
+
+    def set(self, key, value):
+        """Set a value for a key."""
+        lock, table = self._stripe(key)
+        with lock:
+            table.set(key, value)
+
+    def get(self, key):
+        """Get the value for a key."""
+        lock, table = self._stripe(key)
+        with lock:
+            return table.get(key)
+
+    def delete(self, key):
+        """Delete a key-value pair."""
+        lock, table = self._stripe(key)
+        with lock:
+            table.delete(key)
+
+    def contains(self, key):
+        """Check if a key exists."""
+        lock, table = self._stripe(key)
+        with lock:
+            return table.contains(key)
+
+    def get_or_set(self, key, default):
+        """Atomically return the value for key, storing default first if it is absent."""
+        lock, table = self._stripe(key)
+        with lock:
+            if table.contains(key):
+                return table.get(key)
+            table.set(key, default)
+            return default
+
+    def compute_if_absent(self, key, func):
+        """Atomically return the value for key, storing func(key) first if it is absent.
+
+        func runs at most once per missing key, while the stripe lock is held.
+        """
+        lock, table = self._stripe(key)
+        with lock:
+            if table.contains(key):
+                return table.get(key)
+            value = func(key)
+            table.set(key, value)
+            return value
+
+    def compare_and_set(self, key, expected, value):
+        """Atomically set key to value if its current value is expected.
+
+        A missing key has the current value None, like ``get``.
+        :return: True if the value was replaced, False otherwise.
+        """
+        lock, table = self._stripe(key)
+        with lock:
+            current = table.get(key)
+            if current is not expected and current != expected:
+                return False
+            table.set(key, value)
+            return True
+
+    def keys(self):
+        """Get a snapshot of all keys, taken one stripe at a time."""
+        return [key for items in self._snapshots() for key, _ in items]
+
+    def values(self):
+        """Get a snapshot of all values, taken one stripe at a time."""
+        return [value for items in self._snapshots() for _, value in items]
+
+    def items(self):
+        """Get a snapshot of all key-value pairs, taken one stripe at a time."""
+        return [item for items in self._snapshots() for item in items]
+
+    def _snapshots(self):
+        """Yield a copy of each stripe's items."""
+        for lock, table in zip(self._locks, self._tables):
+            with lock:
+                items = list(table.items())
+            yield items
+
+    def clear(self):
+        """Clear the table, holding every stripe lock so the clear is atomic."""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            for table in self._tables:
+                table.clear()
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def __len__(self):
+        """Get the number of items; exact only when no writer is running."""
+        return sum(len(table) for table in self._tables)
+
+    def __str__(self):
+        """String representation."""
+        return str(self.items())
+
+    def __contains__(self, key):
+        """Enable 'in' operator."""
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        """Enable bracket notation for getting items."""
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        """Enable bracket notation for setting items."""
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        """Enable 'del' operator."""
+        self.delete(key)
+
+
+# Test cases
+
+def test_concurrent_hash_table():
+    cht = ConcurrentHashTable(size=8, stripes=4)
+    # Test the basic HashTable API
+    cht["a"] = 1
+    assert cht["a"] == 1 and "a" in cht and len(cht) == 1
+    del cht["a"]
+    assert cht.get("a") is None and "a" not in cht
+
+    # Test atomic helpers
+    assert cht.get_or_set("x", 1) == 1
+    assert cht.get_or_set("x", 2) == 1
+    calls = []
+    assert cht.compute_if_absent("y", lambda key: calls.append(key) or 10) == 10
+    assert cht.compute_if_absent("y", lambda key: calls.append(key) or 20) == 10
+    assert calls == ["y"]
+    assert cht.compare_and_set("x", 1, 5) == True
+    assert cht.compare_and_set("x", 1, 6) == False
+    assert cht["x"] == 5
+    assert cht.compare_and_set("z", None, 0) == True and cht["z"] == 0
+
+    # Test sequential keys spread over every stripe instead of piling into a few
+    spread = ConcurrentHashTable(stripes=8)
+    for i in range(800):
+        spread[i] = i
+    assert all(50 <= len(table) <= 150 for table in spread._tables)
+
+    # Test concurrent writers and counters from many threads
+    cht.clear()
+    assert len(cht) == 0
+    cht["count"] = 0
+
+    def worker(offset):
+        for i in range(500):
+            cht.set((offset, i), i)
+            while True:
+                count = cht["count"]
+                if cht.compare_and_set("count", count, count + 1):
+                    break
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cht["count"] == 8 * 500
+    assert len(cht) == 8 * 500 + 1
+    assert all(cht[(t, i)] == i for t in range(8) for i in range(500))
+
+    print("All test cases passed!")
+
+
+if __name__ == "__main__":
+    test_concurrent_hash_table()
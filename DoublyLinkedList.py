@@ -12,8 +12,9 @@ class DoublyLinkedList():
     """Class for creating a doubly linked list."""
     
     def __init__(self):
-        """Initialize an empty list with a head pointer."""
+        """Initialize an empty list with head and tail pointers."""
         self.head = None
+        self.tail = None
 
     def find_node(self, data):
         """Find and return node containing data; return None if not found."""
@@ -36,7 +37,7 @@ class DoublyLinkedList():
         return None
 
     def insert_after(self, prev_node, data):
-        """Insert node after a given node (prev_node)."""
+        """Insert node after a given node (prev_node) and return the new node."""
         if (prev_node is None):
             return
         new_node = Node(data)
@@ -45,26 +46,63 @@ class DoublyLinkedList():
         prev_node.next = new_node
         if new_node.next:
             new_node.next.prev = new_node
+        else:
+            self.tail = new_node
+        return new_node
 
     def insert_beginning(self, data):
-        """Insert node at the beginning of the list."""
+        """Insert node at the beginning of the list and return the new node."""
         new_node = Node(data)
-        new_node.next = self.head
-        if (self.head is not None):
-            self.head.prev = new_node
-        self.head = new_node
+        self._link_front(new_node)
+        return new_node
 
     def insert_end(self, data):
-        """Insert node at the end of the list."""
+        """Insert node at the end of the list in O(1) and return the new node."""
         new_node = Node(data)
-        if (self.head is None):
-            self.head = new_node
+        if (self.tail is None):
+            self.head = self.tail = new_node
+            return new_node
+        self.tail.next = new_node
+        new_node.prev = self.tail
+        self.tail = new_node
+        return new_node
+
+    def _link_front(self, node):
+        """Link a detached node in at the head of the list."""
+        node.prev = None
+        node.next = self.head
+        if (self.head is not None):
+            self.head.prev = node
+        else:
+            self.tail = node
+        self.head = node
+
+    def remove_node(self, node):
+        """Unlink a node of this list in O(1), given the node itself."""
+        prev_node, next_node = node.prev, node.next
+        if prev_node:
+            prev_node.next = next_node
+        else:
+            self.head = next_node
+        if next_node:
+            next_node.prev = prev_node
+        else:
+            self.tail = prev_node
+        node.prev = node.next = None
+
+    def move_to_front(self, node):
+        """Move a node of this list to the head in O(1)."""
+        if node is self.head:
             return
-        last = self.head
-        while last.next:
-            last = last.next
-        last.next = new_node
-        new_node.prev = last
+        self.remove_node(node)
+        self._link_front(node)
+
+    def pop_end(self):
+        """Remove and return the tail node; return None if the list is empty."""
+        node = self.tail
+        if node is not None:
+            self.remove_node(node)
+        return node
 
     def is_empty(self):
         """Check if the list is empty."""
@@ -92,14 +130,7 @@ class DoublyLinkedList():
         target_node = self.find_node(data)
         if not target_node:
             return
-        prev_node, next_node = target_node.prev, target_node.next
-        if prev_node:
-            prev_node.next = next_node
-        else:
-            self.head = next_node
-        if next_node:
-            next_node.prev = prev_node
-        del target_node
+        self.remove_node(target_node)
 
     def remove_duplicates(self):
         """Remove duplicate nodes from the list."""
@@ -108,14 +139,7 @@ class DoublyLinkedList():
         while current_node:
             next_node = current_node.next
             if current_node.data in seen:
-                prev_node = current_node.prev
-                if prev_node:
-                    prev_node.next = next_node
-                else:
-                    self.head = next_node
-                if next_node:
-                    next_node.prev = prev_node
-                del current_node
+                self.remove_node(current_node)
             else:
                 seen.add(current_node.data)
             current_node = next_node
@@ -124,6 +148,7 @@ class DoublyLinkedList():
         """Reverse the list."""
         current_node = self.head
         prev_node = None
+        self.tail = current_node
         while current_node:
             next_node = current_node.next
             current_node.next = prev_node
@@ -186,6 +211,19 @@ def test_doubly_linked_list():
     # Test reverse
     my_list.reverse()
     assert my_list.to_list() == [25, 20, 5]
+    assert my_list.tail.data == 5
+
+    # Test node handles, move_to_front and pop_end
+    node = my_list.insert_end(30)
+    assert my_list.tail is node
+    my_list.move_to_front(node)
+    assert my_list.to_list() == [30, 25, 20, 5] and my_list.tail.data == 5
+    assert my_list.pop_end().data == 5
+    my_list.remove_node(my_list.find_node(25))
+    assert my_list.to_list() == [30, 20] and my_list.tail.data == 20
+    assert my_list.pop_end().data == 20 and my_list.pop_end().data == 30
+    assert my_list.pop_end() is None
+    assert my_list.is_empty() and my_list.tail is None
 
     print("All test cases passed!")
 
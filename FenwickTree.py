@@ -1,22 +1,102 @@
+import random
+from array import array
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only FenwickTree(dtype=...) needs it
+    np = None
+
+
+def _build(values):
+    """Return the 1-based Fenwick tree of values in O(n).
+
+    Node i covers the elements (i - lowbit(i), i], so it is the difference
+    of two prefix sums.
+    """
+    prefix = [0]
+    prefix.extend(accumulate(values))
+    return [0] + [prefix[i] - prefix[i - (i & -i)] for i in range(1, len(prefix))]
+
+
 class FenwickTree:
-    def __init__(self, arr):
-        """Initialize a Fenwick Tree with an array."""
+    def __init__(self, arr, dtype=None):
+        """Initialize a Fenwick Tree with an array.
+
+        :param dtype: None to store Python numbers in lists, or a NumPy dtype
+            such as "int64" or "float64" to back the tree with NumPy arrays,
+            which update_many and query_many process a whole level at a time.
+        """
         self.array_size = len(arr)
-        self.tree = [0] * (self.array_size + 1)
+        self.dtype = dtype
+        if dtype is not None and np is None:
+            raise ImportError("FenwickTree(dtype=...) requires NumPy")
         self.construct_tree(arr)
 
     def construct_tree(self, arr):
-        """Construct the Fenwick Tree using the given array."""
-        for index in range(self.array_size):
-            self.update_tree(index, arr[index])
+        """Construct the Fenwick Tree using the given array, in O(n)."""
+        if self.dtype is None:
+            self.array = list(arr)  # Raw values, kept in step with the tree for O(1) point reads
+            self.tree = _build(self.array)
+            return
+        self.array = np.array(arr, dtype=self.dtype)
+        prefix = np.zeros(self.array_size + 1, dtype=self.dtype)
+        np.cumsum(self.array, out=prefix[1:])
+        positions = np.arange(1, self.array_size + 1)
+        self.tree = prefix.copy()
+        self.tree[1:] -= prefix[positions - (positions & -positions)]
 
-    def update_tree(self, index, value):
-        """Update the Fenwick Tree at a given index with a value."""
+    def _add(self, index, value):
+        """Add value to the tree nodes covering index, leaving the raw array alone."""
         index += 1
         while index <= self.array_size:
             self.tree[index] += value
             index += index & -index
 
+    def update_tree(self, index, value):
+        """Update the Fenwick Tree at a given index with a value."""
+        self.array[index] += value
+        self._add(index, value)
+
+    def update_many(self, indices, deltas):
+        """Add deltas[k] to the element at indices[k] for every k; repeated indices add up.
+
+        Raises IndexError, before changing anything, if an index is outside
+        0..len(arr) - 1.
+        """
+        if self.dtype is not None:
+            positions = np.asarray(indices, dtype=np.int64) + 1
+            if positions.size and not (positions.min() >= 1 and positions.max() <= self.array_size):
+                raise IndexError("update_many index out of range")
+            deltas = np.broadcast_to(np.asarray(deltas, dtype=self.dtype), positions.shape)
+            np.add.at(self.array, positions - 1, deltas)
+            # Move every pending update up one tree level per pass
+            while positions.size:
+                np.add.at(self.tree, positions, deltas)
+                positions = positions + (positions & -positions)
+                inside = positions <= self.array_size
+                positions, deltas = positions[inside], deltas[inside]
+            return
+        indices, deltas = list(indices), list(deltas)
+        if indices and not (min(indices) >= 0 and max(indices) < self.array_size):
+            raise IndexError("update_many index out of range")
+        if len(indices) * self.array_size.bit_length() > self.array_size:
+            # Cheaper to apply the batch to the raw array and rebuild in O(n)
+            for index, delta in zip(indices, deltas):
+                self.array[index] += delta
+            self.tree = _build(self.array)
+            return
+        for index, delta in zip(indices, deltas):
+            self.update_tree(index, delta)
+
+    def set(self, index, value):
+        """Set the element at index to value."""
+        self.update_tree(index, value - self.array[index])
+
+    def point_query(self, index):
+        """Return the element at index."""
+        return self.array[index]
+
     def query_sum(self, index):
         """Query the sum from index 0 to the given index."""
         if self.array_size == 0:
@@ -28,30 +108,640 @@ class FenwickTree:
             index -= index & -index
         return total_sum
 
+    def query_many(self, indices):
+        """Return query_sum(index) for every index, as a list or a NumPy array.
+
+        Like query_sum, a negative index sums nothing and an index past the
+        end raises IndexError.
+        """
+        if self.dtype is not None:
+            positions = np.asarray(indices, dtype=np.int64) + 1
+            if self.array_size == 0:
+                return np.zeros(positions.shape, dtype=self.dtype)
+            if positions.size and positions.max() > self.array_size:
+                raise IndexError("query_many index out of range")
+            positions = np.maximum(positions, 0)
+            totals = np.zeros(positions.shape, dtype=self.dtype)
+            # Every query walks down one tree level per pass; finished ones sit at node 0, which holds 0
+            while positions.any():
+                totals += self.tree[positions]
+                positions -= positions & -positions
+            return totals
+        tree = self.tree
+        totals = []
+        for index in indices:
+            if index >= self.array_size:
+                if self.array_size == 0:
+                    totals.append(0)
+                    continue
+                raise IndexError("query_many index out of range")
+            index += 1
+            total_sum = 0
+            while index > 0:
+                total_sum += tree[index]
+                index -= index & -index
+            totals.append(total_sum)
+        return totals
+
+    def range_sum(self, left, right):
+        """Query the sum from index left to index right, both inclusive."""
+        if left > right:
+            return 0
+        return self.query_sum(right) - (self.query_sum(left - 1) if left > 0 else 0)
+
+    def find_prefix(self, target):
+        """Return the smallest index whose prefix sum is >= target, or None if there is none.
+
+        Walks down from the largest power of two in O(log n), so the
+        elements must be non-negative for prefix sums to be sorted.
+        """
+        tree = self.tree
+        position = 0
+        remaining = target
+        step = 1 << (self.array_size.bit_length() - 1) if self.array_size else 0
+        while step:
+            following = position + step
+            if following <= self.array_size and tree[following] < remaining:
+                position = following
+                remaining -= tree[following]
+            step >>= 1
+        # position is the longest prefix still short of target; the answer is the next element
+        return position if position < self.array_size else None
+
+
+class WeightedSampler:
+    """Pick indices at random in proportion to weights that can change.
+
+    The weights live in a FenwickTree, so changing one and drawing a sample
+    are both O(log n). Float updates can leave rounding residue in the tree
+    nodes, so emptiness is judged from a count of positive weights, and the
+    tree is rebuilt from the stored weights whenever the residue shows.
+    """
+
+    def __init__(self, weights, rng=None):
+        """Initialize the sampler with non-negative weights for indices 0..len(weights) - 1."""
+        if any(weight < 0 for weight in weights):
+            raise ValueError("weights must be non-negative")
+        self.rng = rng or random.Random()
+        self._tree = FenwickTree(weights)
+        self._positive = sum(map(bool, weights))  # Weights are non-negative, so non-zero means positive
+
+    def update(self, index, weight):
+        """Set the weight of index."""
+        tree = self._tree
+        if not 0 <= index < tree.array_size:
+            raise IndexError("sampler index out of range")
+        if weight < 0:
+            raise ValueError("weights must be non-negative")
+        self._positive += (weight > 0) - (tree.array[index] > 0)
+        tree.set(index, weight)
+        if not self._positive:
+            self._rebuild()
+
+    def _rebuild(self):
+        """Rebuild the tree from the stored weights, dropping rounding residue."""
+        self._tree.construct_tree(self._tree.array)
+
+    def weight(self, index):
+        """Return the weight of index."""
+        return self._tree.point_query(index)
+
+    def total(self):
+        """Return the sum of all weights."""
+        return self._tree.query_sum(self._tree.array_size - 1)
+
+    def sample(self):
+        """Return a random index with probability weight(index) / total()."""
+        if not self._positive:
+            raise ValueError("cannot sample when every weight is zero")
+        tree = self._tree
+        while True:
+            # The target lies in (0, total], so zero-weight indices are only hit through residue
+            index = tree.find_prefix(self.total() * (1.0 - self.rng.random()))
+            if index is not None and tree.array[index] > 0:
+                return index
+            self._rebuild()
+
+    def __len__(self):
+        """Return the number of indices."""
+        return self._tree.array_size
+
+
+class FenwickMultiset:
+    """Multiset of integers in range(max_key) stored as counts in a FenwickTree.
+
+    Adding, removing, ranking and selecting the k-th smallest value are all
+    O(log max_key), whatever the number of copies.
+    """
+
+    def __init__(self, max_key, values=()):
+        """Initialize the multiset with keys 0..max_key - 1, optionally from values."""
+        self._max_key = max_key
+        counts = [0] * max_key
+        for value in values:
+            counts[self._check(value)] += 1
+        self._tree = FenwickTree(counts)
+        self._size = sum(counts)
+
+    def _check(self, value):
+        """Return value, or raise ValueError if it is outside range(max_key)."""
+        if not 0 <= value < self._max_key:
+            raise ValueError(f"value {value!r} is outside range({self._max_key})")
+        return value
+
+    def add(self, value, copies=1):
+        """Add copies of value."""
+        self._tree.update_tree(self._check(value), copies)
+        self._size += copies
+
+    def remove(self, value, copies=1):
+        """Remove up to copies of value; return the number removed."""
+        removed = min(copies, self._tree.point_query(self._check(value)))
+        if removed:
+            self._tree.update_tree(value, -removed)
+            self._size -= removed
+        return removed
+
+    def count(self, value):
+        """Return the number of copies of value."""
+        return self._tree.point_query(self._check(value))
+
+    def rank(self, value):
+        """Return the number of values less than value, for 0 <= value <= max_key."""
+        if value == self._max_key:
+            return self._size
+        return self._tree.query_sum(value - 1) if self._check(value) > 0 else 0
+
+    def kth_smallest(self, k):
+        """Return the k-th smallest value (0-based; negative k counts from the end)."""
+        if k < 0:
+            k += self._size
+        if not 0 <= k < self._size:
+            raise IndexError("kth_smallest index out of range")
+        return self._tree.find_prefix(k + 1)
+
+    def __len__(self):
+        """Return the number of values, counting copies."""
+        return self._size
+
+    def __contains__(self, value):
+        """Enable 'in' operator."""
+        return self.count(value) > 0
+
+
+class RangeFenwickTree:
+    """Fenwick tree that adds a delta to a whole index range in O(log n).
+
+    Two trees store a range update as a slope and an offset (the dual-tree
+    formulation), so the prefix sum up to position i is
+    ``sum(slopes) * i - sum(offsets)`` over the same O(log n) nodes. Both
+    range_add and range_sum are O(log n).
+    """
+
+    def __init__(self, arr):
+        """Initialize the tree with an array."""
+        self.array_size = len(arr)
+        # The slopes are the differences between neighbouring elements
+        slopes = [value - previous for previous, value in zip([0] + list(arr), arr)]
+        self.tree = _build(slopes)
+        self.offsets = _build(slope * index for index, slope in enumerate(slopes))
+
+    def _add(self, position, value):
+        """Add value to the slope from 1-based position onwards."""
+        offset = value * (position - 1)
+        while position <= self.array_size:
+            self.tree[position] += value
+            self.offsets[position] += offset
+            position += position & -position
+
+    def range_add(self, left, right, value):
+        """Add value to every element from index left to index right, both inclusive."""
+        if left > right:
+            return
+        self._add(left + 1, value)
+        self._add(right + 2, -value)
+
+    def update_tree(self, index, value):
+        """Add value to the element at index."""
+        self.range_add(index, index, value)
+
+    def set(self, index, value):
+        """Set the element at index to value."""
+        self.range_add(index, index, value - self.point_query(index))
+
+    def point_query(self, index):
+        """Return the element at index."""
+        return self.range_sum(index, index)
+
+    def query_sum(self, index):
+        """Query the sum from index 0 to the given index."""
+        position = min(index + 1, self.array_size)
+        count = position
+        slope = offset = 0
+        while position > 0:
+            slope += self.tree[position]
+            offset += self.offsets[position]
+            position -= position & -position
+        return slope * count - offset
+
+    def range_sum(self, left, right):
+        """Query the sum from index left to index right, both inclusive."""
+        if left > right:
+            return 0
+        return self.query_sum(right) - (self.query_sum(left - 1) if left > 0 else 0)
+
+
+class FenwickTree2D:
+    """Two-dimensional Fenwick tree for rectangle sums over a grid.
+
+    Node (i, j) of the 1-based tree is stored at ``i * (cols + 1) + j`` of one
+    flat buffer rather than a list of row lists. Pass an ``array`` typecode
+    such as ``"q"`` or ``"d"`` to store raw machine numbers. Point updates
+    and rectangle sums are O(log rows * log cols).
+    """
+
+    def __init__(self, grid, typecode=None):
+        """Initialize the tree from a 2-D grid (a sequence of equal-length rows) in O(rows * cols).
+
+        :param typecode: None for a Python list, or an array module typecode.
+        """
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if self.rows else 0
+        width = self.cols + 1
+        tree = [0] * ((self.rows + 1) * width)
+        for i, row in enumerate(grid, 1):
+            if len(row) != self.cols:
+                raise ValueError("all grid rows must have the same length")
+            tree[i * width + 1:(i + 1) * width] = row
+        # Push every node into its parent, first along each row and then down each column
+        for i in range(1, self.rows + 1):
+            base = i * width
+            for j in range(1, self.cols + 1):
+                parent = j + (j & -j)
+                if parent <= self.cols:
+                    tree[base + parent] += tree[base + j]
+        for i in range(1, self.rows + 1):
+            parent = i + (i & -i)
+            if parent <= self.rows:
+                source, target = i * width, parent * width
+                for j in range(1, width):
+                    tree[target + j] += tree[source + j]
+        self.tree = tree if typecode is None else array(typecode, tree)
+
+    def update_tree(self, row, col, value):
+        """Add value to the cell at (row, col)."""
+        tree, width = self.tree, self.cols + 1
+        i = row + 1
+        while i <= self.rows:
+            base = i * width
+            j = col + 1
+            while j <= self.cols:
+                tree[base + j] += value
+                j += j & -j
+            i += i & -i
+
+    def query_sum(self, row, col):
+        """Query the sum of the rectangle from (0, 0) to (row, col), inclusive."""
+        tree, width = self.tree, self.cols + 1
+        total_sum = 0
+        i = min(row + 1, self.rows)
+        while i > 0:
+            base = i * width
+            j = min(col + 1, self.cols)
+            while j > 0:
+                total_sum += tree[base + j]
+                j -= j & -j
+            i -= i & -i
+        return total_sum
+
+    def rect_sum(self, row1, col1, row2, col2):
+        """Query the sum of the rectangle from (row1, col1) to (row2, col2), inclusive."""
+        if row1 > row2 or col1 > col2:
+            return 0
+        return (self.query_sum(row2, col2) - self.query_sum(row1 - 1, col2)
+                - self.query_sum(row2, col1 - 1) + self.query_sum(row1 - 1, col1 - 1))
+
+    def point_query(self, row, col):
+        """Return the value of the cell at (row, col)."""
+        return self.rect_sum(row, col, row, col)
+
+    def set(self, row, col, value):
+        """Set the cell at (row, col) to value."""
+        self.update_tree(row, col, value - self.point_query(row, col))
+
+
+class SparseFenwickTree2D(FenwickTree2D):
+    """FenwickTree2D for very large, mostly empty grids.
+
+    Only the tree nodes that an update has touched are stored, in a dict
+    keyed by flat node index, so memory is O(updates * log rows * log cols)
+    however big the grid is.
+    """
+
+    def __init__(self, rows, cols, cells=()):
+        """Initialize an all-zero rows x cols grid, then add the (row, col, value) triples in cells."""
+        self.rows = rows
+        self.cols = cols
+        self.tree = {}
+        for row, col, value in cells:
+            self.update_tree(row, col, value)
+
+    def update_tree(self, row, col, value):
+        """Add value to the cell at (row, col)."""
+        tree, width = self.tree, self.cols + 1
+        i = row + 1
+        while i <= self.rows:
+            base = i * width
+            j = col + 1
+            while j <= self.cols:
+                tree[base + j] = tree.get(base + j, 0) + value
+                j += j & -j
+            i += i & -i
+
+    def query_sum(self, row, col):
+        """Query the sum of the rectangle from (0, 0) to (row, col), inclusive."""
+        tree, width = self.tree, self.cols + 1
+        total_sum = 0
+        i = min(row + 1, self.rows)
+        while i > 0:
+            base = i * width
+            j = min(col + 1, self.cols)
+            while j > 0:
+                total_sum += tree.get(base + j, 0)
+                j -= j & -j
+            i -= i & -i
+        return total_sum
+
+
 # Test cases
 
-test_array = [2, 1, 1, 3, 2, 3, 4, 5, 6, 7, 8, 9]
-fenwick_tree = FenwickTree(test_array)
-assert fenwick_tree.query_sum(5) == 12  # Sum from index 0 to 5
-assert fenwick_tree.query_sum(0) == 2  # Sum at index 0 should be the element itself
+def test_fenwick_tree():
+    test_array = [2, 1, 1, 3, 2, 3, 4, 5, 6, 7, 8, 9]
+    fenwick_tree = FenwickTree(test_array)
+    assert fenwick_tree.query_sum(5) == 12  # Sum from index 0 to 5
+    assert fenwick_tree.query_sum(0) == 2  # Sum at index 0 should be the element itself
+
+    # Update element at index 3 and test again
+    fenwick_tree.update_tree(3, 6)
+    assert fenwick_tree.query_sum(5) == 18  # Sum from index 0 to 5 after update
+
+    # Test with negative numbers
+    negative_array = [-1, -2, -3, -4]
+    negative_tree = FenwickTree(negative_array)
+    assert negative_tree.query_sum(2) == -6  # Sum from index 0 to 2
+
+    # Test with single-element array
+    single_element_array = [5]
+    single_element_tree = FenwickTree(single_element_array)
+    assert single_element_tree.query_sum(0) == 5  # Sum at index 0 should be the element itself
+
+    # Test with empty array
+    empty_array = []
+    empty_tree = FenwickTree(empty_array)
+    assert empty_tree.query_sum(0) == 0  # Sum at index 0 should be 0 for an empty array
+
+    # Test range sums, point reads and set
+    assert fenwick_tree.range_sum(3, 5) == 14 and fenwick_tree.range_sum(0, 0) == 2
+    assert fenwick_tree.range_sum(4, 3) == 0
+    assert fenwick_tree.point_query(3) == 9 and test_array[3] == 3
+    fenwick_tree.set(3, 1)
+    assert fenwick_tree.point_query(3) == 1 and fenwick_tree.query_sum(5) == 10
+
+    print("All tests passed!")
+
+
+def test_batch_operations():
+    import random
+
+    rng = random.Random(12)
+    values = [rng.randint(-100, 100) for _ in range(1000)]
+    backings = [None] + (["int64", "float64"] if np is not None else [])
+    for dtype in backings:
+        tree = FenwickTree(values, dtype=dtype)
+        # Test O(n) construction matches point-by-point construction
+        expected = [0] * 1001
+        for index, value in enumerate(values):
+            index += 1
+            while index <= 1000:
+                expected[index] += value
+                index += index & -index
+        assert list(tree.tree) == expected
+        reference = list(values)
+        # Test small batches (per element) and large ones (rebuild), with repeated indices
+        for batch in [5, 40, 3000]:
+            indices = [rng.randrange(1000) for _ in range(batch)]
+            deltas = [rng.randint(-9, 9) for _ in range(batch)]
+            tree.update_many(indices, deltas)
+            for index, delta in zip(indices, deltas):
+                reference[index] += delta
+            queries = [rng.randrange(-1, 1000) for _ in range(200)] + [999, -5]
+            totals = tree.query_many(queries)
+            assert list(totals) == [sum(reference[:q + 1]) if q >= 0 else 0 for q in queries]
+            assert all(tree.point_query(i) == reference[i] for i in range(0, 1000, 37))
+        # Test out-of-range indices raise like the scalar methods, without changing the tree
+        for bad in [lambda: tree.query_many([3, 1000]), lambda: tree.update_many([5, 1000], [1, 1]),
+                    lambda: tree.update_many([5, -1], [1, 1])]:
+            try:
+                bad()
+            except IndexError:
+                pass
+            else:
+                raise AssertionError("A batch accepted an out-of-range index")
+        assert list(tree.query_many([999])) == [sum(reference)] and tree.tree[0] == 0
+        tree = FenwickTree([], dtype=dtype)
+        tree.update_many([], [])
+        assert list(tree.query_many([0, 3])) == [0, 0]
+
+    print("All tests passed!")
+
+
+def test_prefix_search():
+    import bisect
+    from collections import Counter
+
+    rng = random.Random(24)
+    values = [rng.choice([0, 0, 1, 2, 5]) for _ in range(300)]
+    prefix = list(accumulate(values))
+    for dtype in [None] + (["int64"] if np is not None else []):
+        tree = FenwickTree(values, dtype=dtype)
+        # Test find_prefix against a binary search over the prefix sums
+        for target in range(-1, prefix[-1] + 2):
+            expected = bisect.bisect_left(prefix, target)
+            assert tree.find_prefix(target) == (expected if expected < len(values) else None)
+    assert FenwickTree([]).find_prefix(1) is None
+
+    # Test sampling frequencies follow the weights, including after updates
+    sampler = WeightedSampler([1, 0, 3, 0], rng=random.Random(5))
+    counts = Counter(sampler.sample() for _ in range(8000))
+    assert set(counts) == {0, 2} and 0.2 < counts[0] / 8000 < 0.3
+    sampler.update(2, 0)
+    sampler.update(3, 1.5)
+    assert sampler.total() == 2.5 and sampler.weight(3) == 1.5 and len(sampler) == 4
+    counts = Counter(sampler.sample() for _ in range(8000))
+    assert set(counts) == {0, 3} and 0.35 < counts[0] / 8000 < 0.45
+    for bad in [lambda: sampler.update(0, -1), lambda: WeightedSampler([0, 0]).sample()]:
+        try:
+            bad()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Invalid weights were accepted")
+    for bad in (-1, 4):
+        try:
+            sampler.update(bad, 1)
+        except IndexError:
+            pass
+        else:
+            raise AssertionError("An out-of-range index was accepted")
+
+    # Test float residue never makes a zero weight sampleable
+    sampler = WeightedSampler([0.1, 0.2], rng=random.Random(6))
+    sampler.update(0, 0)
+    sampler.update(1, 0)
+    assert sampler.total() == 0
+    try:
+        sampler.sample()
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Sampled from all-zero weights")
+    sampler = WeightedSampler([0.1, 0.2, 0.3], rng=random.Random(6))
+    sampler.update(1, 0)
+    sampler.update(2, 0)
+    assert all(sampler.sample() == 0 for _ in range(200))
+
+    # Test the multiset against a sorted list
+    multiset = FenwickMultiset(50, [3, 3, 7])
+    reference = [3, 3, 7]
+    for _ in range(1000):
+        value = rng.randrange(50)
+        if rng.random() < 0.6:
+            multiset.add(value)
+            reference.append(value)
+        else:
+            assert multiset.remove(value) == (1 if value in reference else 0)
+            if value in reference:
+                reference.remove(value)
+    reference.sort()
+    assert len(multiset) == len(reference)
+    assert [multiset.kth_smallest(k) for k in range(len(reference))] == reference
+    assert multiset.kth_smallest(-1) == reference[-1]
+    assert multiset.rank(25) == bisect.bisect_left(reference, 25) and multiset.rank(0) == 0
+    assert multiset.count(reference[0]) == reference.count(reference[0]) and reference[0] in multiset
+    assert multiset.remove(reference[0], copies=10**6) == reference.count(reference[0])
+    try:
+        multiset.kth_smallest(len(multiset))
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("kth_smallest accepted an out-of-range index")
+    assert multiset.rank(50) == len(multiset)
+    for bad in (-1, 50):
+        for method in (multiset.add, multiset.remove, multiset.count):
+            try:
+                method(bad)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("An out-of-range value was accepted")
+    for bad in (-1, 51):
+        try:
+            multiset.rank(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("rank accepted an out-of-range value")
+    assert len(multiset) == sum(multiset.count(value) for value in range(50))
+
+    print("All tests passed!")
+
+
+def test_fenwick_tree_2d():
+    rng = random.Random(25)
+    grid = [[rng.randint(-9, 9) for _ in range(13)] for _ in range(9)]
+    for typecode in [None, "q"]:
+        tree = FenwickTree2D(grid, typecode=typecode)
+        # Test O(rows * cols) construction matches updating every cell
+        built = FenwickTree2D([[0] * 13 for _ in range(9)])
+        for r, row in enumerate(grid):
+            for c, value in enumerate(row):
+                built.update_tree(r, c, value)
+        assert list(tree.tree) == built.tree
+        reference = [list(row) for row in grid]
+        sparse = SparseFenwickTree2D(9, 13, ((r, c, v) for r, row in enumerate(grid) for c, v in enumerate(row)))
+        for _ in range(500):
+            r1, r2 = sorted(rng.randrange(9) for _ in range(2))
+            c1, c2 = sorted(rng.randrange(13) for _ in range(2))
+            if rng.random() < 0.3:
+                value = rng.randint(-5, 5)
+                tree.set(r1, c1, value)
+                sparse.set(r1, c1, value)
+                reference[r1][c1] = value
+            else:
+                delta = rng.randint(-5, 5)
+                tree.update_tree(r2, c2, delta)
+                sparse.update_tree(r2, c2, delta)
+                reference[r2][c2] += delta
+            expected = sum(sum(row[c1:c2 + 1]) for row in reference[r1:r2 + 1])
+            assert tree.rect_sum(r1, c1, r2, c2) == sparse.rect_sum(r1, c1, r2, c2) == expected
+            assert tree.point_query(r2, c1) == reference[r2][c1]
+        assert tree.rect_sum(3, 0, 2, 5) == 0 and tree.query_sum(-1, 4) == 0
+
+    try:
+        FenwickTree2D([[1, 2], [3]])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("A ragged grid was accepted")
+
+    # Test an empty grid and a huge sparse one
+    assert FenwickTree2D([]).query_sum(0, 0) == 0
+    huge = SparseFenwickTree2D(10**9, 10**9)
+    huge.update_tree(123456789, 987654321, 5)
+    huge.update_tree(10, 20, 2)
+    assert huge.rect_sum(0, 0, 10**9 - 1, 10**9 - 1) == 7
+    assert huge.rect_sum(11, 0, 10**9 - 1, 10**9 - 1) == 5 and huge.point_query(10, 20) == 2
+    assert len(huge.tree) <= 2 * 30 * 30
+
+    print("All tests passed!")
+
+
+def test_range_fenwick_tree():
+    import random
 
-# Update element at index 3 and test again
-fenwick_tree.update_tree(3, 6)
-assert fenwick_tree.query_sum(5) == 18  # Sum from index 0 to 5 after update
+    rng = random.Random(6)
+    reference = [rng.randint(-50, 50) for _ in range(200)]
+    tree = RangeFenwickTree(reference)
+    # Test range adds, point updates and sets against a plain list
+    for _ in range(2000):
+        left, right = sorted(rng.randrange(200) for _ in range(2))
+        roll = rng.random()
+        if roll < 0.4:
+            delta = rng.randint(-20, 20)
+            tree.range_add(left, right, delta)
+            for i in range(left, right + 1):
+                reference[i] += delta
+        elif roll < 0.5:
+            tree.update_tree(left, 7)
+            reference[left] += 7
+        elif roll < 0.6:
+            tree.set(right, -3)
+            reference[right] = -3
+        else:
+            assert tree.range_sum(left, right) == sum(reference[left:right + 1])
+            assert tree.query_sum(right) == sum(reference[:right + 1])
+            assert tree.point_query(left) == reference[left]
+    assert tree.range_sum(5, 4) == 0 and tree.query_sum(199) == sum(reference)
 
-# Test with negative numbers
-negative_array = [-1, -2, -3, -4]
-negative_tree = FenwickTree(negative_array)
-assert negative_tree.query_sum(2) == -6  # Sum from index 0 to 2
+    empty_tree = RangeFenwickTree([])
+    assert empty_tree.query_sum(0) == 0
 
-# Test with single-element array
-single_element_array = [5]
-single_element_tree = FenwickTree(single_element_array)
-assert single_element_tree.query_sum(0) == 5  # Sum at index 0 should be the element itself
+    print("All tests passed!")
 
-# Test with empty array
-empty_array = []
-empty_tree = FenwickTree(empty_array)
-assert empty_tree.query_sum(0) == 0  # Sum at index 0 should be 0 for an empty array
 
-print("All tests passed!")
\ No newline at end of file
+if __name__ == "__main__":
+    test_fenwick_tree()
+    test_batch_operations()
+    test_prefix_search()
+    test_range_fenwick_tree()
+    test_fenwick_tree_2d()
@@ -1,5 +1,508 @@
-# Update the HashTable class to include a check for the load factor in the resize method
+from array import array
+from functools import partial
+from time import perf_counter
+
+# Slot states for the open-addressing table.
+_EMPTY = 0
+_FULL = 1
+_DELETED = 2
+
+# Resize once live items plus tombstones exceed this fraction of the slots.
+_MAX_LOAD = 0.7
+
+
+def _find(states, hashes, keys, key, key_hash):
+    """Probe one set of slot arrays for key; return its slot or -1 if it is absent.
+
+    The probe stops after visiting every slot once, because a table that is
+    being migrated may have no empty slot left to end the chain.
+    """
+    size = len(states)
+    index = key_hash % size
+    for _ in range(size):
+        state = states[index]
+        if state == _EMPTY:
+            return -1
+        if state == _FULL and hashes[index] == key_hash:
+            stored = keys[index]
+            if stored is key or stored == key:
+                return index
+        index += 1
+        if index == size:
+            index = 0
+    return -1
+
+
 class HashTable:
+    """Hash table using open addressing over flat parallel arrays.
+
+    Each slot is described by a cached hash (``array('q')``), a key, a value
+    and a state byte (empty, full or tombstone), so an entry costs a few
+    machine words instead of a bucket list plus a ``[key, value]`` list.
+
+    With ``incremental=True`` a resize keeps the old arrays alongside the new
+    ones and every ``set``/``get``/``delete`` migrates at most ``rehash_step``
+    old slots, so no single call pays for rehashing the whole table.
+    ``max_pause`` records the longest time, in seconds, one call spent rehashing.
+    """
+
+    def __init__(self, size=10, incremental=False, rehash_step=8):
+        """Initialize the hash table."""
+        self.incremental = incremental
+        self.rehash_step = rehash_step
+        self.max_pause = 0.0
+        self._version = 0  # Bumped on every structural change, checked by iterators
+        self._old_states = None
+        self._allocate(size)
+
+    @classmethod
+    def from_items(cls, items, expected_size=None):
+        """Build a table from a mapping or an iterable of pairs, sized once up front."""
+        if expected_size is None and hasattr(items, '__len__'):
+            expected_size = len(items)
+        table = cls(size=max(10, int((expected_size or 0) / _MAX_LOAD) + 1))
+        table.update(items)
+        return table
+
+    def _allocate(self, size):
+        """Allocate empty slot arrays for the given number of slots."""
+        self._version += 1
+        self.size = size
+        self._hashes = array('q', [0]) * size
+        self._keys = [None] * size
+        self._values = [None] * size
+        self._states = bytearray(size)
+        self._count = 0  # Live items
+        self._filled = 0  # Live items plus tombstones
+
+    def hash_func(self, key):
+        """Calculate the hash index for a key."""
+        return hash(key) % self.size
+
+    def is_rehashing(self):
+        """Check if an incremental resize is in progress."""
+        return self._old_states is not None
+
+    def set(self, key, value):
+        """Set a value for a key."""
+        if self._old_states is not None:
+            self._rehash_step()
+        key_hash = hash(key)
+        states, hashes, keys = self._states, self._hashes, self._keys
+        size = self.size
+        index = key_hash % size
+        free = -1
+        while True:
+            state = states[index]
+            if state == _EMPTY:
+                break
+            if state == _DELETED:
+                if free < 0:
+                    free = index
+            elif hashes[index] == key_hash:
+                stored = keys[index]
+                if stored is key or stored == key:
+                    self._values[index] = value
+                    return
+            index += 1
+            if index == size:
+                index = 0
+        if self._old_states is not None:
+            # Keys that have not been migrated yet are updated where they are
+            old = _find(self._old_states, self._old_hashes, self._old_keys, key, key_hash)
+            if old >= 0:
+                self._old_values[old] = value
+                return
+        if free < 0:
+            free = index
+            self._filled += 1
+        states[free] = _FULL
+        hashes[free] = key_hash
+        keys[free] = key
+        self._values[free] = value
+        self._count += 1
+        self._version += 1
+
+        # Tombstones occupy probe slots, so they count towards the resize check
+        if self._filled / self.size > _MAX_LOAD:
+            self._grow()
+
+    def get(self, key):
+        """Get the value for a key."""
+        if self._old_states is not None:
+            self._rehash_step()
+        key_hash = hash(key)
+        index = _find(self._states, self._hashes, self._keys, key, key_hash)
+        if index >= 0:
+            return self._values[index]
+        if self._old_states is not None:
+            index = _find(self._old_states, self._old_hashes, self._old_keys, key, key_hash)
+            if index >= 0:
+                return self._old_values[index]
+        return None
+
+    def delete(self, key):
+        """Delete a key-value pair."""
+        if self._old_states is not None:
+            self._rehash_step()
+        key_hash = hash(key)
+        states, keys, values = self._states, self._keys, self._values
+        index = _find(states, self._hashes, keys, key, key_hash)
+        if index < 0:
+            if self._old_states is None:
+                return
+            states, keys, values = self._old_states, self._old_keys, self._old_values
+            index = _find(states, self._old_hashes, keys, key, key_hash)
+            if index < 0:
+                return
+        # Leave a tombstone so that probe chains running through this slot stay intact
+        states[index] = _DELETED
+        keys[index] = None
+        values[index] = None
+        self._count -= 1
+        self._version += 1
+
+    def reserve(self, n):
+        """Make room for n items so that inserting them triggers no resize."""
+        needed = int(n / _MAX_LOAD) + 1
+        if needed > self.size:
+            self._finish_rehash()
+            self._rehash(needed)
+
+    def update(self, items):
+        """Set every key-value pair from a mapping or an iterable of pairs."""
+        if hasattr(items, 'items'):
+            items = items.items()
+        if hasattr(items, '__len__'):
+            self.reserve(self._count + len(items))
+        # Bulk loads favour throughput, so any pending migration is completed first
+        self._finish_rehash()
+        states, hashes, keys, values = self._states, self._hashes, self._keys, self._values
+        size = self.size
+        limit = _MAX_LOAD * size
+        count, filled = self._count, self._filled
+        for key, value in items:
+            key_hash = hash(key)
+            index = key_hash % size
+            free = -1
+            while True:
+                state = states[index]
+                if state == _EMPTY:
+                    break
+                if state == _DELETED:
+                    if free < 0:
+                        free = index
+                elif hashes[index] == key_hash:
+                    stored = keys[index]
+                    if stored is key or stored == key:
+                        break
+                index += 1
+                if index == size:
+                    index = 0
+            if states[index] == _FULL:
+                values[index] = value
+                continue
+            if free < 0:
+                free = index
+                filled += 1
+            states[free] = _FULL
+            hashes[free] = key_hash
+            keys[free] = key
+            values[free] = value
+            count += 1
+            if filled > limit:
+                self._count = self._filled = count
+                self._rehash(size * 2)
+                states, hashes, keys, values = self._states, self._hashes, self._keys, self._values
+                size = self.size
+                limit = _MAX_LOAD * size
+                count = filled = self._count
+        self._count, self._filled = count, filled
+        self._version += 1
+
+    def get_many(self, keys):
+        """Get the values for several keys at once, with None for missing keys."""
+        if self._old_states is not None:
+            self._rehash_step()
+        states, hashes, stored_keys, values = self._states, self._hashes, self._keys, self._values
+        old_states = self._old_states
+        result = []
+        append = result.append
+        for key in keys:
+            key_hash = hash(key)
+            index = _find(states, hashes, stored_keys, key, key_hash)
+            if index >= 0:
+                append(values[index])
+                continue
+            if old_states is not None:
+                # Keys that have not been migrated yet are read where they are
+                index = _find(old_states, self._old_hashes, self._old_keys, key, key_hash)
+                if index >= 0:
+                    append(self._old_values[index])
+                    continue
+            append(None)
+        return result
+
+    def delete_many(self, keys):
+        """Delete several keys at once and return how many were present."""
+        if self._old_states is not None:
+            self._rehash_step()
+        removed = 0
+        for key in keys:
+            key_hash = hash(key)
+            states, stored_keys, values = self._states, self._keys, self._values
+            index = _find(states, self._hashes, stored_keys, key, key_hash)
+            if index < 0 and self._old_states is not None:
+                states, stored_keys, values = self._old_states, self._old_keys, self._old_values
+                index = _find(states, self._old_hashes, stored_keys, key, key_hash)
+            if index >= 0:
+                states[index] = _DELETED
+                stored_keys[index] = values[index] = None
+                removed += 1
+        if removed:
+            self._count -= removed
+            self._version += 1
+        return removed
+
+    def _grow(self):
+        """Double the table, or compact it in place if it is mostly tombstones."""
+        if self._count * 2 > self._filled:
+            self.resize()
+        else:
+            self._start_rehash(self.size)
+
+    def resize(self):
+        """Resize the hash table considering the load factor."""
+        self._start_rehash(self.size * 2)
+
+    def _start_rehash(self, new_size):
+        """Rehash into new_size slots, all at once or incrementally depending on the mode."""
+        if self._old_states is not None:
+            self._finish_rehash()
+        start = perf_counter()
+        if self.incremental:
+            self._old_states, self._old_hashes = self._states, self._hashes
+            self._old_keys, self._old_values = self._keys, self._values
+            self._rehash_pos = 0
+            count = self._count
+            self._allocate(new_size)
+            self._count = count
+        else:
+            self._rehash(new_size)
+        self._record_pause(perf_counter() - start)
+
+    def _rehash(self, new_size):
+        """Move every live entry into fresh arrays of new_size slots, dropping tombstones."""
+        states, hashes, keys, values = self._states, self._hashes, self._keys, self._values
+        count = self._count
+        self._allocate(new_size)
+        new_states, new_hashes = self._states, self._hashes
+        new_keys, new_values = self._keys, self._values
+        for slot in range(len(states)):
+            if states[slot] != _FULL:
+                continue
+            # Cached hashes mean no key is hashed again
+            key_hash = hashes[slot]
+            index = key_hash % new_size
+            while new_states[index]:
+                index += 1
+                if index == new_size:
+                    index = 0
+            new_states[index] = _FULL
+            new_hashes[index] = key_hash
+            new_keys[index] = keys[slot]
+            new_values[index] = values[slot]
+        self._count = self._filled = count
+
+    def _rehash_step(self):
+        """Migrate the next rehash_step slots of the old arrays into the current ones."""
+        start = perf_counter()
+        states, hashes = self._old_states, self._old_hashes
+        keys, values = self._old_keys, self._old_values
+        new_states, new_hashes = self._states, self._hashes
+        new_keys, new_values = self._keys, self._values
+        size = self.size
+        end = min(self._rehash_pos + self.rehash_step, len(states))
+        for slot in range(self._rehash_pos, end):
+            if states[slot] != _FULL:
+                continue
+            key_hash = hashes[slot]
+            index = key_hash % size
+            # The key is in exactly one set of arrays, so any non-full slot will do
+            while new_states[index] == _FULL:
+                index += 1
+                if index == size:
+                    index = 0
+            if new_states[index] == _EMPTY:
+                self._filled += 1
+            new_states[index] = _FULL
+            new_hashes[index] = key_hash
+            new_keys[index] = keys[slot]
+            new_values[index] = values[slot]
+            # Migrated slots become tombstones so old probe chains stay intact
+            states[slot] = _DELETED
+            keys[slot] = values[slot] = None
+        if end == len(states):
+            self._old_states = self._old_hashes = self._old_keys = self._old_values = None
+        else:
+            self._rehash_pos = end
+        self._record_pause(perf_counter() - start)
+
+    def _finish_rehash(self):
+        """Complete an in-progress incremental resize."""
+        while self._old_states is not None:
+            self._rehash_step()
+
+    def _record_pause(self, seconds):
+        """Remember the longest time a single call spent rehashing."""
+        if seconds > self.max_pause:
+            self.max_pause = seconds
+
+    def _iterate(self, kind):
+        """Stream keys, values or items slot by slot without building a list.
+
+        A pending incremental resize is completed first so that lookups made
+        while iterating do not move entries around.
+        """
+        self._finish_rehash()
+        version = self._version
+        states, keys, values = self._states, self._keys, self._values
+        for index, state in enumerate(states):
+            if state != _FULL:
+                continue
+            if kind == 'keys':
+                yield keys[index]
+            elif kind == 'values':
+                yield values[index]
+            else:
+                yield keys[index], values[index]
+            if self._version != version:
+                raise RuntimeError("HashTable changed size during iteration")
+
+    def contains(self, key):
+        """Check if a key exists."""
+        if self._old_states is not None:
+            self._rehash_step()
+        key_hash = hash(key)
+        if _find(self._states, self._hashes, self._keys, key, key_hash) >= 0:
+            return True
+        return (self._old_states is not None
+                and _find(self._old_states, self._old_hashes, self._old_keys, key, key_hash) >= 0)
+
+    def keys(self):
+        """Get a live view of all keys."""
+        return KeysView(self)
+
+    def values(self):
+        """Get a live view of all values."""
+        return ValuesView(self)
+
+    def items(self):
+        """Get a live view of all key-value pairs."""
+        return ItemsView(self)
+
+    def load_factor(self):
+        """Calculate the load factor."""
+        return self._count / self.size
+
+    def clear(self):
+        """Clear the hash table."""
+        self._old_states = None
+        self._allocate(self.size)
+
+    def __len__(self):
+        """Get the number of items."""
+        return self._count
+
+    def __str__(self):
+        """String representation."""
+        return '[' + ', '.join(map(repr, self.items())) + ']'
+
+    def __iter__(self):
+        """Iterate over the keys."""
+        return self._iterate('keys')
+
+    def __contains__(self, key):
+        """Enable 'in' operator."""
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        """Enable bracket notation for getting items."""
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        """Enable bracket notation for setting items."""
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        """Enable 'del' operator."""
+        self.delete(key)
+
+
+class _HashTableView:
+    """Base class for live, non-copying views over a HashTable."""
+
+    __slots__ = ('_table',)
+    _kind = None
+
+    def __init__(self, table):
+        """Initialize the view over table."""
+        self._table = table
+
+    def __len__(self):
+        """Get the number of items in the underlying table."""
+        return len(self._table)
+
+    def __iter__(self):
+        """Stream the viewed entries from the table."""
+        return self._table._iterate(self._kind)
+
+    def __repr__(self):
+        """String representation."""
+        return f"{type(self).__name__}([{', '.join(map(repr, self))}])"
+
+
+class KeysView(_HashTableView):
+    """Live view of the keys of a HashTable."""
+
+    __slots__ = ()
+    _kind = 'keys'
+
+    def __contains__(self, key):
+        """Check if a key exists."""
+        return self._table.contains(key)
+
+
+class ValuesView(_HashTableView):
+    """Live view of the values of a HashTable."""
+
+    __slots__ = ()
+    _kind = 'values'
+
+    def __contains__(self, value):
+        """Check if a value exists; this scans the table."""
+        return any(stored is value or stored == value for stored in self)
+
+
+class ItemsView(_HashTableView):
+    """Live view of the key-value pairs of a HashTable."""
+
+    __slots__ = ()
+    _kind = 'items'
+
+    def __contains__(self, item):
+        """Check if a key-value pair exists."""
+        key, value = item
+        table = self._table
+        if not table.contains(key):
+            return False
+        stored = table.get(key)
+        return stored is value or stored == value
+
+
+class ChainedHashTable:
+    """Separate-chaining hash table; the original layout, kept as a benchmark baseline."""
+
     def __init__(self, size=10):
         """Initialize the hash table."""
         self.size = size
@@ -17,7 +520,7 @@ class HashTable:
                 kv[1] = value
                 return
         self.table[index].append([key, value])
-        
+
         # Check the load factor after each insertion
         if self.load_factor() > 0.7:
             self.resize()
@@ -98,35 +601,187 @@ class HashTable:
         self.delete(key)
 
 
-# Test cases for the HashTable class
-ht = HashTable(size=5)  # Starting with a small size for easy testing of resize
-# Test set and get
-ht.set("a", 1)
-assert ht.get("a") == 1
-# Test delete
-ht.delete("a")
-assert ht.get("a") is None
-# Test resize based on load factor
-for i in range(5):
-    ht.set(str(i), i)
-assert ht.size == 10  # Should have resized
-# Test contains
-assert "4" in ht
-# Test keys
-assert set(ht.keys()) == set(map(str, range(5)))
-# Test values
-assert set(ht.values()) == set(range(5))
-# Test items
-assert set(ht.items()) == set((str(i), i) for i in range(5))
-# Test load_factor
-assert ht.load_factor() == 0.5  # 5 items in a size-10 table
-# Test clear
-ht.clear()
-assert len(ht) == 0
-# Test __getitem__, __setitem__, __delitem__
-ht["c"] = 3
-assert ht["c"] == 3
-del ht["c"]
-assert "c" not in ht
-
-print("All test cases passed!")
\ No newline at end of file
+# Test cases
+
+def test_hash_table(table_class=HashTable):
+    ht = table_class(size=5)  # Starting with a small size for easy testing of resize
+    # Test set and get
+    ht.set("a", 1)
+    assert ht.get("a") == 1
+    # Test delete
+    ht.delete("a")
+    assert ht.get("a") is None
+    # Test resize based on load factor
+    for i in range(5):
+        ht.set(str(i), i)
+    assert ht.size == 10  # Should have resized
+    # Test contains
+    assert "4" in ht
+    # Test keys
+    assert set(ht.keys()) == set(map(str, range(5)))
+    # Test values
+    assert set(ht.values()) == set(range(5))
+    # Test items
+    assert set(ht.items()) == set((str(i), i) for i in range(5))
+    # Test load_factor
+    assert ht.load_factor() == 0.5  # 5 items in a size-10 table
+    # Test clear
+    ht.clear()
+    assert len(ht) == 0
+    # Test __getitem__, __setitem__, __delitem__
+    ht["c"] = 3
+    assert ht["c"] == 3
+    del ht["c"]
+    assert "c" not in ht
+
+    print("All test cases passed!")
+
+
+def test_open_addressing(incremental=False):
+    ht = HashTable(size=4, incremental=incremental)
+    # Test overwrite keeps a single entry
+    ht["x"] = 1
+    ht["x"] = 2
+    assert len(ht) == 1 and ht["x"] == 2
+    # Test colliding keys (equal hashes) survive deletes in the middle of a probe chain
+    for i in range(3):
+        ht[i * 4] = i
+    ht.delete(4)
+    assert ht[8] == 2 and 4 not in ht and len(ht) == 3
+    # Test tombstone slots are reused
+    ht[4] = "again"
+    assert ht[4] == "again" and len(ht) == 4
+    # Test churn through inserts and deletes keeps counts and contents right
+    ht = HashTable(size=4, incremental=incremental)
+    reference = {}
+    for i in range(2000):
+        ht[i % 97] = i
+        reference[i % 97] = i
+        if i % 3 == 0:
+            ht.delete((i * 7) % 97)
+            reference.pop((i * 7) % 97, None)
+    assert len(ht) == len(reference)
+    assert sorted(ht.items()) == sorted(reference.items())
+    assert ht.load_factor() <= 0.7
+    # Test a stored None value still counts as present
+    ht["none"] = None
+    assert "none" in ht
+
+    print("All test cases passed!")
+
+
+def test_incremental_resize():
+    ht = HashTable(size=8, incremental=True, rehash_step=2)
+    for i in range(6):
+        ht[i] = i
+    # Test a resize leaves old and new arrays side by side
+    assert ht.is_rehashing() and ht.size == 16
+    # Test lookups, updates and deletes see keys that have not been migrated yet
+    assert all(ht[i] == i for i in range(6))
+    ht[5] = "five"
+    ht.delete(4)
+    assert ht[5] == "five" and 4 not in ht and len(ht) == 5
+    # Test migration finishes after a bounded number of operations
+    for _ in range(8):
+        ht.get(0)
+    assert not ht.is_rehashing()
+    assert sorted(ht.keys()) == [0, 1, 2, 3, 5]
+    assert sorted(ht.items()) == [(0, 0), (1, 1), (2, 2), (3, 3), (5, "five")]
+    assert ht.max_pause > 0
+
+    # Test missing keys while a tiny, completely full old table is still being migrated
+    for size in (1, 2, 3):
+        ht = HashTable(size=size, incremental=True, rehash_step=1)
+        ht[0] = 0
+        ht[1] = 1
+        assert ht.get(5) is None and 5 not in ht
+        ht.delete(5)
+        assert ht[0] == 0 and ht[1] == 1 and len(ht) == 2
+
+    print("All test cases passed!")
+
+
+def test_bulk_operations():
+    pairs = [(f"k{i}", i) for i in range(1000)]
+    # Test from_items sizes the table once
+    ht = HashTable.from_items(pairs)
+    assert len(ht) == 1000 and ht.size == int(1000 / 0.7) + 1
+    assert ht.get("k999") == 999
+    # Test update accepts mappings, duplicate keys and unsized iterables
+    ht.update({"k0": "zero", "new": 1})
+    ht.update((key, -value) for key, value in [("k1", 1), ("k1", 2), ("gen", 3)])
+    assert ht["k0"] == "zero" and ht["k1"] == -2 and ht["gen"] == -3 and len(ht) == 1002
+    # Test an unsized iterable still grows the table as needed
+    grown = HashTable(size=2)
+    grown.update((i, i) for i in range(100))
+    assert len(grown) == 100 and grown.get_many(range(100)) == list(range(100))
+    # Test reserve presizes without losing entries
+    grown.reserve(10000)
+    assert grown.size == int(10000 / 0.7) + 1 and grown[42] == 42
+    # Test get_many and delete_many
+    assert ht.get_many(["k5", "missing", "new"]) == [5, None, 1]
+    assert ht.delete_many(["k5", "missing", "k6"]) == 2
+    assert "k5" not in ht and len(ht) == 1000
+    # Test bulk operations finish an incremental resize first
+    inc = HashTable(size=4, incremental=True)
+    for i in range(3):
+        inc[i] = i
+    assert inc.is_rehashing()
+    inc.update([(3, 3)])
+    assert not inc.is_rehashing() and inc.get_many(range(4)) == [0, 1, 2, 3]
+    # Test get_many and delete_many only take one migration step, reading both tables
+    inc = HashTable(size=64, incremental=True, rehash_step=1)
+    for i in range(45):
+        inc[i] = i
+    assert inc.is_rehashing()
+    assert inc.get_many([0, 44, 99]) == [0, 44, None] and inc.is_rehashing()
+    assert inc.delete_many([1, 44, 99]) == 2 and inc.is_rehashing()
+    assert inc.get_many([1, 2, 44]) == [None, 2, None] and len(inc) == 43
+    # Test deleting nothing leaves live iterators valid
+    keys = iter(ht)
+    next(keys)
+    assert ht.delete_many(["missing", "also missing"]) == 0
+    assert len(list(keys)) == len(ht) - 1
+
+    print("All test cases passed!")
+
+
+def test_views():
+    ht = HashTable.from_items({"a": 1, "b": 2})
+    keys, values, items = ht.keys(), ht.values(), ht.items()
+    # Test views are live
+    ht["c"] = 3
+    assert len(keys) == len(values) == len(items) == 3
+    assert sorted(keys) == ["a", "b", "c"] and sorted(ht) == ["a", "b", "c"]
+    assert sorted(values) == [1, 2, 3]
+    # Test membership on each view
+    assert "c" in keys and "z" not in keys
+    assert 2 in values and 9 not in values
+    assert ("a", 1) in items and ("a", 2) not in items and ("z", 1) not in items
+    assert str(ht) == str(list(ht.items()))
+    # Test updating values during iteration is allowed
+    for key in ht:
+        ht[key] = 0
+    assert set(values) == {0}
+    # Test inserting or deleting during iteration raises like dict
+    for mutate in (lambda: ht.set("new", 1), lambda: ht.delete("a")):
+        try:
+            for _ in ht.items():
+                mutate()
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("Mutation during iteration was not detected")
+
+    print("All test cases passed!")
+
+
+if __name__ == "__main__":
+    test_hash_table()
+    test_hash_table(ChainedHashTable)
+    test_hash_table(partial(HashTable, incremental=True))
+    test_open_addressing()
+    test_open_addressing(incremental=True)
+    test_incremental_resize()
+    test_bulk_operations()
+    test_views()
@@ -0,0 +1,229 @@
+import sys
+import time
+from functools import wraps
+
+from DoublyLinkedList import DoublyLinkedList
+from HashTable import HashTable
+
+# Marks a missing entry, since None is a valid cached value.
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with optional per-entry TTL.
+
+    A HashTable maps each key to its DoublyLinkedList node, so a hit moves the
+    node to the front in O(1) and an eviction pops the tail in O(1). Node data
+    is a ``(key, value, expires_at, nbytes)`` tuple.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, ttl=None,
+                 sizeof=sys.getsizeof, clock=time.monotonic):
+        """Initialize the cache.
+
+        :param max_entries: Maximum number of entries, or None for no limit.
+        :param max_bytes: Maximum total of sizeof(value), or None for no limit.
+        :param ttl: Default time-to-live in seconds, or None for no expiry.
+        :param sizeof: Function giving the size in bytes of a value.
+        :param clock: Monotonic time source, in seconds.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.clock = clock
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._table = HashTable()
+        self._order = DoublyLinkedList()
+
+    def get(self, key, default=None):
+        """Get the value for a key and mark it as most recently used."""
+        node = self._table.get(key)
+        if node is None or self._expired(node):
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._order.move_to_front(node)
+        return node.data[1]
+
+    def set(self, key, value, ttl=None):
+        """Set a value for a key, evicting least recently used entries if needed.
+
+        :param ttl: Time-to-live in seconds for this entry; defaults to the cache's ttl.
+        """
+        if ttl is None:
+            ttl = self.ttl
+        expires_at = None if ttl is None else self.clock() + ttl
+        nbytes = self.sizeof(value) if self.max_bytes is not None else 0
+        data = (key, value, expires_at, nbytes)
+        node = self._table.get(key)
+        if node is None:
+            node = self._order.insert_beginning(data)
+            self._table.set(key, node)
+        else:
+            self.nbytes -= node.data[3]
+            node.data = data
+            self._order.move_to_front(node)
+        self.nbytes += nbytes
+        self._evict()
+
+    def delete(self, key):
+        """Delete a key-value pair."""
+        node = self._table.get(key)
+        if node is not None:
+            self._unlink(node)
+
+    def contains(self, key):
+        """Check if an unexpired key exists, without changing its recency."""
+        node = self._table.get(key)
+        return node is not None and not self._expired(node)
+
+    def purge_expired(self):
+        """Remove every expired entry and return how many were removed."""
+        now = self.clock()
+        expired = [node for node in self._nodes()
+                   if node.data[2] is not None and node.data[2] <= now]
+        for node in expired:
+            self._unlink(node)
+        return len(expired)
+
+    def clear(self):
+        """Remove every entry; the hit/miss/eviction counters are kept."""
+        self._table.clear()
+        self._order = DoublyLinkedList()
+        self.nbytes = 0
+
+    def _nodes(self):
+        """Yield every node from most to least recently used."""
+        node = self._order.head
+        while node:
+            yield node
+            node = node.next
+
+    def _expired(self, node):
+        """Remove node and return True if its entry has expired."""
+        expires_at = node.data[2]
+        if expires_at is None or expires_at > self.clock():
+            return False
+        self._unlink(node)
+        return True
+
+    def _unlink(self, node):
+        """Remove node from both the list and the table."""
+        self._order.remove_node(node)
+        self._table.delete(node.data[0])
+        self.nbytes -= node.data[3]
+
+    def _evict(self):
+        """Pop least recently used entries until the cache is within its limits."""
+        while ((self.max_entries is not None and len(self._table) > self.max_entries)
+               or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            self._unlink(self._order.tail)
+            self.evictions += 1
+
+    def __len__(self):
+        """Get the number of entries, including expired ones not yet removed."""
+        return len(self._table)
+
+    def __contains__(self, key):
+        """Enable 'in' operator."""
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        """Enable bracket notation for getting items."""
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        """Enable bracket notation for setting items."""
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        """Enable 'del' operator."""
+        self.delete(key)
+
+
+def memoize(cache=None):
+    """Decorator caching a pure function's results in an LRUCache.
+
+    :param cache: The LRUCache to use; defaults to one holding 128 entries.
+    The cache is exposed on the wrapper as ``wrapper.cache``.
+    """
+    if cache is None:
+        cache = LRUCache(max_entries=128)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, frozenset(kwargs.items())) if kwargs else args
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                cache.set(key, result)
+            return result
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+# Test cases
+
+def test_lru_cache():
+    # Test least recently used entries are evicted first
+    cache = LRUCache(max_entries=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # "b" is now least recently used
+    cache["c"] = 3
+    assert "b" not in cache and cache["a"] == 1 and cache["c"] == 3
+    assert len(cache) == 2 and cache.evictions == 1
+    assert cache.hits == 3 and cache.misses == 0
+    assert cache.get("b") is None and cache.misses == 1
+
+    # Test updating an entry refreshes it and delete removes it
+    cache["a"] = 10
+    cache["d"] = 4
+    assert "c" not in cache and cache["a"] == 10
+    del cache["a"]
+    assert "a" not in cache and len(cache) == 1
+
+    # Test the byte limit
+    sized = LRUCache(max_bytes=10, sizeof=len)
+    sized["x"] = "12345"
+    sized["y"] = "1234"
+    sized["z"] = "123"
+    assert "x" not in sized and sized.nbytes == 7
+    sized["y"] = "1"
+    assert sized.nbytes == 4
+
+    # Test default and per-entry TTL with a fake clock
+    now = [0.0]
+    timed = LRUCache(ttl=10, clock=lambda: now[0])
+    timed["short"] = 1
+    timed.set("long", 2, ttl=100)
+    timed.set("other", 3, ttl=100)
+    now[0] = 50
+    assert timed.get("short") is None and "short" not in timed
+    assert timed["long"] == 2
+    now[0] = 200
+    assert timed.purge_expired() == 2 and len(timed) == 0
+
+    # Test memoize calls the function once per distinct argument
+    calls = []
+
+    @memoize(cache=LRUCache(max_entries=10))
+    def square(x, offset=0):
+        calls.append(x)
+        return None if x < 0 else x * x + offset
+
+    assert square(3) == 9 and square(3) == 9 and square(3, offset=1) == 10
+    assert square(-1) is None and square(-1) is None
+    assert calls == [3, 3, -1] and square.cache.hits == 2
+
+    print("All test cases passed!")
+
+
+if __name__ == "__main__":
+    test_lru_cache()
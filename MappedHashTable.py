@@ -0,0 +1,252 @@
+import mmap
+import os
+import struct
+from hashlib import blake2b
+
+# File layout: header, then an open-addressing index of fixed-size slots,
+# then a heap of entries. A slot holds (key hash, entry offset); offset 0
+# marks an empty slot. An entry is (key tag, value tag, key length,
+# value length) followed by the key and value payloads.
+_MAGIC = b'MHT1'
+_HEADER = struct.Struct('<4sxxxxQQ')  # magic, slot count, item count
+_SLOT = struct.Struct('<QQ')
+_ENTRY = struct.Struct('<BBII')
+
+# Type tags for the supported key and value types.
+_BYTES = 0
+_STR = 1
+_INT = 2
+
+
+def _encode(obj):
+    """Return (tag, payload) for a bytes, str or int object."""
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return _BYTES, bytes(obj)
+    if isinstance(obj, str):
+        return _STR, obj.encode('utf-8')
+    if isinstance(obj, int):
+        return _INT, obj.to_bytes((obj.bit_length() + 8) // 8, 'little', signed=True)
+    raise TypeError(f"MappedHashTable only stores bytes, str and int, not {type(obj).__name__}")
+
+
+def _decode(tag, payload):
+    """Turn a tag and payload back into a bytes, str or int object."""
+    if tag == _BYTES:
+        return bytes(payload)
+    if tag == _STR:
+        return str(payload, 'utf-8')
+    return int.from_bytes(payload, 'little', signed=True)
+
+
+def _stable_hash(tag, payload):
+    """Hash a key the same way in every process, unlike the salted built-in hash()."""
+    digest = blake2b(payload, digest_size=8, person=bytes([tag])).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class MappedHashTable:
+    """Read-only, file-backed hash table opened with mmap.
+
+    Write the file once with ``MappedHashTable.build(path, items)``, then open
+    it from any number of processes. The operating system shares the mapped
+    pages between processes and loads them lazily, and a lookup only reads
+    the index slots it probes and the one matching entry.
+    Keys and values may be ``bytes``, ``str`` or ``int``.
+    """
+
+    def __init__(self, path):
+        """Open the table stored at path."""
+        with open(path, 'rb') as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        magic, self._slots, self._count = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a MappedHashTable file")
+
+    @staticmethod
+    def build(path, items, load_factor=0.5):
+        """Write a table file from a mapping or an iterable of pairs.
+
+        Later pairs overwrite earlier ones with the same key. load_factor is
+        the largest fraction of index slots to fill, in (0, 1].
+        """
+        if not 0 < load_factor <= 1:
+            raise ValueError(f"load_factor must be in (0, 1], not {load_factor!r}")
+        if hasattr(items, 'items'):
+            items = items.items()
+        entries = {}
+        for key, value in items:
+            entries[_encode(key)] = _encode(value)
+        slots = max(1, int(len(entries) / load_factor) + 1)
+        index = [None] * slots
+        heap = bytearray()
+        heap_start = _HEADER.size + slots * _SLOT.size
+        for (key_tag, key), (value_tag, value) in entries.items():
+            key_hash = _stable_hash(key_tag, key)
+            slot = key_hash % slots
+            while index[slot] is not None:
+                slot = (slot + 1) % slots
+            index[slot] = (key_hash, heap_start + len(heap))
+            heap += _ENTRY.pack(key_tag, value_tag, len(key), len(value))
+            heap += key
+            heap += value
+        buffer = bytearray(heap_start)
+        _HEADER.pack_into(buffer, 0, _MAGIC, slots, len(entries))
+        for slot, entry in enumerate(index):
+            if entry is not None:
+                _SLOT.pack_into(buffer, _HEADER.size + slot * _SLOT.size, *entry)
+        # Write to a temporary file and rename it so readers never see a partial table
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(buffer)
+            file.write(heap)
+        os.replace(temp_path, path)
+
+    def _find(self, key):
+        """Return the heap offset of the entry for key, or -1 if it is absent."""
+        try:
+            key_tag, key = _encode(key)
+        except TypeError:
+            return -1
+        key_hash = _stable_hash(key_tag, key)
+        mm, view, slots = self._mm, self._view, self._slots
+        slot = key_hash % slots
+        while True:
+            stored_hash, offset = _SLOT.unpack_from(mm, _HEADER.size + slot * _SLOT.size)
+            if offset == 0:
+                return -1
+            if stored_hash == key_hash:
+                stored_tag, _, key_length, _ = _ENTRY.unpack_from(mm, offset)
+                start = offset + _ENTRY.size
+                if stored_tag == key_tag and view[start:start + key_length] == key:
+                    return offset
+            slot += 1
+            if slot == slots:
+                slot = 0
+
+    def _entry(self, offset):
+        """Decode the (key, value) pair of the entry at offset."""
+        key_tag, value_tag, key_length, value_length = _ENTRY.unpack_from(self._mm, offset)
+        start = offset + _ENTRY.size
+        middle = start + key_length
+        return (_decode(key_tag, self._view[start:middle]),
+                _decode(value_tag, self._view[middle:middle + value_length]))
+
+    def get(self, key):
+        """Get the value for a key."""
+        offset = self._find(key)
+        if offset < 0:
+            return None
+        _, value_tag, key_length, value_length = _ENTRY.unpack_from(self._mm, offset)
+        start = offset + _ENTRY.size + key_length
+        return _decode(value_tag, self._view[start:start + value_length])
+
+    def contains(self, key):
+        """Check if a key exists."""
+        return self._find(key) >= 0
+
+    def _offsets(self):
+        """Yield the heap offset of every entry, in index order."""
+        mm = self._mm
+        for slot in range(self._slots):
+            _, offset = _SLOT.unpack_from(mm, _HEADER.size + slot * _SLOT.size)
+            if offset:
+                yield offset
+
+    def keys(self):
+        """Iterate over all keys."""
+        return (self._entry(offset)[0] for offset in self._offsets())
+
+    def values(self):
+        """Iterate over all values."""
+        return (self._entry(offset)[1] for offset in self._offsets())
+
+    def items(self):
+        """Iterate over all key-value pairs."""
+        return (self._entry(offset) for offset in self._offsets())
+
+    def close(self):
+        """Unmap the file."""
+        self._view.release()
+        self._mm.close()
+
+    def __enter__(self):
+        """Enable use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the table when leaving the with block."""
+        self.close()
+
+    def __len__(self):
+        """Get the number of items."""
+        return self._count
+
+    def __iter__(self):
+        """Iterate over the keys."""
+        return self.keys()
+
+    def __contains__(self, key):
+        """Enable 'in' operator."""
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        """Enable bracket notation for getting items."""
+        return self.get(key)
+
+
+# Test cases
+
+def test_mapped_hash_table():
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "table.mht")
+        pairs = [(f"key{i}", i * i) for i in range(1000)]
+        pairs += [(b"raw", b"\x00\xff"), (7, "seven"), (-2**70, "big"), ("7", 8), ("key1", "last")]
+        MappedHashTable.build(path, pairs)
+
+        with MappedHashTable(path) as table:
+            # Test lookups of every supported key and value type
+            assert len(table) == 1004
+            assert table.get("key999") == 999 * 999
+            assert table[b"raw"] == b"\x00\xff"
+            assert table[7] == "seven" and table["7"] == 8 and table[-2**70] == "big"
+            # Test later pairs overwrite earlier ones
+            assert table["key1"] == "last"
+            # Test missing and unsupported keys
+            assert table.get("missing") is None and "missing" not in table
+            assert 1.5 not in table
+            # Test iteration
+            assert sorted(table.values(), key=str) == sorted(dict(pairs).values(), key=str)
+            assert set(table) == set(dict(pairs))
+
+        # Test the file is rejected if it is not a table
+        bad_path = os.path.join(directory, "bad.mht")
+        with open(bad_path, "wb") as file:
+            file.write(bytes(64))
+        try:
+            MappedHashTable(bad_path)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Opening a non-table file did not fail")
+
+        # Test a full index still works and impossible load factors are rejected
+        MappedHashTable.build(path, pairs, load_factor=1)
+        with MappedHashTable(path) as table:
+            assert len(table) == 1004 and table["key999"] == 999 * 999 and "missing" not in table
+        for load_factor in (0, -0.5, 1.5):
+            try:
+                MappedHashTable.build(path, pairs, load_factor=load_factor)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"load_factor={load_factor} was accepted")
+
+    print("All test cases passed!")
+
+
+if __name__ == "__main__":
+    test_mapped_hash_table()
@@ -1,17 +1,68 @@
+from heapq import heappop, heappush
+from itertools import count
+from operator import itemgetter
+
+
 class PriorityQueue:
-    """Implements a priority queue using a binary heap."""
-    
-    def __init__(self):
+    """Implements an indexed priority queue using a binary heap.
+
+    A position index maps every value to its slot in the heap, so membership
+    is O(1) and changing or removing an arbitrary value is O(log n). Values
+    must therefore be hashable and unique: pushing a value that is already
+    queued updates its priority instead.
+
+    Pass ``engine`` to get the same API on a different heap:
+
+    - ``"binary"``: this class, the default.
+    - ``"dary"``: :class:`DaryHeapQueue`, an array heap with ``arity``
+      children per node (4 by default). It is shallower, so pops touch fewer
+      levels on large queues.
+    - ``"pairing"``: :class:`PairingHeapQueue`, with O(1) push and meld and
+      amortized O(log n) pop.
+    - ``"radix"``: :class:`RadixHeapQueue`, for non-negative integer
+      priorities that never drop below the last popped one, as in Dijkstra.
+
+    Pass ``capacity`` to get a :class:`BoundedPriorityQueue` that keeps only
+    the ``capacity`` smallest or largest priorities seen (``keep``).
+    """
+
+    def __new__(cls, engine="binary", arity=None, capacity=None, keep="smallest"):
+        """Create a queue of the class that implements engine."""
+        if capacity is not None and not issubclass(cls, BoundedPriorityQueue):
+            if cls is not PriorityQueue or engine != "binary":
+                raise ValueError("A bounded queue only supports the binary engine")
+            cls = BoundedPriorityQueue
+        elif cls is PriorityQueue and engine != "binary":
+            if engine not in _ENGINES:
+                raise ValueError(f"Unknown heap engine {engine!r}, expected one of {sorted(_ENGINES)}")
+            cls = _ENGINES[engine]
+        return super().__new__(cls)
+
+    def __init__(self, engine="binary", arity=None, capacity=None, keep="smallest"):
         """Initialize an empty priority queue."""
         self.queue = []
+        self.index = {}  # Value -> position of its (priority, value) pair in self.queue
+
+    @classmethod
+    def from_items(cls, pairs, **options):
+        """Build a queue from (val, priority) pairs with an O(n) bottom-up heapify.
+
+        Later pairs overwrite the priority of earlier ones with the same value.
+        Keyword options (engine, arity, capacity, keep) are passed to the constructor.
+        """
+        pq = cls(**options)
+        pq.push_many(pairs)
+        return pq
 
     def __str__(self):
         """Return a string representation of the priority queue."""
-        return str([f"{val} (Priority: {priority})" for priority, val in sorted(self.queue)])
+        return str([f"{val} (Priority: {priority})"
+                    for priority, val in self._smallest_entries(len(self.index))])
 
     def clear(self):
         """Clear all elements from the priority queue."""
         self.queue = []
+        self.index = {}
 
     def contain(self, val):
         """Check if a value exists in the priority queue.
@@ -19,39 +70,146 @@ class PriorityQueue:
         :param val: The value to be checked.
         :return: True if the value exists, False otherwise.
         """
-        for i in range(len(self.queue)):
-            if val == self.queue[i][1]:
-                return True
-        return False
+        return val in self.index
 
     def is_empty(self):
         """Check if the priority queue is empty.
         
         :return: True if empty, False otherwise.
         """
-        return not self.queue
+        return not self.index
 
     def push(self, val, priority):
-        """Add an element to the queue with a given priority."""
+        """Add an element to the queue with a given priority, or update it if already queued."""
+        if val in self.index:
+            self.update_priority(val, priority)
+            return
+        self.index[val] = len(self.queue)
         self.queue.append((priority, val))
         self._heapify_up(len(self.queue) - 1)
 
+    def push_many(self, pairs):
+        """Add (val, priority) pairs, updating values that are already queued.
+
+        When the batch is large compared to the queue, the new entries are
+        appended and the whole heap is rebuilt in O(n) instead of sifting
+        each one up.
+        """
+        if not self.queue:
+            # Deduplicate with a dict (later pairs win), then heapify once
+            latest = dict(pairs)
+            self.queue = [(priority, val) for val, priority in latest.items()]
+            self.index = {val: i for i, val in enumerate(latest)}
+            self._heapify()
+            return
+        queue, positions = self.queue, self.index
+        start = len(queue)
+        updates = []
+        for val, priority in pairs:
+            i = positions.get(val)
+            if i is None:
+                positions[val] = len(queue)
+                queue.append((priority, val))
+            elif i >= start:
+                queue[i] = (priority, val)
+            else:
+                # Apply once the new entries are in place, so nothing moves mid-batch
+                updates.append((val, priority))
+        if len(queue) - start > start:
+            self._heapify()
+        else:
+            for i in range(start, len(queue)):
+                self._heapify_up(i)
+        for val, priority in updates:
+            self.update_priority(val, priority)
+
     def pop(self):
         """Remove and return the element with the highest priority (lowest priority number)."""
         if not self.queue:
             return None
         val = self.queue[0][1]
-        self.queue[0] = self.queue[-1]
-        self.queue.pop()
-        self._heapify_down(0)
+        self._remove_at(0)
         return val
+
+    def pop_many(self, k):
+        """Remove and return up to k elements in priority order."""
+        return [self.pop() for _ in range(min(k, len(self.index)))]
+
+    def meld(self, other):
+        """Move every element of other into this queue, leaving other empty.
+
+        A value queued in both takes its priority from other. other is only
+        cleared once its elements are in this queue, so a push that raises
+        loses nothing.
+        """
+        if other is self:
+            return
+        pairs = [(val, priority) for priority, val in other._entries()]
+        self.push_many(pairs)
+        other.clear()
+
+    def _entries(self):
+        """Return the queued (priority, val) entries in no particular order."""
+        return self.queue
+
+    def nsmallest(self, k):
+        """Return up to k elements in priority order without removing them.
+
+        Walks the heap with a frontier of candidate slots, so it costs
+        O(k log k) regardless of the queue size.
+        """
+        return [val for _, val in self._smallest_entries(k)]
+
+    def _smallest_entries(self, k):
+        """Return the k highest-priority (priority, val) entries in order."""
+        queue = self.queue
+        entries = []
+        frontier = [(queue[0][0], 0)] if queue and k > 0 else []
+        while frontier and len(entries) < k:
+            _, i = heappop(frontier)
+            entries.append(queue[i])
+            for child in self._children(i):
+                if child < len(queue):
+                    heappush(frontier, (queue[child][0], child))
+        return entries
+
+    def _children(self, i):
+        """Return the heap positions of the children of slot i (possibly past the end)."""
+        return (2 * i + 1, 2 * i + 2)
+
+    def peek(self):
+        """Return the element with the highest priority without removing it, or None if empty."""
+        if not self.queue:
+            return None
+        return self.queue[0][1]
+
+    def remove(self, val):
+        """Remove an element from the queue in O(log n).
+
+        :return: True if removed, False if the value was not queued.
+        """
+        i = self.index.get(val)
+        if i is None:
+            return False
+        self._remove_at(i)
+        return True
+
+    def _remove_at(self, i):
+        """Remove the entry at heap position i, refilling the slot with the last entry."""
+        del self.index[self.queue[i][1]]
+        last = self.queue.pop()
+        if i < len(self.queue):
+            self.queue[i] = last
+            self.index[last[1]] = i
+            self._heapify_up(i)
+            self._heapify_down(i)
     
     def size(self):
         """Return the number of elements in the priority queue.
         
         :return: Integer representing the size of the queue.
         """
-        return len(self.queue)
+        return len(self.index)
     
     def update_priority(self, val, new_priority):
         """Update the priority of an existing element in the priority queue.
@@ -60,52 +218,791 @@ class PriorityQueue:
         :param new_priority: The new priority value.
         :return: True if updated, False otherwise.
         """
-        for i, (priority, value) in enumerate(self.queue):
-            if value == val:
-                self.queue[i] = (new_priority , val)
-                self._heapify_up(i)
-                self._heapify_down(i)
-                return True
-        return False
-                
+        i = self.index.get(val)
+        if i is None:
+            return False
+        self.queue[i] = (new_priority, val)
+        self._heapify_up(i)
+        self._heapify_down(i)
+        return True
+
+    def _heapify(self):
+        """Restore the heap property over the whole queue in O(n)."""
+        for i in reversed(range(len(self.queue) // 2)):
+            self._heapify_down(i)
+
+    def _heapify_up(self, index):
+        """Heapify upwards starting from a given index.
+
+        Parents are moved down into the hole instead of swapped, and the
+        entry is written once at its final slot.
+        """
+        queue, positions = self.queue, self.index
+        item = queue[index]
+        priority = item[0]
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_item = queue[parent]
+            if not priority < parent_item[0]:
+                break
+            queue[index] = parent_item
+            positions[parent_item[1]] = index
+            index = parent
+        queue[index] = item
+        positions[item[1]] = index
+
+    def _heapify_down(self, index):
+        """Heapify downwards starting from a given index, moving children up into the hole."""
+        queue, positions = self.queue, self.index
+        size = len(queue)
+        item = queue[index]
+        priority = item[0]
+        child = 2 * index + 1
+        while child < size:
+            right = child + 1
+            if right < size and queue[right][0] < queue[child][0]:
+                child = right
+            child_item = queue[child]
+            if not child_item[0] < priority:
+                break
+            queue[index] = child_item
+            positions[child_item[1]] = index
+            index = child
+            child = 2 * index + 1
+        queue[index] = item
+        positions[item[1]] = index
+
+class DaryHeapQueue(PriorityQueue):
+    """Indexed priority queue on an array heap with ``arity`` children per node.
+
+    A 4-ary heap is half as deep as a binary one, so a pop compares more
+    children per level but visits fewer levels and nearby slots.
+    """
+
+    def __init__(self, engine="dary", arity=None, capacity=None, keep="smallest"):
+        """Initialize an empty queue whose nodes have arity children (default 4)."""
+        super().__init__()
+        self.arity = 4 if arity is None else arity
+        if self.arity < 2:
+            raise ValueError("arity must be at least 2")
+
+    def _children(self, i):
+        """Return the heap positions of the children of slot i (possibly past the end)."""
+        first = self.arity * i + 1
+        return range(first, first + self.arity)
+
+    def _heapify(self):
+        """Restore the heap property over the whole queue in O(n)."""
+        for i in reversed(range((len(self.queue) + self.arity - 2) // self.arity)):
+            self._heapify_down(i)
+
+    def _heapify_up(self, index):
+        """Heapify upwards starting from a given index, moving parents down into the hole."""
+        queue, positions, arity = self.queue, self.index, self.arity
+        item = queue[index]
+        priority = item[0]
+        while index > 0:
+            parent = (index - 1) // arity
+            parent_item = queue[parent]
+            if not priority < parent_item[0]:
+                break
+            queue[index] = parent_item
+            positions[parent_item[1]] = index
+            index = parent
+        queue[index] = item
+        positions[item[1]] = index
+
+    def _heapify_down(self, index):
+        """Heapify downwards starting from a given index, moving children up into the hole."""
+        queue, positions, arity = self.queue, self.index, self.arity
+        size = len(queue)
+        item = queue[index]
+        priority = item[0]
+        first = arity * index + 1
+        while first < size:
+            child = first
+            best = queue[first][0]
+            for i in range(first + 1, min(first + arity, size)):
+                if queue[i][0] < best:
+                    child = i
+                    best = queue[i][0]
+            if not best < priority:
+                break
+            child_item = queue[child]
+            queue[index] = child_item
+            positions[child_item[1]] = index
+            index = child
+            first = arity * index + 1
+        queue[index] = item
+        positions[item[1]] = index
+
+
+class _PairingNode:
+    """Pairing heap node. prev is the parent for a first child, else the left sibling."""
+
+    __slots__ = ('priority', 'val', 'child', 'sibling', 'prev')
+
+    def __init__(self, priority, val):
+        self.priority = priority
+        self.val = val
+        self.child = None
+        self.sibling = None
+        self.prev = None
+
+
+def _link(a, b):
+    """Make the root with the larger priority the first child of the other; return the root."""
+    if b.priority < a.priority:
+        a, b = b, a
+    b.prev = a
+    b.sibling = a.child
+    if a.child:
+        a.child.prev = b
+    a.child = b
+    return a
+
+
+def _merge_pairs(first):
+    """Combine a list of sibling subtrees into one tree with the two-pass pairing rule."""
+    pairs = []
+    node = first
+    while node:
+        a, b = node, node.sibling
+        a.prev = a.sibling = None
+        if b is None:
+            pairs.append(a)
+            break
+        node = b.sibling
+        b.prev = b.sibling = None
+        pairs.append(_link(a, b))
+    root = pairs.pop() if pairs else None
+    while pairs:
+        root = _link(pairs.pop(), root)
+    return root
+
+
+class PairingHeapQueue(PriorityQueue):
+    """Indexed priority queue on a pairing heap.
+
+    Push, decrease-key and meld link two trees in O(1); pop and remove
+    restructure the removed node's children in amortized O(log n). The index
+    maps each value to its node.
+    """
+
+    def __init__(self, engine="pairing", arity=None, capacity=None, keep="smallest"):
+        """Initialize an empty queue."""
+        self.root = None
+        self.index = {}  # Value -> _PairingNode
+
+    def clear(self):
+        """Clear all elements from the priority queue."""
+        self.root = None
+        self.index = {}
+
+    def push(self, val, priority):
+        """Add an element to the queue with a given priority, or update it if already queued."""
+        if val in self.index:
+            self.update_priority(val, priority)
+            return
+        node = self.index[val] = _PairingNode(priority, val)
+        self.root = _link(self.root, node) if self.root else node
+
+    def push_many(self, pairs):
+        """Add (val, priority) pairs, updating values that are already queued."""
+        for val, priority in pairs:
+            self.push(val, priority)
+
+    def pop(self):
+        """Remove and return the element with the highest priority (lowest priority number)."""
+        root = self.root
+        if root is None:
+            return None
+        del self.index[root.val]
+        self.root = _merge_pairs(root.child)
+        return root.val
+
+    def peek(self):
+        """Return the element with the highest priority without removing it, or None if empty."""
+        return self.root.val if self.root else None
+
+    def remove(self, val):
+        """Remove an element from the queue in amortized O(log n).
+
+        :return: True if removed, False if the value was not queued.
+        """
+        node = self.index.pop(val, None)
+        if node is None:
+            return False
+        self._detach(node)
+        return True
+
+    def update_priority(self, val, new_priority):
+        """Update the priority of an existing element; a decrease is O(1).
+
+        :return: True if updated, False otherwise.
+        """
+        node = self.index.get(val)
+        if node is None:
+            return False
+        if new_priority < node.priority:
+            node.priority = new_priority
+            if node is not self.root:
+                self._cut(node)
+                self.root = _link(self.root, node)
+        elif node.priority < new_priority:
+            self._detach(node)
+            node.priority = new_priority
+            self.root = _link(self.root, node) if self.root else node
+        else:
+            node.priority = new_priority
+        return True
+
+    def meld(self, other):
+        """Move every element of other into this queue, leaving other empty.
+
+        Two pairing heaps are linked in O(1) plus an index merge; a value
+        queued in both takes its priority from other.
+        """
+        if not isinstance(other, PairingHeapQueue):
+            super().meld(other)
+            return
+        for val in other.index.keys() & self.index.keys():
+            self.remove(val)
+        self.index.update(other.index)
+        if other.root:
+            self.root = _link(self.root, other.root) if self.root else other.root
+        other.clear()
+
+    def _cut(self, node):
+        """Unlink a non-root node, with its subtree, from its parent and siblings."""
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling:
+            node.sibling.prev = node.prev
+        node.prev = node.sibling = None
+
+    def _detach(self, node):
+        """Take node out of the heap, linking its children back in."""
+        children = _merge_pairs(node.child)
+        node.child = None
+        if node is self.root:
+            self.root = children
+            return
+        self._cut(node)
+        if children:
+            self.root = _link(self.root, children)
+
+    def _entries(self):
+        """Return the queued (priority, val) entries in no particular order."""
+        return [(node.priority, val) for val, node in self.index.items()]
+
+    def _smallest_entries(self, k):
+        """Return the k highest-priority (priority, val) entries in order."""
+        entries = []
+        tiebreak = count()
+        frontier = [(self.root.priority, 0, self.root)] if self.root and k > 0 else []
+        while frontier and len(entries) < k:
+            _, _, node = heappop(frontier)
+            entries.append((node.priority, node.val))
+            child = node.child
+            while child:
+                heappush(frontier, (child.priority, next(tiebreak), child))
+                child = child.sibling
+        return entries
+
+
+class RadixHeapQueue(PriorityQueue):
+    """Indexed monotone priority queue on a radix heap.
+
+    Priorities must be non-negative integers no smaller than the last popped
+    priority, which holds for Dijkstra with non-negative integer weights.
+    Bucket i holds the values whose priority first differs from the last
+    popped one at bit i - 1, so push, update and remove are O(1) dict
+    operations and each value is redistributed at most once per bit.
+    """
+
+    def __init__(self, engine="radix", arity=None, capacity=None, keep="smallest"):
+        """Initialize an empty queue."""
+        self.last = 0
+        self.buckets = [{}]  # Bucket -> {value: priority}
+        self.index = {}  # Value -> priority
+
+    def clear(self):
+        """Clear all elements from the priority queue."""
+        self.last = 0
+        self.buckets = [{}]
+        self.index = {}
+
+    def _bucket(self, priority):
+        """Return the bucket dict for priority, adding buckets as needed."""
+        if priority < self.last:
+            raise ValueError(f"Priority {priority} is below the last popped priority {self.last}")
+        b = (priority ^ self.last).bit_length()
+        while len(self.buckets) <= b:
+            self.buckets.append({})
+        return self.buckets[b]
+
+    def push(self, val, priority):
+        """Add an element to the queue with a given priority, or update it if already queued."""
+        if val in self.index:
+            self.update_priority(val, priority)
+            return
+        self._bucket(priority)[val] = priority
+        self.index[val] = priority
+
+    def push_many(self, pairs):
+        """Add (val, priority) pairs, updating values that are already queued.
+
+        Every priority is checked first, so a batch with one below the last
+        popped priority raises ValueError without pushing anything.
+        """
+        pairs = list(pairs)
+        lowest = min((priority for _, priority in pairs), default=self.last)
+        if lowest < self.last:
+            raise ValueError(f"Priority {lowest} is below the last popped priority {self.last}")
+        for val, priority in pairs:
+            self.push(val, priority)
+
+    def _fill_first_bucket(self):
+        """Make bucket 0 hold the minimum, redistributing the first non-empty bucket."""
+        buckets = self.buckets
+        if buckets[0]:
+            return
+        i = 1
+        while not buckets[i]:
+            i += 1
+        bucket = buckets[i]
+        buckets[i] = {}
+        self.last = last = min(bucket.values())
+        for val, priority in bucket.items():
+            buckets[(priority ^ last).bit_length()][val] = priority
+
+    def pop(self):
+        """Remove and return the element with the highest priority (lowest priority number)."""
+        if not self.index:
+            return None
+        self._fill_first_bucket()
+        val, _ = self.buckets[0].popitem()
+        del self.index[val]
+        return val
+
+    def peek(self):
+        """Return the element with the highest priority without removing it, or None if empty."""
+        if not self.index:
+            return None
+        self._fill_first_bucket()
+        return next(reversed(self.buckets[0]))
+
+    def remove(self, val):
+        """Remove an element from the queue in O(1).
+
+        :return: True if removed, False if the value was not queued.
+        """
+        if val not in self.index:
+            return False
+        del self._bucket(self.index.pop(val))[val]
+        return True
+
+    def update_priority(self, val, new_priority):
+        """Update the priority of an existing element in O(1).
+
+        :return: True if updated, False otherwise.
+        """
+        if val not in self.index:
+            return False
+        bucket = self._bucket(new_priority)
+        del self._bucket(self.index[val])[val]
+        bucket[val] = self.index[val] = new_priority
+        return True
+
+    def _entries(self):
+        """Return the queued (priority, val) entries in no particular order."""
+        return [(priority, val) for val, priority in self.index.items()]
+
+    def _smallest_entries(self, k):
+        """Return the k highest-priority (priority, val) entries in order."""
+        # Buckets cover increasing priority ranges, so only the needed ones are sorted
+        entries = []
+        for bucket in self.buckets:
+            if len(entries) >= k:
+                break
+            entries.extend(sorted(((priority, val) for val, priority in bucket.items()),
+                                  key=itemgetter(0)))
+        return entries[:k]
+
+
+class BoundedPriorityQueue(PriorityQueue):
+    """Binary heap that keeps only the ``capacity`` best elements of a stream.
+
+    With ``keep="smallest"`` the heap is a max-heap, so its top is the worst
+    element kept; with ``keep="largest"`` it is the usual min-heap. A pushed
+    element that does not beat the top is rejected after one comparison, and
+    one that does replaces the top and sifts down in O(log capacity), so
+    memory never grows past capacity. ``peek`` and ``pop`` return that top,
+    the next element to be evicted; ``drain_sorted`` returns the ranking.
+    """
+
+    def __init__(self, engine="binary", arity=None, capacity=None, keep="smallest"):
+        """Initialize an empty queue holding at most capacity elements."""
+        super().__init__()
+        if capacity is None or capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+        if keep not in ("smallest", "largest"):
+            raise ValueError(f"keep must be 'smallest' or 'largest', not {keep!r}")
+        self.capacity = capacity
+        self.keep = keep
+        self._max_heap = keep == "smallest"
+
+    def push(self, val, priority):
+        """Offer an element; update it if already kept.
+
+        :return: True if the element is kept, False if it was rejected.
+        """
+        if val in self.index:
+            self.update_priority(val, priority)
+            return True
+        queue = self.queue
+        if len(queue) < self.capacity:
+            self.index[val] = len(queue)
+            queue.append((priority, val))
+            self._heapify_up(len(queue) - 1)
+            return True
+        top = queue[0][0]
+        if not (priority < top if self._max_heap else top < priority):
+            return False
+        # Replace the top in place rather than popping and pushing
+        del self.index[queue[0][1]]
+        queue[0] = (priority, val)
+        self.index[val] = 0
+        self._heapify_down(0)
+        return True
+
+    def push_many(self, pairs):
+        """Offer (val, priority) pairs; return how many were kept."""
+        kept = 0
+        queue, positions, capacity, max_heap = self.queue, self.index, self.capacity, self._max_heap
+        for val, priority in pairs:
+            if len(queue) == capacity and val not in positions:
+                # Inline rejection test: the common case for a long stream
+                top = queue[0][0]
+                if not (priority < top if max_heap else top < priority):
+                    continue
+                del positions[queue[0][1]]
+                queue[0] = (priority, val)
+                positions[val] = 0
+                self._heapify_down(0)
+                kept += 1
+            elif self.push(val, priority):
+                kept += 1
+        return kept
+
+    def drain_sorted(self):
+        """Remove every element and return the (val, priority) pairs best first."""
+        ranked = sorted(self.queue, key=itemgetter(0), reverse=not self._max_heap)
+        self.clear()
+        return [(val, priority) for priority, val in ranked]
+
+    def _smallest_entries(self, k):
+        """Return the first k (priority, val) entries in pop order."""
+        return sorted(self.queue, key=itemgetter(0), reverse=self._max_heap)[:k]
+
     def _heapify_up(self, index):
-        """Heapify upwards starting from a given index."""
-        parent = (index - 1) // 2
-        if parent >= 0 and self.queue[parent][0] > self.queue[index][0]:
-            self.queue[parent], self.queue[index] = self.queue[index], self.queue[parent]
-            self._heapify_up(parent)
+        """Heapify upwards, as a max-heap when keeping the smallest priorities."""
+        if not self._max_heap:
+            PriorityQueue._heapify_up(self, index)
+            return
+        queue, positions = self.queue, self.index
+        item = queue[index]
+        priority = item[0]
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_item = queue[parent]
+            if not parent_item[0] < priority:
+                break
+            queue[index] = parent_item
+            positions[parent_item[1]] = index
+            index = parent
+        queue[index] = item
+        positions[item[1]] = index
 
     def _heapify_down(self, index):
-        """Heapify downwards starting from a given index."""
-        left = 2 * index + 1
-        right = 2 * index + 2
-        smallest = index
-        if left < len(self.queue) and self.queue[left][0] < self.queue[smallest][0]:
-            smallest = left
-        if right < len(self.queue) and self.queue[right][0] < self.queue[smallest][0]:
-            smallest = right
-        if smallest != index:
-            self.queue[smallest], self.queue[index] = self.queue[index], self.queue[smallest]
-            self._heapify_down(smallest)
+        """Heapify downwards, as a max-heap when keeping the smallest priorities."""
+        if not self._max_heap:
+            PriorityQueue._heapify_down(self, index)
+            return
+        queue, positions = self.queue, self.index
+        size = len(queue)
+        item = queue[index]
+        priority = item[0]
+        child = 2 * index + 1
+        while child < size:
+            right = child + 1
+            if right < size and queue[child][0] < queue[right][0]:
+                child = right
+            child_item = queue[child]
+            if not priority < child_item[0]:
+                break
+            queue[index] = child_item
+            positions[child_item[1]] = index
+            index = child
+            child = 2 * index + 1
+        queue[index] = item
+        positions[item[1]] = index
+
+
+_ENGINES = {
+    "binary": PriorityQueue,
+    "dary": DaryHeapQueue,
+    "pairing": PairingHeapQueue,
+    "radix": RadixHeapQueue,
+}
+
 
 # Test cases
-pq = PriorityQueue()
-assert pq.is_empty() == True
-pq.push("medium", 1)
-assert pq.is_empty() == False
-assert pq.size() == 1
-assert pq.contain("medium") == True
-assert pq.contain("high") == False
-pq.push("high", 0)
-pq.push("low", 2)
-assert pq.size() == 3
-print("Priority Queue:", pq)
-assert pq.pop() == "high"
-assert pq.pop() == "medium"
-assert pq.pop() == "low"
-assert pq.pop() == None
-assert pq.is_empty() == True
-pq.clear()
-assert pq.is_empty() == True
-
-print("All test cases passed!")
+
+def test_priority_queue(engine="binary"):
+    pq = PriorityQueue(engine=engine)
+    assert pq.is_empty() == True
+    pq.push("medium", 1)
+    assert pq.is_empty() == False
+    assert pq.size() == 1
+    assert pq.contain("medium") == True
+    assert pq.contain("high") == False
+    pq.push("high", 0)
+    pq.push("low", 2)
+    assert pq.size() == 3
+    print("Priority Queue:", pq)
+    assert pq.pop() == "high"
+    assert pq.pop() == "medium"
+    assert pq.pop() == "low"
+    assert pq.pop() == None
+    assert pq.is_empty() == True
+    pq.clear()
+    assert pq.is_empty() == True
+
+    print("All test cases passed!")
+
+
+def test_indexed_operations():
+    import random
+
+    pq = PriorityQueue()
+    assert pq.peek() is None and pq.remove("x") == False
+    for val, priority in [("a", 5), ("b", 3), ("c", 8), ("d", 1)]:
+        pq.push(val, priority)
+    assert pq.peek() == "d" and pq.size() == 4
+    # Test update_priority moves entries both ways
+    assert pq.update_priority("c", 0) == True
+    assert pq.peek() == "c"
+    assert pq.update_priority("c", 9) == True and pq.update_priority("zz", 1) == False
+    # Test pushing a queued value updates it rather than duplicating it
+    pq.push("a", 2)
+    assert pq.size() == 4
+    # Test remove
+    assert pq.remove("d") == True and pq.contain("d") == False
+    assert [pq.pop() for _ in range(3)] == ["a", "b", "c"] and pq.is_empty()
+
+    # Test the index stays consistent through random operations
+    rng = random.Random(13)
+    reference = {}
+    for _ in range(3000):
+        val = rng.randint(0, 200)
+        roll = rng.random()
+        if roll < 0.4:
+            pq.push(val, rng.random())
+            reference[val] = pq.queue[pq.index[val]][0]
+        elif roll < 0.6:
+            assert pq.remove(val) == (reference.pop(val, None) is not None)
+        elif roll < 0.8:
+            priority = rng.random()
+            assert pq.update_priority(val, priority) == (val in reference)
+            if val in reference:
+                reference[val] = priority
+        elif pq.queue:
+            top = pq.peek()
+            assert reference[top] == min(reference.values())
+            assert pq.pop() == top
+            del reference[top]
+        assert all(pq.index[v] == i for i, (_, v) in enumerate(pq.queue))
+        assert len(pq.index) == pq.size() == len(reference)
+
+    print("All test cases passed!")
+
+
+def test_batch_operations():
+    import random
+
+    rng = random.Random(21)
+    pairs = [(i, rng.random()) for i in range(2000)]
+    pq = PriorityQueue.from_items(pairs + [(5, -1)])
+    assert pq.size() == 2000 and pq.peek() == 5
+    assert all(pq.index[v] == i for i, (_, v) in enumerate(pq.queue))
+
+    # Test nsmallest leaves the queue untouched and agrees with pop_many
+    assert PriorityQueue().nsmallest(3) == [] and pq.nsmallest(0) == []
+    expected = [v for _, v in sorted(pq.queue)]
+    top = pq.nsmallest(50)
+    assert top == expected[:50] and pq.size() == 2000
+    assert pq.pop_many(50) == top and pq.size() == 1950
+
+    # Test push_many both on a small batch (sift up) and a large one (rebuild)
+    pq.push_many([(5000, -5), (5001, 2), (expected[60], -4)])
+    assert pq.pop_many(2) == [5000, expected[60]]
+    pq.push_many([(i, rng.random()) for i in range(6000, 10000)] + [(expected[70], -6), (6000, -3)])
+    assert pq.size() == 5950 and pq.nsmallest(2) == [expected[70], 6000]
+    assert all(pq.index[v] == i for i, (_, v) in enumerate(pq.queue))
+    priorities = []
+    while not pq.is_empty():
+        priorities.append(pq.queue[0][0])
+        pq.pop()
+    assert priorities == sorted(priorities) and pq.pop_many(3) == []
+
+    print("All test cases passed!")
+
+
+def test_engines():
+    import random
+
+    assert type(PriorityQueue()) is PriorityQueue
+    assert type(PriorityQueue(engine="dary", arity=8)) is DaryHeapQueue
+    assert PriorityQueue(engine="dary", arity=8).arity == 8 and DaryHeapQueue().arity == 4
+    assert type(PriorityQueue.from_items([("a", 1)], engine="pairing")) is PairingHeapQueue
+    try:
+        PriorityQueue(engine="fibonacci")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("An unknown engine was accepted")
+
+    # Test every engine against a dict of priorities, with integer priorities
+    # that never drop below the last popped one so the radix heap applies
+    for engine, arity in [("binary", None), ("dary", 3), ("dary", 4), ("pairing", None), ("radix", None)]:
+        rng = random.Random(17)
+        pq = PriorityQueue(engine=engine, arity=arity)
+        reference = {}
+        floor = 0
+        for step in range(4000):
+            val = rng.randint(0, 150)
+            roll = rng.random()
+            if roll < 0.4:
+                priority = rng.randint(floor, floor + 60)
+                pq.push(val, priority)
+                reference[val] = priority
+            elif roll < 0.55:
+                assert pq.remove(val) == (reference.pop(val, None) is not None)
+            elif roll < 0.75:
+                priority = rng.randint(floor, floor + 60)
+                assert pq.update_priority(val, priority) == (val in reference)
+                if val in reference:
+                    reference[val] = priority
+            elif reference:
+                top = pq.peek()
+                floor = reference[top]
+                assert floor == min(reference.values())
+                assert pq.pop() == top
+                del reference[top]
+            assert pq.size() == len(reference) and pq.contain(val) == (val in reference)
+            if step % 500 == 0:
+                ranked = [reference[v] for v in pq.nsmallest(20)]
+                assert ranked == sorted(reference.values())[:20]
+        drained = [reference[v] for v in pq.pop_many(len(reference))]
+        assert drained == sorted(reference.values()) and pq.is_empty() and pq.pop() is None
+
+        # Test meld, including a value queued in both queues
+        pq = PriorityQueue.from_items([(i, 10 + i) for i in range(0, 40, 2)], engine=engine, arity=arity)
+        other = PriorityQueue.from_items([(i, 10 + i) for i in range(1, 40, 2)], engine=engine, arity=arity)
+        other.push(4, 100)
+        pq.meld(other)
+        assert other.is_empty() and pq.size() == 40
+        assert pq.pop_many(40) == [i for i in range(40) if i != 4] + [4]
+
+    # Test meld across engines and the radix heap's monotone rule
+    pq = PriorityQueue(engine="pairing")
+    pq.meld(PriorityQueue.from_items([("x", 2), ("y", 1)]))
+    assert pq.pop_many(2) == ["y", "x"]
+    pq = PriorityQueue(engine="radix")
+    pq.push_many([("a", 5), ("b", 9)])
+    assert pq.pop() == "a"
+    try:
+        pq.push("c", 4)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("A radix heap accepted a priority below the last popped one")
+    # Test a meld that raises leaves both queues as they were
+    other = PriorityQueue.from_items([("d", 7), ("e", 3)])
+    try:
+        pq.meld(other)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("A radix heap melded a priority below the last popped one")
+    assert other.size() == 2 and pq.size() == 1 and not pq.contain("d")
+    pq.meld(pq)
+    assert pq.pop_many(2) == ["b"]
+
+    print("All test cases passed!")
+
+
+def test_bounded_queue():
+    import random
+
+    assert type(PriorityQueue(capacity=3)) is BoundedPriorityQueue
+    for options in [dict(capacity=0), dict(capacity=3, keep="median"), dict(capacity=3, engine="pairing")]:
+        try:
+            PriorityQueue(**options)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{options} was accepted")
+    try:
+        RadixHeapQueue(capacity=3)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("An unbounded engine accepted a capacity")
+    # Test every engine accepts the full set of constructor options when unbounded
+    for engine in _ENGINES:
+        assert type(PriorityQueue(engine=engine, capacity=None)) is _ENGINES[engine]
+        pq = PriorityQueue.from_items([("a", 2), ("b", 1)], engine=engine, capacity=None, keep="largest")
+        assert pq.pop() == "b"
+
+    rng = random.Random(8)
+    stream = [(i, rng.random()) for i in range(5000)]
+    for keep in ["smallest", "largest"]:
+        expected = sorted(stream, key=itemgetter(1), reverse=keep == "largest")[:25]
+        # Test offering one at a time and in a batch keep the same elements
+        pq = PriorityQueue(capacity=25, keep=keep)
+        for val, priority in stream:
+            pq.push(val, priority)
+        assert pq.size() == 25 and len(pq.queue) == 25
+        assert pq.peek() == expected[-1][0] and pq.nsmallest(1) == [expected[-1][0]]
+        assert pq.drain_sorted() == expected and pq.is_empty()
+        pq = PriorityQueue.from_items(stream, capacity=25, keep=keep)
+        assert pq.push_many((10**6 + i, expected[-1][1]) for i in range(100)) == 0
+
+        # Test update_priority, remove and pop keep the heap valid
+        assert pq.update_priority(expected[0][0], expected[-1][1]) and pq.remove(expected[1][0])
+        assert pq.pop() in (expected[0][0], expected[-1][0]) and pq.size() == 23
+        assert all(pq.index[v] == i for i, (_, v) in enumerate(pq.queue))
+        ranked = [priority for _, priority in pq.drain_sorted()]
+        assert ranked == sorted(ranked, reverse=keep == "largest")
+
+    # Test a rejected element is reported and duplicates update in place
+    pq = PriorityQueue(capacity=2, keep="largest")
+    assert pq.push("a", 5) and pq.push("b", 7) and not pq.push("c", 1)
+    assert pq.push("a", 9) and pq.push("d", 8)
+    assert pq.drain_sorted() == [("a", 9), ("d", 8)]
+
+    print("All test cases passed!")
+
+
+if __name__ == "__main__":
+    for engine in _ENGINES:
+        test_priority_queue(engine)
+    test_indexed_operations()
+    test_batch_operations()
+    test_engines()
+    test_bounded_queue()
@@ -0,0 +1,204 @@
+from bisect import bisect_left, bisect_right, insort
+
+
+class SortedList:
+    """Sorted container stored as a list of sorted sublists.
+
+    Each sublist holds between ``load // 2`` and ``2 * load`` values and
+    ``_maxes`` caches the largest value of each one, so a lookup is two
+    binary searches over flat Python lists instead of a walk through one
+    node object per value. It offers the AVLTree search/insert/delete and
+    traversal API, and duplicates are allowed.
+    """
+
+    def __init__(self, iterable=None, load=1000):
+        """Initialize the list, optionally from an iterable of values."""
+        self.load = load
+        self._lists = []
+        self._maxes = []
+        self._len = 0
+        if iterable is not None:
+            values = sorted(iterable)
+            self._lists = [values[i:i + load] for i in range(0, len(values), load)]
+            self._maxes = [sublist[-1] for sublist in self._lists]
+            self._len = len(values)
+
+    def insert(self, value):
+        """Insert a value."""
+        lists, maxes = self._lists, self._maxes
+        if not maxes:
+            lists.append([value])
+            maxes.append(value)
+            self._len = 1
+            return
+        pos = bisect_right(maxes, value)
+        if pos == len(maxes):
+            pos -= 1
+            lists[pos].append(value)
+            maxes[pos] = value
+        else:
+            insort(lists[pos], value)
+        self._len += 1
+        if len(lists[pos]) > 2 * self.load:
+            self._split(pos)
+
+    def _split(self, pos):
+        """Split an oversized sublist in two."""
+        sublist = self._lists[pos]
+        upper = sublist[self.load:]
+        del sublist[self.load:]
+        self._maxes[pos] = sublist[-1]
+        self._lists.insert(pos + 1, upper)
+        self._maxes.insert(pos + 1, upper[-1])
+
+    def delete(self, value):
+        """Delete one occurrence of value."""
+        lists, maxes = self._lists, self._maxes
+        pos = bisect_left(maxes, value)
+        if pos == len(maxes):
+            return
+        sublist = lists[pos]
+        index = bisect_left(sublist, value)
+        if sublist[index] != value:
+            return
+        del sublist[index]
+        self._len -= 1
+        if not sublist:
+            del lists[pos]
+            del maxes[pos]
+            return
+        maxes[pos] = sublist[-1]
+        if len(sublist) < self.load // 2 and len(lists) > 1:
+            # Merge an undersized sublist into a neighbour, splitting again if that overflows
+            if pos == 0:
+                pos = 1
+            lists[pos - 1].extend(lists[pos])
+            maxes[pos - 1] = maxes[pos]
+            del lists[pos]
+            del maxes[pos]
+            if len(lists[pos - 1]) > 2 * self.load:
+                self._split(pos - 1)
+
+    def search(self, value):
+        """Check if a value exists."""
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+        sublist = self._lists[pos]
+        return sublist[bisect_left(sublist, value)] == value
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        """Iterate over values between lo and hi; see SortedTreeMixin.irange."""
+        lo_inclusive, hi_inclusive = inclusive
+        lists, maxes = self._lists, self._maxes
+        if not maxes:
+            return
+        if not reverse:
+            pos = index = 0
+            if lo is not None:
+                find = bisect_left if lo_inclusive else bisect_right
+                pos = find(maxes, lo)
+                if pos == len(maxes):
+                    return
+                index = find(lists[pos], lo)
+            for p in range(pos, len(lists)):
+                sublist = lists[p]
+                for i in range(index if p == pos else 0, len(sublist)):
+                    value = sublist[i]
+                    if hi is not None and (hi < value if hi_inclusive else not value < hi):
+                        return
+                    yield value
+        else:
+            pos, index = len(lists) - 1, len(lists[-1]) - 1
+            if hi is not None:
+                find = bisect_right if hi_inclusive else bisect_left
+                pos = find(maxes, hi)
+                if pos == len(maxes):
+                    pos, index = len(lists) - 1, len(lists[-1]) - 1
+                else:
+                    index = find(lists[pos], hi) - 1
+            for p in range(pos, -1, -1):
+                sublist = lists[p]
+                for i in range(index if p == pos else len(sublist) - 1, -1, -1):
+                    value = sublist[i]
+                    if lo is not None and (value < lo if lo_inclusive else not lo < value):
+                        return
+                    yield value
+
+    def min(self):
+        """Return the smallest value, or None if the list is empty."""
+        return self._lists[0][0] if self._lists else None
+
+    def max(self):
+        """Return the largest value, or None if the list is empty."""
+        return self._maxes[-1] if self._maxes else None
+
+    def inorder_traversal(self):
+        """Return all values in sorted order."""
+        return [value for sublist in self._lists for value in sublist]
+
+    def is_empty(self):
+        """Check if the list is empty."""
+        return self._len == 0
+
+    def __len__(self):
+        """Return the number of values."""
+        return self._len
+
+    def __iter__(self):
+        """Iterate over the values in sorted order."""
+        return (value for sublist in self._lists for value in sublist)
+
+    def __contains__(self, value):
+        """Enable 'in' operator."""
+        return self.search(value)
+
+
+# Test cases
+
+def test_sorted_list():
+    import random
+
+    sl = SortedList(load=4)
+    assert sl.is_empty() and not sl.search(1) and list(sl.irange()) == []
+    assert sl.min() is None and sl.max() is None
+    sl.delete(1)
+
+    # Test random inserts and deletes, including duplicates, against a sorted Python list
+    rng = random.Random(7)
+    reference = []
+    for _ in range(3000):
+        value = rng.randint(0, 300)
+        if reference and rng.random() < 0.45:
+            value = rng.choice(reference)
+            sl.delete(value)
+            reference.remove(value)
+        else:
+            sl.insert(value)
+            reference.append(value)
+    reference.sort()
+    assert sl.inorder_traversal() == reference and list(sl) == reference
+    assert len(sl) == len(reference)
+    assert all(2 <= len(sublist) <= 8 for sublist in sl._lists[:-1])
+    assert sl._maxes == [sublist[-1] for sublist in sl._lists]
+    assert sl.search(reference[10]) and not sl.search(-1) and not sl.search(301)
+    assert sl.min() == reference[0] and sl.max() == reference[-1]
+
+    # Test range iteration in both directions
+    for lo, hi in [(50, 150), (None, 20), (280, None), (150, 50), (reference[7], reference[7])]:
+        for inclusive in [(True, True), (False, False), (True, False), (False, True)]:
+            expected = [v for v in reference
+                        if (lo is None or (v >= lo if inclusive[0] else v > lo))
+                        and (hi is None or (v <= hi if inclusive[1] else v < hi))]
+            assert list(sl.irange(lo, hi, inclusive)) == expected
+            assert list(sl.irange(lo, hi, inclusive, reverse=True)) == expected[::-1]
+
+    # Test building from an iterable
+    built = SortedList([5, 3, 9, 1], load=2)
+    assert built.inorder_traversal() == [1, 3, 5, 9] and 9 in built and 4 not in built
+
+    print("All test cases passed!")
+
+
+if __name__ == "__main__":
+    test_sorted_list()
@@ -0,0 +1,180 @@
+from operator import attrgetter
+
+_node_value = attrgetter("value")
+
+
+def irange_nodes(root, lo, hi, inclusive, reverse, key):
+    """Yield the nodes of the tree under root whose key(node) lies between lo and hi, in order.
+
+    The walk keeps an explicit stack of at most O(height) nodes. key reads
+    the ordering value off a node, e.g. ``attrgetter("value")``.
+    """
+    lo_inclusive, hi_inclusive = inclusive
+    stack = []
+    node = root
+    if not reverse:
+        # Stack the path to the first value inside the lower bound
+        while node:
+            if lo is None or (not key(node) < lo if lo_inclusive else lo < key(node)):
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+        while stack:
+            node = stack.pop()
+            if hi is not None and (hi < key(node) if hi_inclusive else not key(node) < hi):
+                return
+            yield node
+            node = node.right
+            while node:
+                stack.append(node)
+                node = node.left
+    else:
+        while node:
+            if hi is None or (not hi < key(node) if hi_inclusive else key(node) < hi):
+                stack.append(node)
+                node = node.right
+            else:
+                node = node.left
+        while stack:
+            node = stack.pop()
+            if lo is not None and (key(node) < lo if lo_inclusive else not lo < key(node)):
+                return
+            yield node
+            node = node.left
+            while node:
+                stack.append(node)
+                node = node.right
+
+
+class SortedTreeMixin:
+    """Lazy range queries for binary search trees.
+
+    The tree class must keep its root in ``self.root`` and its nodes must have
+    ``value``, ``left`` and ``right`` attributes. Iterators walk the tree with
+    an explicit stack, so they use O(height) memory and produce their first
+    value after O(height) steps.
+    """
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        """Iterate over values between lo and hi in sorted order.
+
+        :param lo: Lower bound, or None for no lower bound.
+        :param hi: Upper bound, or None for no upper bound.
+        :param inclusive: Pair of flags saying whether lo and hi themselves are included.
+        :param reverse: Iterate from hi down to lo instead.
+        """
+        return (node.value for node in self._irange_nodes(lo, hi, inclusive, reverse))
+
+    def iter_from(self, value, reverse=False):
+        """Iterate over values >= value in ascending order (or <= value descending if reverse)."""
+        if reverse:
+            return self.irange(hi=value, reverse=True)
+        return self.irange(lo=value)
+
+    def _irange_nodes(self, lo, hi, inclusive, reverse):
+        """Yield the nodes whose values lie between lo and hi, in order."""
+        return irange_nodes(self.root, lo, hi, inclusive, reverse, _node_value)
+
+    def floor(self, value):
+        """Return the largest value <= value, or None if there is none."""
+        best = None
+        node = self.root
+        while node:
+            if value < node.value:
+                node = node.left
+            else:
+                best = node
+                node = node.right
+        return best.value if best else None
+
+    def ceiling(self, value):
+        """Return the smallest value >= value, or None if there is none."""
+        best = None
+        node = self.root
+        while node:
+            if node.value < value:
+                node = node.right
+            else:
+                best = node
+                node = node.left
+        return best.value if best else None
+
+    def predecessor(self, value):
+        """Return the largest value < value, or None if there is none."""
+        best = None
+        node = self.root
+        while node:
+            if node.value < value:
+                best = node
+                node = node.right
+            else:
+                node = node.left
+        return best.value if best else None
+
+    def successor(self, value):
+        """Return the smallest value > value, or None if there is none."""
+        best = None
+        node = self.root
+        while node:
+            if value < node.value:
+                best = node
+                node = node.left
+            else:
+                node = node.right
+        return best.value if best else None
+
+    def min(self):
+        """Return the smallest value, or None if the tree is empty."""
+        node = self.root
+        if node is None:
+            return None
+        while node.left:
+            node = node.left
+        return node.value
+
+    def max(self):
+        """Return the largest value, or None if the tree is empty."""
+        node = self.root
+        if node is None:
+            return None
+        while node.right:
+            node = node.right
+        return node.value
+
+
+# Test cases
+
+def test_range_queries(tree_class):
+    """Check the range and neighbour queries of a tree class that uses this mixin."""
+    import random
+
+    tree = tree_class()
+    assert list(tree.irange()) == [] and tree.min() is None and tree.max() is None
+    assert tree.floor(1) is None and tree.successor(1) is None
+    values = random.Random(5).sample(range(0, 2000, 2), 300)
+    for value in values:
+        tree.insert(value)
+    ordered = sorted(values)
+    assert list(tree.irange()) == ordered
+    assert list(tree.irange(reverse=True)) == ordered[::-1]
+    for lo, hi in [(100, 900), (101, 899), (None, 500), (500, None), (900, 100), (ordered[5], ordered[5])]:
+        for inclusive in [(True, True), (False, False), (True, False), (False, True)]:
+            expected = [v for v in ordered
+                        if (lo is None or (v >= lo if inclusive[0] else v > lo))
+                        and (hi is None or (v <= hi if inclusive[1] else v < hi))]
+            assert list(tree.irange(lo, hi, inclusive)) == expected
+            assert list(tree.irange(lo, hi, inclusive, reverse=True)) == expected[::-1]
+    # Test iterators are lazy
+    first = tree.iter_from(ordered[10] + 1)
+    assert next(first) == ordered[11] and next(first) == ordered[12]
+    assert list(tree.iter_from(ordered[3], reverse=True)) == ordered[3::-1]
+    # Test neighbour queries for values in and between the stored ones
+    for x in (ordered[0] - 1, ordered[0], ordered[50], ordered[50] + 1, ordered[-1], ordered[-1] + 1):
+        assert tree.floor(x) == max((v for v in ordered if v <= x), default=None)
+        assert tree.ceiling(x) == min((v for v in ordered if v >= x), default=None)
+        assert tree.predecessor(x) == max((v for v in ordered if v < x), default=None)
+        assert tree.successor(x) == min((v for v in ordered if v > x), default=None)
+    assert tree.min() == ordered[0] and tree.max() == ordered[-1]
+
+    print("All test cases passed!")
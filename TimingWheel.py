@@ -0,0 +1,186 @@
+class TimingWheel:
+    """Hierarchical timing wheel for large numbers of timers.
+
+    Time is cut into ticks of ``resolution`` seconds. Level 0 has one slot per
+    tick for the next ``2 ** bits`` ticks, level 1 one slot per ``2 ** bits``
+    ticks, and so on, with levels added as later deadlines need them. Adding
+    and cancelling a timer are O(1) dict operations; a timer is moved down a
+    level at most once per level as its deadline approaches. A timer never
+    fires early and fires at most one tick late.
+    """
+
+    def __init__(self, resolution=0.001, bits=6, now=0.0):
+        """Initialize an empty wheel whose clock starts at now.
+
+        :param resolution: Length of one tick, in seconds.
+        :param bits: log2 of the number of slots per level.
+        :param now: Current time, in seconds.
+        """
+        self.resolution = resolution
+        self.bits = bits
+        self._mask = (1 << bits) - 1
+        self._current = self._tick(now)
+        self._levels = []  # Level -> list of slots, each a {key: deadline} dict
+        self._counts = []  # Level -> number of timers stored on that level
+        self._due = {}  # Timers whose deadline had already passed when added
+        self._location = {}  # Key -> (level, slot dict), level -1 for _due
+
+    def _tick(self, t):
+        """Return the tick that contains time t."""
+        return int(t // self.resolution)
+
+    def add(self, key, deadline):
+        """Schedule key to fire at deadline, replacing any timer it already has."""
+        if key in self._location:
+            self.remove(key)
+        # Fire on the first tick that starts after the deadline, so never early
+        self._place(key, deadline, self._tick(deadline) + 1)
+
+    def _place(self, key, deadline, tick):
+        """Store a timer in the level and slot for its deadline tick."""
+        delta = tick - self._current
+        if delta <= 0:
+            self._due[key] = deadline
+            self._location[key] = (-1, self._due)
+            return
+        level = (delta.bit_length() - 1) // self.bits
+        while len(self._levels) <= level:
+            self._levels.append([{} for _ in range(self._mask + 1)])
+            self._counts.append(0)
+        slot = self._levels[level][(tick >> (self.bits * level)) & self._mask]
+        slot[key] = deadline
+        self._counts[level] += 1
+        self._location[key] = (level, slot)
+
+    def remove(self, key):
+        """Cancel the timer for key.
+
+        :return: True if a timer was cancelled, False if key had none.
+        """
+        location = self._location.pop(key, None)
+        if location is None:
+            return False
+        level, slot = location
+        del slot[key]
+        if level >= 0:
+            self._counts[level] -= 1
+        return True
+
+    def advance(self, now):
+        """Move the clock to now and return the timers that fired, as (key, deadline) pairs."""
+        fired = list(self._due.items())
+        self._due.clear()
+        target = self._tick(now)
+        bits, mask, levels, counts, location = self.bits, self._mask, self._levels, self._counts, self._location
+        while self._current < target:
+            if not location:
+                self._current = target
+                break
+            # Fire level-0 slots up to the end of this turn, then cascade at the turn boundary
+            boundary = ((self._current >> bits) + 1) << bits
+            stop = min(boundary, target)
+            if counts[0]:
+                level0 = levels[0]
+                for tick in range(self._current + 1, stop + 1):
+                    slot = level0[tick & mask]
+                    if slot:
+                        counts[0] -= len(slot)
+                        for key in slot:
+                            del location[key]
+                        fired.extend(slot.items())
+                        slot.clear()
+            self._current = stop
+            if stop < boundary:
+                break
+            # A level wraps when all the digits below it are zero; pull its next slot down
+            level = 1
+            while level < len(levels) and (stop >> (bits * (level - 1))) & mask == 0:
+                slot = levels[level][(stop >> (bits * level)) & mask]
+                if slot:
+                    counts[level] -= len(slot)
+                    entries = list(slot.items())
+                    slot.clear()
+                    for key, deadline in entries:
+                        self._place(key, deadline, self._tick(deadline) + 1)
+                level += 1
+            for key in self._due:
+                del location[key]
+            fired.extend(self._due.items())
+            self._due.clear()
+        return fired
+
+    def next_expiry(self):
+        """Return the earliest time at which advance may fire a timer, or None if there are none.
+
+        This is exact for timers within one level-0 turn; later ones report
+        the start of the next turn, when they are cascaded down.
+        """
+        if not self._location:
+            return None
+        if self._due:
+            return self._current * self.resolution
+        level0 = self._levels[0]
+        boundary = ((self._current >> self.bits) + 1) << self.bits
+        for tick in range(self._current + 1, boundary):
+            if level0[tick & self._mask]:
+                return tick * self.resolution
+        return boundary * self.resolution
+
+    def __len__(self):
+        """Return the number of pending timers."""
+        return len(self._location)
+
+    def __contains__(self, key):
+        """Enable 'in' operator."""
+        return key in self._location
+
+
+# Test cases
+
+def test_timing_wheel():
+    import random
+
+    wheel = TimingWheel(resolution=1.0, bits=2)
+    assert wheel.next_expiry() is None and wheel.advance(100) == []
+
+    # Test random timers, including far deadlines and cancellations, against a dict
+    rng = random.Random(3)
+    wheel = TimingWheel(resolution=1.0, bits=2)
+    pending = {}
+    now = 0.0
+    for key in range(3000):
+        roll = rng.random()
+        if roll < 0.6:
+            deadline = now + rng.choice([rng.uniform(0, 5), rng.uniform(0, 300), rng.uniform(0, 5000)])
+            wheel.add(key % 700, deadline)
+            pending[key % 700] = deadline
+        elif roll < 0.7:
+            victim = rng.randrange(700)
+            assert wheel.remove(victim) == (pending.pop(victim, None) is not None)
+        else:
+            expiry = wheel.next_expiry()
+            assert expiry is None or all(deadline >= expiry - 1 for deadline in pending.values())
+            now += rng.choice([0.5, 3, 40, 700])
+            fired = wheel.advance(now)
+            for fired_key, deadline in fired:
+                # Never early, and anything still pending is at most one tick away
+                assert pending.pop(fired_key) == deadline and deadline < now
+            assert all(deadline >= now - 1 for deadline in pending.values())
+        assert len(wheel) == len(pending)
+    wheel.advance(now + 10**5)
+    assert len(wheel) == 0 and wheel.next_expiry() is None
+
+    # Test a timer in the past fires on the next advance, and re-adding replaces it
+    wheel = TimingWheel(resolution=0.5, now=10.0)
+    wheel.add("late", 3.0)
+    wheel.add("soon", 10.7)
+    wheel.add("soon", 12.2)
+    assert "soon" in wheel and wheel.next_expiry() == 10.0
+    assert wheel.advance(10.0) == [("late", 3.0)]
+    assert wheel.advance(12.0) == [] and wheel.advance(12.5) == [("soon", 12.2)]
+
+    print("All test cases passed!")
+
+
+if __name__ == "__main__":
+    test_timing_wheel()